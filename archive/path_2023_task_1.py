@@ -9,12 +9,15 @@ import msvcrt
 import dronekit
 
 from modules import add_takeoff_and_landing_command
+from modules import camera_session
+from modules import diversion_planner
+from modules import diversion_qr_input
+from modules import frame_preview
 from modules import load_waypoint_name_to_coordinates_map
 from modules import upload_commands
 from modules import waypoint_tracking
 from modules import waypoints_dict_to_list
 from modules import waypoints_to_commands
-from modules import diversion_waypoints_from_vertices
 from modules import generate_command
 from modules.common.modules import location_global
 
@@ -83,9 +86,56 @@ def main() -> int:
         print("Error: upload_commands")
         return -1
 
+    # Read in hardcoded waypoints from CSV file
+    # Waypoints are stored in order of insertion, starting with the top row
+    (result, diversion_waypoint_list) = (
+        load_waypoint_name_to_coordinates_map.load_waypoint_name_to_coordinates_map(
+            DIVERSION_WAYPOINT_FILE_PATH,
+        )
+    )
+    if not result:
+        print("ERROR: diversion_waypoint_name_to_coordinates_map")
+        return -1
+
+    diversion_waypoint_values_list = list(diversion_waypoint_list.values())
+
+    (result, rejoin_waypoint_list) = (
+        load_waypoint_name_to_coordinates_map.load_waypoint_name_to_coordinates_map(
+            REJOIN_WAYPOINT_FILE_PATH,
+        )
+    )
+    if not result:
+        print("ERROR: rejoin_waypoint_name_to_coordinates_map")
+        return -1
+
+    # Created once, so that replanning from a new location only connects the start and goal
+    result, planner = diversion_planner.DiversionPlanner.create(
+        [diversion_waypoint_values_list]
+    )
+    if not result:
+        print("ERROR: Could not create diversion planner")
+        return -1
+
+    # Opened once, as opening the camera for every single picture takes too long for the loop
+    result, session = camera_session.CameraSession.create(CAMERA)
+    if not result:
+        print("ERROR: Could not open camera")
+        return -1
+
+    # Kept open for the whole loop, drawing from its own thread instead of every iteration
+    result, preview = frame_preview.FramePreview.create(session.frame_buffer)
+    if not result:
+        print("ERROR: Could not create camera preview")
+        session.close()
+        return -1
+
     is_qr_text_found = False
     # Drone starts flying
     while True:
+        # Exit on manual quit in the camera window
+        if preview.is_quit_requested():
+            break
+
         result, waypoint_info = waypoint_tracking.get_current_waypoint_info(drone)
         if not result:
             print("Error: waypoint_tracking (waypoint_info)")
@@ -98,9 +148,13 @@ def main() -> int:
         else:
             print(f"Current location (Lat, Lon): {location}")
 
-        is_qr_text_found = False
-        # nonblocking, just takes single picture
-        # is_qr_text_found, diversion_qr_text = diversion_qr_input.diversion_qr_input(CAMERA)
+        # nonblocking, just checks the newest picture
+        is_qr_text_found, diversion_qr_text = diversion_qr_input.diversion_qr_input(
+            CAMERA, session=session
+        )
+        if is_qr_text_found:
+            print(f"Diversion QR text: {diversion_qr_text}")
+
         # wait for text input in console
         print("Press 'q' to simulate QR code found.")
         if not is_qr_text_found:
@@ -114,28 +168,6 @@ def main() -> int:
         # run once when qr code is detected
         if is_qr_text_found:
 
-            # Read in hardcoded waypoints from CSV file
-            # Waypoints are stored in order of insertion, starting with the top row
-            (result, diversion_waypoint_list) = (
-                load_waypoint_name_to_coordinates_map.load_waypoint_name_to_coordinates_map(
-                    DIVERSION_WAYPOINT_FILE_PATH,
-                )
-            )
-            if not result:
-                print("ERROR: diversion_waypoint_name_to_coordinates_map")
-                return -1
-
-            diversion_waypoint_values_list = list(diversion_waypoint_list.values())
-
-            (result, rejoin_waypoint_list) = (
-                load_waypoint_name_to_coordinates_map.load_waypoint_name_to_coordinates_map(
-                    REJOIN_WAYPOINT_FILE_PATH,
-                )
-            )
-            if not result:
-                print("ERROR: rejoin_waypoint_name_to_coordinates_map")
-                return -1
-
             # convert tuple[float, float] to location ground
             current_latitude, current_longitude = location
             result, named_location = location_global.LocationGlobal.create(
@@ -145,13 +177,12 @@ def main() -> int:
                 print("ERROR: Could not create named location")
                 return -1
 
-            waypoints_around_diversion = (
-                diversion_waypoints_from_vertices.diversion_waypoints_from_vertices(
-                    named_location,
-                    next(iter(rejoin_waypoint_list.values())),
-                    diversion_waypoint_values_list,
-                )
+            result, waypoints_around_diversion = planner.plan(
+                named_location, next(iter(rejoin_waypoint_list.values()))
             )
+            if not result:
+                print("ERROR: Could not plan diversion")
+                return -1
 
             result, waypoints_around_diversion_commands = (
                 waypoints_to_commands.waypoints_to_commands(waypoints_around_diversion, ALTITUDE)
@@ -192,6 +223,9 @@ def main() -> int:
 
         time.sleep(DELAY)
 
+    preview.close()
+    session.close()
+
     return 0
 
 
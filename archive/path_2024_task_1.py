@@ -6,6 +6,7 @@ import pathlib
 import time
 
 from modules import condition_evaluator
+from modules import lap_time_estimator
 from modules import load_waypoint_name_to_coordinates_map
 from modules import mission_time_condition
 from modules import waypoints_dict_to_list
@@ -30,6 +31,10 @@ DRONE_TIMEOUT = 30.0  # seconds
 MISSION_WAIT_TIMEOUT = 5.0  # seconds
 LAP_START_SEQUENCE_NUMBER = 3
 MAXIMUM_NUMBER_OF_LAPS = 4
+LAP_HISTORY_SIZE = MAXIMUM_NUMBER_OF_LAPS
+LAP_SEGMENT_CAPACITY = 32
+LAP_TIME_SMOOTHING_FACTOR = 0.5
+LAP_TIME_SAFETY_FACTOR = 2.0  # standard deviations
 
 
 def main() -> int:
@@ -127,9 +132,16 @@ def main() -> int:
         location_info = drone.location
         time.sleep(MISSION_WAIT_TIMEOUT)
 
+    result, estimator = lap_time_estimator.LapTimeEstimator.create(
+        LAP_HISTORY_SIZE, LAP_SEGMENT_CAPACITY, LAP_TIME_SMOOTHING_FACTOR, LAP_TIME_SAFETY_FACTOR
+    )
+    if not result:
+        print("ERROR: Lap time estimator")
+        return -1
+
     start_time = time.time()
     result, time_condition = mission_time_condition.MissionTimeCondition.create(
-        start_time, MAXIMUM_FLIGHT_TIME
+        start_time, MAXIMUM_FLIGHT_TIME, estimator
     )
 
     if not result:
@@ -178,7 +190,7 @@ def main() -> int:
 
                     # Update lap time and decided to continue or force early RTL
                     time_condition.update_lap_time(lap_time)
-                    should_return_to_launch = return_to_launch_evaluator.evaluate_all_conditions()
+                    should_return_to_launch = return_to_launch_evaluator.evaluate_due_conditions()
 
                     # Reset lap start time and end time
                     lap_start_time, lap_end_time = 0, 0
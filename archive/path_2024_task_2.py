@@ -9,6 +9,7 @@ import yaml
 from modules import add_takeoff_and_loiter_command
 from modules import check_stop_condition
 from modules import load_waypoint_name_to_coordinates_map
+from modules import mission_mirror
 from modules import upload_commands
 from modules import waypoints_to_commands
 from modules import waypoint_tracking
@@ -49,6 +50,7 @@ def main() -> int:
         KML_FILE_PREFIX = config["kml_file_prefix"]
         DELAY = config["delay"]
         MAXIMUM_FLIGHT_TIME = config["maximum_flight_time"]
+        WAYPOINT_CACHE_DIRECTORY_PATH = pathlib.Path(config["waypoint_cache"]["directory_path"])
         # pylint: enable=invalid-name
     except KeyError:
         print("Config key(s) not found")
@@ -66,6 +68,7 @@ def main() -> int:
         waypoint_name_to_coordinates,
     ) = load_waypoint_name_to_coordinates_map.load_waypoint_name_to_coordinates_and_altitude_map(
         WAYPOINT_FILE_PATH,
+        WAYPOINT_CACHE_DIRECTORY_PATH,
     )
     if not result:
         print("ERROR: load_waypoint_name_to_coordinates_map")
@@ -113,9 +116,15 @@ def main() -> int:
         print("Error: upload_commands")
         return -1
 
+    # Waypoint lookups read the local copy instead of downloading the mission every loop
+    result, mirror = mission_mirror.MissionMirror.create(drone)
+    if not result:
+        print("Error: mission_mirror")
+        return -1
+
     start_time = time.time()
     while True:
-        result, waypoint_info = waypoint_tracking.get_current_waypoint_info(drone)
+        result, waypoint_info = waypoint_tracking.get_current_waypoint_info(drone, mirror)
         if not result:
             print("Error: waypoint_tracking (waypoint_info)")
         else:
@@ -130,7 +139,7 @@ def main() -> int:
         # Send drone back to launch if exceeds time limit
         current_time = time.time()
         is_returning_to_launch = check_stop_condition.check_stop_condition(
-            start_time, current_time, drone, MAXIMUM_FLIGHT_TIME
+            start_time, current_time, drone, MAXIMUM_FLIGHT_TIME, DRONE_TIMEOUT
         )
         if is_returning_to_launch:
             break
@@ -2,6 +2,8 @@
 Prefixes a takeoff command and suffixes a RTL command to the end of the list of commands.
 """
 
+import collections.abc
+
 from . import generate_command
 from .common.modules.mavlink import flight_controller
 
@@ -35,3 +37,27 @@ def add_takeoff_and_rtl_command(
     commands.insert(len(commands), rtl_command)
 
     return True, commands
+
+
+def add_takeoff_and_rtl_command_lazy(
+    commands: collections.abc.Iterable[flight_controller.dronekit.Command], altitude: float
+) -> collections.abc.Iterator[flight_controller.dronekit.Command]:
+    """
+    Streaming version of add_takeoff_and_rtl_command.
+    The caller is responsible for making sure that commands is not empty.
+
+    Parameters
+    ----------
+    commands: Iterable[flight_controller.dronekit.Command]
+        Dronekit commands that can be sent to the drone, possibly still being generated.
+    altitude: int
+        Altitude in meters to command the drone to.
+
+    Yields
+    -------
+    flight_controller.dronekit.Command:
+        Takeoff command, the given commands, then the RTL command.
+    """
+    yield generate_command.takeoff(altitude)
+    yield from commands
+    yield generate_command.return_to_launch()
@@ -2,8 +2,11 @@
 An command generator with advanced parameters and greater flexibility
 """
 
+import collections.abc
+import itertools
 import pathlib
 
+import numpy as np
 from pymavlink import mavutil
 
 from .common.modules.mavlink import dronekit
@@ -43,6 +46,50 @@ COMMAND_TO_PARAMETER_MATRIX = {
     "do_jump": [2, 2, 0, 0, 0, 0, 0],
 }
 
+HEADER = "frame,command_type,param1,param2,param3,param4,param5,param6,param7"
+FIELD_COUNT = 9
+
+# Rows validated together
+DEFAULT_BATCH_SIZE = 1024
+
+# Errors printed when a file fails validation, all are collected
+MAXIMUM_REPORTED_ERRORS = 10
+
+# Matrix rows, indexed by command type
+__COMMAND_TO_RULE_ROW = {command_type: row for row, command_type in enumerate(VALID_COMMANDS)}
+__PARAMETER_RULES = np.array(
+    [COMMAND_TO_PARAMETER_MATRIX[command_type] for command_type in VALID_COMMANDS]
+)
+
+
+class RowError:
+    """
+    Invalid row of a mission file.
+
+    Attributes:
+        line_number: Line of the file, counted from 1 including the header.
+        message: What is wrong with the row.
+    """
+
+    def __init__(self, line_number: int, message: str) -> None:
+        """
+        Constructor.
+        """
+        self.line_number = line_number
+        self.message = message
+
+    def __str__(self) -> str:
+        """
+        To string.
+        """
+        return f"Line {self.line_number}: {self.message}"
+
+
+class MissionFileError(Exception):
+    """
+    Raised by a streamed mission once the whole file is read if any row is invalid.
+    """
+
 
 def check_validity(params: "list[float]", matrix_rules: "list[float]") -> bool:
     """
@@ -109,11 +156,159 @@ def generate_command_advanced(
     )
 
 
+def __row_error(line_number: int, fields: "list[str]") -> RowError:
+    """
+    Describes why a row has the wrong number of fields or an unknown name.
+    """
+    if len(fields) != FIELD_COUNT:
+        return RowError(line_number, f"Expected {FIELD_COUNT} fields, found {len(fields)}")
+
+    if fields[0] not in VALID_FRAMES:
+        return RowError(line_number, f"Unknown frame {fields[0]}")
+
+    return RowError(line_number, f"Unknown command type {fields[1]}")
+
+
+def __commands_from_batch(
+    line_numbers: "list[int]", lines: "list[str]", errors: "list[RowError]"
+) -> "list[dronekit.Command]":
+    """
+    Validates a batch of rows together and creates a command for each valid row.
+
+    line_numbers: Line number of each row.
+    lines: Text of each row.
+    errors: Errors of the invalid rows are appended to it.
+
+    Return: Commands of the valid rows, in order.
+    """
+    rows = [line.split(",") for line in lines]
+    is_well_formed = [
+        len(fields) == FIELD_COUNT and fields[0] in VALID_FRAMES and fields[1] in VALID_COMMANDS
+        for fields in rows
+    ]
+    if not all(is_well_formed):
+        errors.extend(
+            __row_error(line_number, fields)
+            for line_number, fields, well_formed in zip(line_numbers, rows, is_well_formed)
+            if not well_formed
+        )
+        line_numbers = list(itertools.compress(line_numbers, is_well_formed))
+        rows = list(itertools.compress(rows, is_well_formed))
+
+    if len(rows) == 0:
+        return []
+
+    # Every row has the same number of fields, so each column is a stride of the cells
+    cells = list(itertools.chain.from_iterable(rows))
+    frames = cells[0::FIELD_COUNT]
+    command_types = cells[1::FIELD_COUNT]
+    parameter_count = FIELD_COUNT - 2
+
+    is_number = np.ones(len(rows), dtype=bool)
+    try:
+        parameters = (
+            np.fromiter(
+                map(
+                    float,
+                    itertools.chain.from_iterable(
+                        cells[column::FIELD_COUNT] for column in range(2, FIELD_COUNT)
+                    ),
+                ),
+                dtype=np.float64,
+                count=parameter_count * len(rows),
+            )
+            .reshape(parameter_count, len(rows))
+            .T
+        )
+    except ValueError:
+        # Rows are only converted one at a time to find which ones are not numbers
+        parameters = np.zeros((len(rows), parameter_count))
+        for index, fields in enumerate(rows):
+            try:
+                parameters[index] = list(map(float, fields[2:]))
+            except ValueError:
+                errors.append(RowError(line_numbers[index], "Parameter is not a number"))
+                is_number[index] = False
+
+    rules = __PARAMETER_RULES[
+        [__COMMAND_TO_RULE_ROW[command_type] for command_type in command_types]
+    ]
+    is_integer = np.isfinite(parameters) & (parameters == np.floor(parameters))
+    is_parameter_invalid = ((rules == 0) & (parameters != 0.0)) | ((rules == 2) & ~is_integer)
+
+    is_row_invalid = is_parameter_invalid.any(axis=1) & is_number
+    for index in np.flatnonzero(is_row_invalid):
+        names = ", ".join(
+            f"param{parameter + 1}" for parameter in np.flatnonzero(is_parameter_invalid[index])
+        )
+        errors.append(RowError(line_numbers[index], f"Invalid {names} for {command_types[index]}"))
+
+    is_valid = (is_number & ~is_row_invalid).tolist()
+    return [
+        dronekit.Command(
+            0, 0, 0, VALID_FRAMES[frame], VALID_COMMANDS[command_type], 0, 0, *row_parameters
+        )
+        for frame, command_type, row_parameters, valid in zip(
+            frames, command_types, parameters.tolist(), is_valid
+        )
+        if valid
+    ]
+
+
+def generate_commands(
+    mission_file_path: pathlib.Path,
+    errors: "list[RowError]",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> collections.abc.Iterator[dronekit.Command]:
+    """
+    Reads advanced commands from a CSV file a batch of rows at a time, yielding the commands
+    of each batch as soon as it is validated, so the mission can be generated while the file
+    is read. A first line exactly matching the header is skipped, as are blank lines.
+
+    Once a batch has an invalid row, no more commands are yielded, but the rest of the file is
+    still validated so that every error is reported. A consumer that takes every command before
+    using any, such as upload_commands(), never uses a partial mission.
+
+    mission_file_path: The advanced CSV file, which must exist.
+    errors: Every invalid row is appended to it, not just the first.
+    batch_size: Rows validated together.
+
+    Return: Commands of every row, in order.
+    Raises MissionFileError once the file is read if any row is invalid.
+    """
+    with open(mission_file_path, encoding="utf-8") as file:
+        error_count = len(errors)
+        line_numbers = []
+        lines = []
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if line == "" or (line_number == 1 and line == HEADER):
+                continue
+
+            line_numbers.append(line_number)
+            lines.append(line)
+            if len(lines) >= batch_size:
+                commands = __commands_from_batch(line_numbers, lines, errors)
+                if len(errors) == error_count:
+                    yield from commands
+
+                line_numbers = []
+                lines = []
+
+        commands = __commands_from_batch(line_numbers, lines, errors)
+        if len(errors) == error_count:
+            yield from commands
+
+    if len(errors) > error_count:
+        raise MissionFileError(f"{len(errors) - error_count} invalid rows in {mission_file_path}")
+
+
 def csv_to_commands_list(
     mission_file_path: pathlib.Path,
 ) -> "tuple[bool, list[dronekit.Command] | None]":
     """
     A method that reads a list of advanced commands from a csv file and generates a mission.
+    Every invalid row is reported before failing.
     Parameters:
         - mission_file_path: The advanced csv file containing the different mission commands
 
@@ -125,35 +320,15 @@ def csv_to_commands_list(
     if not mission_file_path.exists():
         return False, None
 
-    mission = []
-    with open(mission_file_path, encoding="utf-8") as file:
-        for line in file:
-            # Skip header and empty lines
-            if line in "frame,command_type,param1,param2,param3,param4,param5,param6,param7\n":
-                continue
-
-            parts = line.split(",")
-
-            # Incorrect number of parameters
-            if len(parts) != 9:
-                return False, None
-
-            frame, command_type, param1, param2, param3, param4, param5, param6, param7 = parts
-            result, command = generate_command_advanced(
-                frame,
-                command_type,
-                float(param1),
-                float(param2),
-                float(param3),
-                float(param4),
-                float(param5),
-                float(param6),
-                float(param7),
-            )
-            if not result:
-                return False, None
+    errors = []
+    try:
+        mission = list(generate_commands(mission_file_path, errors))
+    except MissionFileError as exception:
+        print(f"ERROR: {exception}")
+        for error in errors[:MAXIMUM_REPORTED_ERRORS]:
+            print(f"    {error}")
 
-            mission.append(command)
+        return False, None
 
     if len(mission) == 0:
         return False, None
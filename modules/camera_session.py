@@ -0,0 +1,165 @@
+"""
+Camera that stays open between QR reads, capturing frames in the background.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from . import latest_frame_buffer
+from .common.modules.camera import camera_factory
+
+
+DEFAULT_CAMERA_WIDTH = 1920
+DEFAULT_CAMERA_HEIGHT = 1080
+
+
+def use_session(
+    session: "CameraSession | None",
+    device: "int | str",
+    width: int = DEFAULT_CAMERA_WIDTH,
+    height: int = DEFAULT_CAMERA_HEIGHT,
+) -> "tuple[True, CameraSession] | tuple[False, None]":
+    """
+    Adds a user to an open session, or opens a new one. The caller must close it when done.
+
+    session: Session that is already open, or None to open one.
+    device: Camera device name or index, ignored if a session is provided.
+    width: Frame width in pixels of a new session.
+    height: Frame height in pixels of a new session.
+
+    Return: Success, session.
+    """
+    if session is None:
+        return CameraSession.create(device, width, height)
+
+    if not session.acquire():
+        print("ERROR: Camera session is already closed")
+        return False, None
+
+    return True, session
+
+
+class CameraSession:
+    """
+    Opens the camera once and captures frames in a background thread, keeping only the newest.
+    Readers poll for the newest frame instead of opening the camera and waiting for an image.
+    Each user other than the creator calls acquire(), and every user calls close() when done.
+    The camera stops when the last user closes the session.
+
+    Attributes:
+        frame_buffer: Newest frame captured, with its capture time.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        device: "int | str",
+        width: int = DEFAULT_CAMERA_WIDTH,
+        height: int = DEFAULT_CAMERA_HEIGHT,
+    ) -> "tuple[True, CameraSession] | tuple[False, None]":
+        """
+        device: Camera device name or index (e.g. /dev/video0).
+        width: Frame width in pixels.
+        height: Frame height in pixels.
+        """
+        result, camera = camera_factory.create_camera(
+            camera_factory.CameraOption.OPENCV,
+            width,
+            height,
+            camera_factory.camera_opencv.ConfigOpenCV(device),
+        )
+        if not result:
+            print("OpenCV camera creation error.")
+            return False, None
+
+        result, frame_buffer = latest_frame_buffer.LatestFrameBuffer.create()
+        if not result:
+            return False, None
+
+        return True, CameraSession(cls.__create_key, camera, frame_buffer)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        camera: object,
+        frame_buffer: latest_frame_buffer.LatestFrameBuffer,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is CameraSession.__create_key, "Use create() method"
+
+        self.frame_buffer = frame_buffer
+
+        self.__camera = camera
+        self.__user_lock = threading.Lock()
+        self.__user_count = 1
+        self.__stop_event = threading.Event()
+        self.__capture_thread = threading.Thread(target=self.__capture, daemon=True)
+        self.__capture_thread.start()
+
+    def acquire(self) -> bool:
+        """
+        Adds a user, who must call close() when done.
+
+        Return: Success, False if the session was already closed by its last user.
+        """
+        with self.__user_lock:
+            if self.__user_count == 0:
+                return False
+
+            self.__user_count += 1
+
+        return True
+
+    def close(self) -> None:
+        """
+        Removes a user. The last user stops capturing and wakes any reader waiting for a frame.
+        """
+        with self.__user_lock:
+            if self.__user_count == 0:
+                return
+
+            self.__user_count -= 1
+            if self.__user_count > 0:
+                return
+
+        self.__stop_event.set()
+        self.__capture_thread.join()
+        self.frame_buffer.close()
+
+    def user_count(self) -> int:
+        """
+        Number of users that have not closed the session yet.
+        """
+        with self.__user_lock:
+            return self.__user_count
+
+    def take_frame(
+        self, timeout: float = 0.0
+    ) -> tuple[True, tuple[np.ndarray, float]] | tuple[False, None]:
+        """
+        Newest frame not yet taken by any reader.
+
+        timeout: Time limit in seconds to wait for a frame, 0 to return immediately.
+
+        Return: Success, frame and its capture time from time.monotonic().
+        """
+        return self.frame_buffer.take(timeout)
+
+    def __capture(self) -> None:
+        """
+        Runs in the capture thread until the session is closed.
+        """
+        while not self.__stop_event.is_set():
+            is_image_found, frame = self.__camera.get_image()
+            capture_time = time.monotonic()
+            if not is_image_found:
+                print("ERROR: Failed to capture image")
+                continue
+
+            self.frame_buffer.put(frame, capture_time)
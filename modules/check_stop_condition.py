@@ -2,6 +2,10 @@
 Checks whether the drone has reached its max flight time and sends it back to launch.
 """
 
+import concurrent.futures
+import threading
+import time
+
 from . import generate_command
 from . import upload_commands
 from .common.modules.mavlink import dronekit
@@ -9,12 +13,18 @@ from .common.modules.mavlink import dronekit
 
 DRONE_TIMEOUT = 30.0  # seconds
 
+RTL_MODE_NAME = "RTL"
+
 
 def check_stop_condition(
-    start_time: float, current_time: float, drone: dronekit.Vehicle, maximum_flight_time: float
+    start_time: float,
+    current_time: float,
+    drone: dronekit.Vehicle,
+    maximum_flight_time: float,
+    timeout: float = DRONE_TIMEOUT,
 ) -> bool:
     """
-    Check if drone exceeds the maximum flight time limit and replace with new mission of returning to launch.
+    Check if drone exceeds the maximum flight time limit and send it back to launch.
 
     Parameters
     -----------
@@ -26,6 +36,8 @@ def check_stop_condition(
         The connected drone.
     maximum_flight_time: float
         Max flight time for drone in seconds.
+    timeout: float
+        Time limit in seconds for the drone to confirm RTL mode, and for the mission upload.
 
     Returns
     -------
@@ -34,11 +46,82 @@ def check_stop_condition(
     if current_time - start_time < maximum_flight_time:
         return False
 
+    # The mission upload finishes in the background and reports its own failure
+    result, time_and_upload = priority_return_to_launch(drone, timeout)
+    if not result:
+        print("Return to launch failed.")
+        return True
+
+    time_to_rtl, _ = time_and_upload
+    print(f"Time to RTL (s): {time_to_rtl}")
+
+    return True
+
+
+def priority_return_to_launch(
+    drone: dronekit.Vehicle, timeout: float
+) -> "tuple[True, tuple[float, concurrent.futures.Future[bool]]] | tuple[False, None]":
+    """
+    Switches the drone to RTL mode with a single command, then replaces the mission with RTL
+    in a background thread, so that the drone still returns if it is later switched back
+    to auto. Returns once the drone reports RTL mode, without waiting for the upload.
+
+    drone: The connected drone.
+    timeout: Time limit in seconds for the drone to confirm RTL mode, and for the upload.
+
+    Return: Success of the mode change, time in seconds from sending the mode change to the
+    drone reporting RTL, and the future success of the upload.
+    """
+    is_rtl_event = threading.Event()
+
+    # Called by DroneKit with the vehicle, attribute name and value
+    # pylint: disable-next=unused-argument
+    def on_mode(vehicle: dronekit.Vehicle, name: str, mode: dronekit.VehicleMode) -> None:
+        if mode.name == RTL_MODE_NAME:
+            is_rtl_event.set()
+
+    drone.add_attribute_listener("mode", on_mode)
+
+    start_time = time.perf_counter()
+    drone.mode = dronekit.VehicleMode(RTL_MODE_NAME)
+
+    # The current mission is replaced without downloading it first, as every second counts
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    upload_future = executor.submit(upload_return_to_launch_mission, drone, timeout)
+    # The upload still finishes before the interpreter exits
+    executor.shutdown(wait=False)
+
+    is_rtl = drone.mode.name == RTL_MODE_NAME or is_rtl_event.wait(timeout)
+    time_to_rtl = time.perf_counter() - start_time
+
+    drone.remove_attribute_listener("mode", on_mode)
+
+    if not is_rtl:
+        print("Drone did not confirm RTL mode.")
+        return False, None
+
+    return True, (time_to_rtl, upload_future)
+
+
+def upload_return_to_launch_mission(drone: dronekit.Vehicle, timeout: float) -> bool:
+    """
+    Replaces the mission with a single RTL command.
+
+    drone: The connected drone.
+    timeout: Time limit in seconds for the upload.
+
+    Return: Success.
+    """
     rtl_command = generate_command.return_to_launch()
 
-    # Invoke upload_commands to clear previous commands and direct drone back to launch location
-    result = upload_commands.upload_commands(drone, [rtl_command], DRONE_TIMEOUT)
+    try:
+        result = upload_commands.upload_commands(
+            drone, [rtl_command], timeout, download_first=False
+        )
+    except dronekit.APIException:
+        result = False
+
     if not result:
         print("Unable to upload RTL command to drone command sequence.")
 
-    return True
+    return result
@@ -21,3 +21,27 @@ class Condition(abc.ABC):
         """
         A message to output when the condition evalues to true
         """
+
+    def evaluation_period(self) -> float:
+        """
+        Minimum time in seconds between evaluations by the scheduler, 0 to evaluate every time.
+        """
+        return 0.0
+
+    def evaluation_cost(self) -> float:
+        """
+        Relative cost of an evaluation, cheaper conditions of equal priority are evaluated first.
+        """
+        return 0.0
+
+    def priority(self) -> int:
+        """
+        Conditions with higher priority are evaluated first.
+        """
+        return 0
+
+    def is_critical(self) -> bool:
+        """
+        Whether the remaining conditions are skipped once this condition is met.
+        """
+        return False
@@ -2,6 +2,8 @@
 Module to evaluate multiple Evaluator objects
 """
 
+import time
+
 from . import condition
 
 
@@ -22,6 +24,17 @@ class ConditionEvaluator:
         """
         self.evaluate_object_list = condition_list
 
+        # Scheduling order: highest priority first, then cheapest first
+        self.__schedule = sorted(
+            range(len(condition_list)),
+            key=lambda i: (-condition_list[i].priority(), condition_list[i].evaluation_cost()),
+        )
+        self.__next_evaluation_times = [0.0] * len(condition_list)
+
+        # Per condition number of evaluations and total time spent evaluating, in seconds
+        self.__evaluation_counts = [0] * len(condition_list)
+        self.__evaluation_times = [0.0] * len(condition_list)
+
     def evaluate_all_conditions(self) -> bool:
         """
         Runs all the evaluate objects. If any of the evaluations return true, evaluate_all outputs
@@ -34,3 +47,49 @@ class ConditionEvaluator:
                 evaluate_object.message()
 
         return evaluation
+
+    def evaluate_due_conditions(self) -> bool:
+        """
+        Runs the evaluate objects whose evaluation period has passed, in priority order.
+        Stops at the first critical condition that is met. Outputs the status message of each
+        condition that is met.
+
+        Return: True if any evaluated condition is met.
+        """
+        evaluation = False
+        for i in self.__schedule:
+            current_time = time.monotonic()
+            if current_time < self.__next_evaluation_times[i]:
+                continue
+
+            evaluate_object = self.evaluate_object_list[i]
+            self.__next_evaluation_times[i] = current_time + evaluate_object.evaluation_period()
+
+            start_time = time.perf_counter()
+            is_met = evaluate_object.evaluate_condition()
+            self.__evaluation_times[i] += time.perf_counter() - start_time
+            self.__evaluation_counts[i] += 1
+
+            if not is_met:
+                continue
+
+            evaluation = True
+            evaluate_object.message()
+            if evaluate_object.is_critical():
+                break
+
+        return evaluation
+
+    def evaluation_statistics(self) -> "list[tuple[condition.Condition, int, float]]":
+        """
+        Per condition number of scheduled evaluations and mean evaluation time in seconds,
+        in the order the conditions were given.
+        """
+        return [
+            (
+                evaluate_object,
+                self.__evaluation_counts[i],
+                self.__evaluation_times[i] / max(self.__evaluation_counts[i], 1),
+            )
+            for i, evaluate_object in enumerate(self.evaluate_object_list)
+        ]
@@ -0,0 +1,116 @@
+"""
+Plans diversions around fixed restricted areas, reusing the obstacle graph between plans.
+"""
+
+import numpy as np
+import shapely.geometry
+
+from . import local_frame
+from . import visibility_graph
+from .common.modules import location_global
+
+
+# Distance in metres to keep the path away from the restricted areas
+DEFAULT_CLEARANCE = 10.0
+
+
+class DiversionPlanner:
+    """
+    Visibility graph of the restricted areas in a local metre frame. Visibility between the
+    obstacle nodes is kept between plans, so each plan only connects its start and goal.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        polygons: "list[list[location_global.LocationGlobal]]",
+        clearance: float = DEFAULT_CLEARANCE,
+        frame: "local_frame.LocalFrame | None" = None,
+    ) -> "tuple[True, DiversionPlanner] | tuple[False, None]":
+        """
+        polygons: List of restricted areas, each given by the waypoints that bound it.
+        clearance: Distance in metres to keep paths away from the restricted areas.
+        frame: Frame to plan in, centred on the restricted areas if not provided.
+        """
+        vertices = [vertex for polygon in polygons for vertex in polygon]
+        latitudes = np.array([vertex.latitude for vertex in vertices], dtype=np.float64)
+        longitudes = np.array([vertex.longitude for vertex in vertices], dtype=np.float64)
+
+        if frame is None:
+            result, frame = local_frame.LocalFrame.create_around(latitudes, longitudes)
+            if not result:
+                return False, None
+
+        # Project every vertex at once
+        east, north = frame.to_local(latitudes, longitudes)
+        # Same axis order as latitude and longitude, which sets how equal length detours are chosen
+        points = np.column_stack([north, east])
+
+        diversion_areas = []
+        offset = 0
+        for polygon in polygons:
+            diversion_areas.append(shapely.geometry.Polygon(points[offset : offset + len(polygon)]))
+            offset += len(polygon)
+
+        result, graph = visibility_graph.VisibilityGraph.create(diversion_areas, clearance)
+        if not result:
+            return False, None
+
+        return True, DiversionPlanner(cls.__create_key, frame, graph)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        frame: local_frame.LocalFrame,
+        graph: visibility_graph.VisibilityGraph,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is DiversionPlanner.__create_key, "Use create() method"
+
+        self.__frame = frame
+        self.__graph = graph
+
+    def plan(
+        self,
+        current_location: location_global.LocationGlobal,
+        rejoin_waypoint: location_global.LocationGlobal,
+    ) -> "tuple[True, list[location_global.LocationGlobal]] | tuple[False, None]":
+        """
+        Finds the shortest path from current_location to rejoin_waypoint around the restricted
+        areas.
+
+        current_location: Current location and start point of the drone.
+        rejoin_waypoint: Target destination waypoint.
+
+        Return: Success, waypoints from current_location to rejoin_waypoint inclusive.
+        """
+        east, north = self.__frame.to_local(
+            [current_location.latitude, rejoin_waypoint.latitude],
+            [current_location.longitude, rejoin_waypoint.longitude],
+        )
+
+        result, path = self.__graph.shortest_path((north[0], east[0]), (north[1], east[1]))
+        if not result:
+            return False, None
+
+        # Start and goal are the first and last node ids of the path
+        node_ids = np.array(path[1:-1], dtype=np.int64)
+        node_latitudes, node_longitudes = self.__frame.to_global(
+            self.__graph.nodes[node_ids, 1], self.__graph.nodes[node_ids, 0]
+        )
+
+        diversion_waypoints = [current_location]
+        for latitude, longitude in zip(node_latitudes.tolist(), node_longitudes.tolist()):
+            result, location = location_global.LocationGlobal.create(latitude, longitude)
+            if not result:
+                return False, None
+
+            diversion_waypoints.append(location)
+
+        diversion_waypoints.append(rejoin_waypoint)
+
+        return True, diversion_waypoints
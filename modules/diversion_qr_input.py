@@ -4,58 +4,87 @@ Function to read camera input until valid QR code.
 
 import cv2
 
-from modules.common.modules.camera import camera_factory
+from modules import camera_session
+from modules import pyramid_qr_scanner
 from modules.common.modules.qr import qr_scanner
 
 CAMERA_WIDTH = 1920
 CAMERA_HEIGHT = 1080
 
+WINDOW_NAME = "Camera"
 
-def diversion_qr_input(device: "int | str") -> "tuple[bool, str | None]":
+# Time to wait for the first frame of a camera opened by this call
+FIRST_FRAME_WAIT_TIME = 5.0  # seconds
+
+
+def diversion_qr_input(
+    device: "int | str",
+    pyramid_scan: bool = False,
+    session: "camera_session.CameraSession | None" = None,
+    show_preview: bool = False,
+) -> "tuple[bool, str | None]":
     """
     Checks camera input once, returns any valid text that is decoded from QR code.
+    Meant to be called every loop iteration with a session that stays open, in which case it
+    does not wait for the camera.
 
     Parameters
     ----------
     device: int | string
         Camera device name or index (e.g. /dev/video0).
+    pyramid_scan: bool
+        Locate the QR code on a downscaled frame and decode only that region.
+    session: camera_session.CameraSession | None
+        Camera that is already open, device is ignored if provided. It stays open for its other
+        users. Otherwise the camera is opened and closed by this call.
+    show_preview: bool
+        Show the frame that was checked in a window, which blocks on the window every call.
+        With a shared session, keep one frame_preview.FramePreview of the session's frame
+        buffer open instead, which draws from its own thread at a limited rate.
 
     Returns
     -------
     tuple[bool, str | None]
         A tuple indicating the success of the operation and the decoded QR code string, or None if unsuccessful.
     """
-    # Camera also created in qr_input.py with similar code, hence the the next line to make pylint shut up
-    # pylint: disable=duplicate-code
-    result, camera = camera_factory.create_camera(
-        camera_factory.CameraOption.OPENCV,
-        CAMERA_WIDTH,
-        CAMERA_HEIGHT,
-        camera_factory.camera_opencv.ConfigOpenCV(device),
-    )
+    if pyramid_scan:
+        result, scanner = pyramid_qr_scanner.PyramidQrScanner.create()
+        if not result:
+            print("ERROR: Could not create pyramid QR scanner")
+            return False, None
+    else:
+        scanner = qr_scanner.QrScanner()
+
+    is_own_session = session is None
+    frame_wait_time = FIRST_FRAME_WAIT_TIME if is_own_session else 0.0
+
+    # Released by close() below, which leaves a shared camera open for its other users
+    result, session = camera_session.use_session(session, device, CAMERA_WIDTH, CAMERA_HEIGHT)
     if not result:
-        print("OpenCV camera creation error.")
         return False, None
-    # pylint: enable=duplicate-code
-
-    scanner = qr_scanner.QrScanner()
 
     qr_text = None
     is_qr_text_found = False
 
-    # Get new image from camera as long as QR text not found
-    is_image_found, frame = camera.get_image()
+    # An open session has nothing new to decode if no frame arrived since the last call
+    is_image_found, frame_and_time = session.take_frame(frame_wait_time)
 
     if not is_image_found:
-        # Log error is camera fails to get image
-        print("ERROR: is_image_found returned false. Cannot get image from camera")
+        if is_own_session:
+            # Log error is camera fails to get image
+            print("ERROR: is_image_found returned false. Cannot get image from camera")
     else:
-        cv2.imshow("Camera", frame)
+        frame, _ = frame_and_time
+
+        if show_preview:
+            cv2.imshow(WINDOW_NAME, frame)
+            # The window only updates while OpenCV handles its events
+            cv2.waitKey(1)
 
         # Check frame for valid QR code if found
         is_qr_text_found, qr_text = scanner.get_qr_text(frame)
 
     # Cleanup
-    cv2.destroyAllWindows()
+    session.close()
 
     return is_qr_text_found, qr_text
@@ -0,0 +1,114 @@
+"""
+Shows camera frames in a window from a thread of its own, at a limited rate.
+"""
+
+import threading
+import time
+
+import cv2
+
+from . import latest_frame_buffer
+
+
+DEFAULT_WINDOW_NAME = "Camera"
+DEFAULT_MAXIMUM_RATE = 10.0  # frames per second
+
+# Longest time the preview thread goes without checking whether it should stop
+FRAME_WAIT_TIME = 0.1  # seconds
+
+QUIT_KEY = "q"
+
+
+class FramePreview:
+    """
+    Displays the newest frame of a buffer without taking it, so the window never holds up
+    decoding. Frames arriving faster than the maximum rate are skipped.
+    All OpenCV window calls are made from the preview thread.
+
+    Attributes:
+        maximum_rate: Frames shown per second at most.
+        window_name: Title of the window.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        frame_buffer: latest_frame_buffer.LatestFrameBuffer,
+        maximum_rate: float = DEFAULT_MAXIMUM_RATE,
+        window_name: str = DEFAULT_WINDOW_NAME,
+    ) -> "tuple[True, FramePreview] | tuple[False, None]":
+        """
+        frame_buffer: Frames to show.
+        maximum_rate: Frames shown per second at most, must be positive.
+        window_name: Title of the window.
+        """
+        if maximum_rate <= 0.0:
+            return False, None
+
+        return True, FramePreview(cls.__create_key, frame_buffer, maximum_rate, window_name)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        frame_buffer: latest_frame_buffer.LatestFrameBuffer,
+        maximum_rate: float,
+        window_name: str,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is FramePreview.__create_key, "Use create() method"
+
+        self.maximum_rate = maximum_rate
+        self.window_name = window_name
+
+        self.__frame_buffer = frame_buffer
+        self.__stop_event = threading.Event()
+        self.__quit_event = threading.Event()
+        self.__thread = threading.Thread(target=self.__show_frames, daemon=True)
+        self.__thread.start()
+
+    def close(self) -> None:
+        """
+        Stops the preview and closes the window.
+        """
+        self.__stop_event.set()
+        self.__thread.join()
+
+    def is_quit_requested(self) -> bool:
+        """
+        Whether the quit key was pressed in the window.
+        """
+        return self.__quit_event.is_set()
+
+    def __show_frames(self) -> None:
+        """
+        Runs in the preview thread until the preview is closed.
+        """
+        frame_period = 1.0 / self.maximum_rate
+
+        frame_number = 0
+        is_window_open = False
+        while not self.__stop_event.is_set():
+            is_frame_found, frame_and_number = self.__frame_buffer.wait_for_newer(
+                frame_number, FRAME_WAIT_TIME
+            )
+            if not is_frame_found:
+                continue
+
+            show_time = time.monotonic()
+            frame, frame_number = frame_and_number
+            cv2.imshow(self.window_name, frame)
+            is_window_open = True
+
+            if cv2.waitKey(1) == ord(QUIT_KEY):
+                self.__quit_event.set()
+
+            # Frames arriving until then are skipped, the newest is shown next
+            self.__stop_event.wait(max(show_time + frame_period - time.monotonic(), 0.0))
+
+        # OpenCV raises if the window was never created
+        if is_window_open:
+            cv2.destroyWindow(self.window_name)
@@ -16,6 +16,11 @@ LOITER_TIMED_FRAME = mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT
 LOITER_UNLIMITED_FRAME = mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT
 DO_JUMP_FRAME = mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT
 
+# Increment whenever a command generated from the same arguments changes, including the
+# missions built from them by waypoints_to_commands and add_takeoff_and_rtl_command,
+# to invalidate cached plans
+COMMAND_GENERATOR_VERSION = 1
+
 
 def landing() -> dronekit.Command:
     """
@@ -2,43 +2,71 @@
 Generates search path for hotspots.
 """
 
+import collections.abc
 import math
 
+import numpy as np
+
 from . import plot_circular_path
+from . import search_path_rings
 from .common.modules import position_global_relative_altitude
 
 
 MULTIPLIER = 1.2
 MINIMUM_POINTS = 3
 
+# Increment whenever the generated path changes for the same inputs, to invalidate cached plans
+PLANNER_VERSION = 1
 
-def generate_search_paths(
-    center: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+
+class SearchPathError(Exception):
+    """
+    Raised by a streamed search path when a ring cannot be generated.
+    """
+
+
+def __is_search_valid(
     search_radius: float,
     search_area_dimensions: "tuple[float, float]",
-) -> "tuple[bool, list[list[position_global_relative_altitude.PositionGlobalRelativeAltitude]] | None]":
+) -> bool:
     """
-    Generates list of spline waypoints representing concentric rings for drone search path.
+    Private function that checks the search radius and camera dimensions.
 
-    center: waypoint for center of circle.
     search_radius: drone search radius.
     search_area_dimensions: search area width, height
 
-    Returns: Success, list of list of waypoints.
+    Returns: Whether rings can be generated.
     """
     camera_horizontal_size, camera_vertical_size = search_area_dimensions
 
     if camera_horizontal_size <= 0 or camera_vertical_size <= 0:
         print(f"ERROR: Camera dimensions must be greater than 0: {search_area_dimensions}")
-        return False, None
+        return False
 
     if search_radius < 0:
         print(f"ERROR: Search radius must be greater than or equal to 0: {search_radius}")
-        return False, None
+        return False
+
+    return True
+
+
+def __ring_parameters(
+    search_radius: float,
+    search_area_dimensions: "tuple[float, float]",
+) -> "list[tuple[float, int]]":
+    """
+    Private function that computes the radius and number of points of every concentric ring.
+
+    search_radius: drone search radius.
+    search_area_dimensions: search area width, height
+
+    Returns: List of (radius, number of points), from the innermost ring outwards.
+    """
+    camera_horizontal_size, camera_vertical_size = search_area_dimensions
 
     current_radius = camera_horizontal_size / 2
 
-    all_waypoints = []
+    ring_parameters = []
 
     while current_radius <= search_radius:
         circumference = 2 * math.pi * current_radius
@@ -48,32 +76,136 @@ def generate_search_paths(
         num_points = math.ceil(MULTIPLIER * max(num_points_vertical, num_points_horizontal))
         num_points = max(MINIMUM_POINTS, num_points)
 
-        result, waypoints = plot_circular_path.generate_circular_path(
-            center, current_radius, num_points
-        )
-        if not result or waypoints is None:
-            return False, None
-        all_waypoints.append(waypoints)
+        ring_parameters.append((current_radius, num_points))
 
         current_radius += camera_horizontal_size
 
-    return True, all_waypoints
+    return ring_parameters
 
 
-def __flatten_waypoints(
-    waypoints: list[list[position_global_relative_altitude.PositionGlobalRelativeAltitude]],
-) -> list[position_global_relative_altitude.PositionGlobalRelativeAltitude]:
+def generate_search_path_rings(
+    center: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    search_radius: float,
+    search_area_dimensions: "tuple[float, float]",
+) -> "tuple[bool, search_path_rings.SearchPathRings | None]":
     """
-    Private function that transforms the list of list of all waypoints by circle into a linear list.
+    Generates concentric rings for drone search path as contiguous coordinate arrays.
+    All rings are converted to global coordinates in a single vectorized pass.
 
-    waypoints: list of list of all waypoints by circle
+    center: waypoint for center of circle.
+    search_radius: drone search radius.
+    search_area_dimensions: search area width, height
 
-    Returns: Linear list of all the waypoints.
+    Returns: Success, rings of waypoints.
     """
+    if not __is_search_valid(search_radius, search_area_dimensions):
+        return False, None
 
-    flattened_waypoints = [waypoint for circle in waypoints for waypoint in circle]
+    ring_parameters = __ring_parameters(search_radius, search_area_dimensions)
+    if len(ring_parameters) == 0:
+        return True, search_path_rings.SearchPathRings.create_empty()
 
-    return flattened_waypoints
+    all_offsets_x = []
+    all_offsets_y = []
+    ring_offsets = [0]
+    for radius, num_points in ring_parameters:
+        result, offsets = plot_circular_path.generate_circular_offsets(radius, num_points)
+        if not result:
+            return False, None
+
+        offsets_x, offsets_y = offsets
+        all_offsets_x.append(offsets_x)
+        all_offsets_y.append(offsets_y)
+        ring_offsets.append(ring_offsets[-1] + offsets_x.size)
+
+    result, coordinates = plot_circular_path.move_coordinates_by_offsets(
+        center, np.concatenate(all_offsets_x), np.concatenate(all_offsets_y)
+    )
+    if not result:
+        return False, None
+
+    latitudes, longitudes = coordinates
+
+    return search_path_rings.SearchPathRings.create(
+        latitudes,
+        longitudes,
+        np.full(latitudes.size, center.relative_altitude, dtype=np.float64),
+        np.array(ring_offsets, dtype=np.int64),
+    )
+
+
+def __generate_rings(
+    center: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    ring_parameters: "list[tuple[float, int]]",
+) -> collections.abc.Iterator[
+    list[position_global_relative_altitude.PositionGlobalRelativeAltitude]
+]:
+    """
+    Private generator that computes each ring only when the consumer asks for it.
+
+    center: waypoint for center of circle.
+    ring_parameters: List of (radius, number of points), from the innermost ring outwards.
+
+    Yields: List of waypoints of the next ring.
+    Raises: SearchPathError if a ring cannot be generated.
+    """
+    for radius, num_points in ring_parameters:
+        result, waypoints = plot_circular_path.generate_circular_path(center, radius, num_points)
+        # Parameters are validated before the generator is created
+        if not result or waypoints is None:
+            raise SearchPathError(f"Failed to generate ring with radius {radius} m")
+
+        yield waypoints
+
+
+def generate_search_path_lazy(
+    center: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    search_radius: float,
+    search_area_dimensions: "tuple[float, float]",
+) -> tuple[
+    bool,
+    collections.abc.Iterator[list[position_global_relative_altitude.PositionGlobalRelativeAltitude]]
+    | None,
+]:
+    """
+    Streaming version of generate_search_paths.
+    Inputs are validated immediately, but each ring is only computed when it is consumed,
+    so the inner rings can be converted to commands before the outer rings exist.
+
+    center: waypoint for center of circle.
+    search_radius: drone search radius.
+    search_area_dimensions: search area width, height
+
+    Returns: Success, iterator of list of waypoints, from the innermost ring outwards.
+        The iterator raises SearchPathError if a ring fails, so the path is never truncated.
+    """
+    if not __is_search_valid(search_radius, search_area_dimensions):
+        return False, None
+
+    ring_parameters = __ring_parameters(search_radius, search_area_dimensions)
+
+    return True, __generate_rings(center, ring_parameters)
+
+
+def generate_search_paths(
+    center: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    search_radius: float,
+    search_area_dimensions: "tuple[float, float]",
+) -> "tuple[bool, list[list[position_global_relative_altitude.PositionGlobalRelativeAltitude]] | None]":
+    """
+    Generates list of spline waypoints representing concentric rings for drone search path.
+
+    center: waypoint for center of circle.
+    search_radius: drone search radius.
+    search_area_dimensions: search area width, height
+
+    Returns: Success, list of list of waypoints.
+    """
+    result, rings = generate_search_path_rings(center, search_radius, search_area_dimensions)
+    if not result:
+        return False, None
+
+    return rings.rings_waypoints()
 
 
 def generate_search_path(
@@ -90,10 +222,11 @@ def generate_search_path(
 
     Returns: Success, list of waypoints.
     """
-    result, waypoints = generate_search_paths(center, search_radius, search_area_dimensions)
+    result, rings = generate_search_path_rings(center, search_radius, search_area_dimensions)
     if not result:
         return False, None
-    return True, __flatten_waypoints(waypoints)
+
+    return rings.waypoints()
 
 
 def get_search_path_sector(
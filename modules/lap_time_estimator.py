@@ -0,0 +1,198 @@
+"""
+Forecasts the duration of the next lap from the durations of previous laps.
+"""
+
+import math
+
+import numpy as np
+
+
+# Ring buffers and running statistics are kept separately so every update is constant time
+# pylint: disable-next=too-many-instance-attributes
+class LapTimeEstimator:
+    """
+    Keeps the most recent lap durations and their segment durations in ring buffers, along
+    with an exponentially weighted mean and variance of the lap durations.
+    Adding a segment or completing a lap takes constant time.
+
+    Attributes:
+        smoothing_factor: Weight of the newest lap in the mean and variance, in (0, 1].
+        safety_factor: Standard deviations added to the mean for the forecast.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        capacity: int,
+        segment_capacity: int,
+        smoothing_factor: float,
+        safety_factor: float,
+    ) -> "tuple[True, LapTimeEstimator] | tuple[False, None]":
+        """
+        capacity: Number of laps kept.
+        segment_capacity: Maximum number of segments in a lap.
+        smoothing_factor: Weight of the newest lap in the mean and variance, in (0, 1].
+        safety_factor: Standard deviations added to the mean for the forecast, not negative.
+        """
+        if capacity < 1 or segment_capacity < 1:
+            return False, None
+
+        if not 0.0 < smoothing_factor <= 1.0:
+            return False, None
+
+        if safety_factor < 0.0:
+            return False, None
+
+        return True, LapTimeEstimator(
+            cls.__create_key, capacity, segment_capacity, smoothing_factor, safety_factor
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        capacity: int,
+        segment_capacity: int,
+        smoothing_factor: float,
+        safety_factor: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is LapTimeEstimator.__create_key, "Use create() method"
+
+        self.smoothing_factor = smoothing_factor
+        self.safety_factor = safety_factor
+
+        # Laps are stored oldest to newest, wrapping around at the capacity
+        self.__lap_durations = np.zeros(capacity, dtype=np.float64)
+        # Slot of the next completed lap
+        self.__next_slot = 0
+        # One more slot holds the segments of the lap in progress, so they do not overwrite
+        # the oldest kept lap before it is completed. Lap n is in slot n % (capacity + 1)
+        self.__segment_durations = np.zeros((capacity + 1, segment_capacity), dtype=np.float64)
+        self.__segment_counts = np.zeros(capacity + 1, dtype=np.int64)
+        self.__lap_count = 0
+
+        # Time in the lap in progress
+        self.__current_lap_time = 0.0
+
+        self.__mean = 0.0
+        self.__variance = 0.0
+
+    def add_segment(self, duration: float) -> bool:
+        """
+        Records the time taken to fly a segment of the lap in progress.
+
+        duration: Time in seconds.
+
+        Return: Success, fails if the lap already has the maximum number of segments.
+        """
+        slot = self.__lap_count % len(self.__segment_counts)
+        segment_count = self.__segment_counts[slot]
+        if segment_count >= self.__segment_durations.shape[1]:
+            return False
+
+        self.__segment_durations[slot, segment_count] = duration
+        self.__segment_counts[slot] = segment_count + 1
+        self.__current_lap_time += duration
+
+        return True
+
+    def complete_lap(self, duration: "float | None" = None) -> None:
+        """
+        Ends the lap in progress, overwriting the oldest lap if the buffer is full.
+
+        duration: Time in seconds of the lap, the sum of its segments if not provided.
+        """
+        if duration is None:
+            duration = self.__current_lap_time
+
+        slot = self.__next_slot
+        self.__lap_durations[slot] = duration
+
+        if self.__lap_count == 0:
+            self.__mean = duration
+            self.__variance = 0.0
+        else:
+            # Exponentially weighted mean and variance, updated together
+            difference = duration - self.__mean
+            increment = self.smoothing_factor * difference
+            self.__mean += increment
+            self.__variance = (1.0 - self.smoothing_factor) * (
+                self.__variance + difference * increment
+            )
+
+        self.__lap_count += 1
+        self.__next_slot = (slot + 1) % len(self.__lap_durations)
+        self.__segment_counts[self.__lap_count % len(self.__segment_counts)] = 0
+        self.__current_lap_time = 0.0
+
+    def lap_count(self) -> int:
+        """
+        Number of laps completed, including laps no longer kept.
+        """
+        return self.__lap_count
+
+    def lap_durations(self) -> np.ndarray:
+        """
+        Durations of the kept laps, oldest first.
+        """
+        kept_count = min(self.__lap_count, len(self.__lap_durations))
+        if kept_count == 0:
+            return np.empty(0, dtype=np.float64)
+
+        return np.roll(self.__lap_durations, -self.__next_slot)[-kept_count:].copy()
+
+    def segment_durations(self, age: int) -> np.ndarray:
+        """
+        Segment durations of a kept lap.
+
+        age: 0 for the most recent lap, 1 for the one before, and so on.
+        """
+        capacity = len(self.__lap_durations)
+        if not 0 <= age < min(self.__lap_count, capacity):
+            return np.empty(0, dtype=np.float64)
+
+        slot = (self.__lap_count - 1 - age) % len(self.__segment_counts)
+        return self.__segment_durations[slot, : self.__segment_counts[slot]].copy()
+
+    def mean(self) -> float:
+        """
+        Exponentially weighted mean lap duration in seconds.
+        """
+        return self.__mean
+
+    def standard_deviation(self) -> float:
+        """
+        Exponentially weighted standard deviation of the lap duration in seconds.
+        """
+        return math.sqrt(self.__variance)
+
+    def forecast(self) -> float:
+        """
+        Duration in seconds that the next lap is unlikely to exceed: the weighted mean plus
+        safety_factor standard deviations. 0 if no lap has been completed.
+        """
+        return self.__mean + self.safety_factor * math.sqrt(self.__variance)
+
+    def remaining_forecast(self) -> float:
+        """
+        Forecast of the time in seconds left in the lap in progress, from its segments so far.
+        """
+        return max(self.forecast() - self.__current_lap_time, 0.0)
+
+    def percentile(self, percentage: float) -> float:
+        """
+        Percentile of the kept lap durations, takes time proportional to the capacity.
+
+        percentage: In [0, 100].
+
+        Return: Duration in seconds, 0 if no lap has been completed.
+        """
+        durations = self.lap_durations()
+        if len(durations) == 0:
+            return 0.0
+
+        return float(np.percentile(durations, percentage))
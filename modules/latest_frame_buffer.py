@@ -0,0 +1,133 @@
+"""
+Single slot frame buffer where the newest frame replaces any frame not yet taken.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+
+class LatestFrameBuffer:
+    """
+    Holds only the most recent camera frame, so a slow consumer always works on the newest one
+    and the producer never waits. Frames replaced before they were taken are counted as dropped.
+    Consumers block until a frame arrives instead of polling.
+
+    Attributes:
+        frame_count: Number of frames put.
+        dropped_count: Number of frames replaced before they were taken.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls) -> "tuple[True, LatestFrameBuffer] | tuple[False, None]":
+        """
+        Empty buffer.
+        """
+        return True, LatestFrameBuffer(cls.__create_key)
+
+    def __init__(self, class_private_create_key: object) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is LatestFrameBuffer.__create_key, "Use create() method"
+
+        # Notified on every put and on close
+        self.__frame_available = threading.Condition()
+        self.__is_closed = False
+
+        # Frame and its capture time, None once taken
+        self.__slot: "tuple[np.ndarray, float] | None" = None
+        # Newest frame, kept after it is taken for display
+        self.__latest_frame: "np.ndarray | None" = None
+
+        self.frame_count = 0
+        self.dropped_count = 0
+
+    def put(self, frame: np.ndarray, capture_time: "float | None" = None) -> None:
+        """
+        Replaces the frame in the buffer. Never blocks on the consumer.
+
+        frame: Camera image.
+        capture_time: time.monotonic() when the frame was captured, now if not provided.
+        """
+        if capture_time is None:
+            capture_time = time.monotonic()
+
+        with self.__frame_available:
+            if self.__slot is not None:
+                self.dropped_count += 1
+
+            self.__slot = (frame, capture_time)
+            self.__latest_frame = frame
+            self.frame_count += 1
+
+            self.__frame_available.notify_all()
+
+    def close(self) -> None:
+        """
+        Wakes every waiting consumer. Waits return immediately from now on.
+        """
+        with self.__frame_available:
+            self.__is_closed = True
+            self.__frame_available.notify_all()
+
+    def take(
+        self, timeout: float = 0.0
+    ) -> "tuple[True, tuple[np.ndarray, float]] | tuple[False, None]":
+        """
+        Removes the frame from the buffer, waiting for one if it is empty.
+
+        timeout: Time limit in seconds to wait, 0 to return immediately.
+
+        Return: Success, frame and its capture time. Fails if no new frame was put since the
+            last take before the timeout, or the buffer is closed.
+        """
+        with self.__frame_available:
+            self.__frame_available.wait_for(
+                lambda: self.__slot is not None or self.__is_closed, max(timeout, 0.0)
+            )
+            if self.__slot is None or self.__is_closed:
+                return False, None
+
+            frame_and_time = self.__slot
+            self.__slot = None
+
+        return True, frame_and_time
+
+    def wait_for_newer(
+        self, frame_number: int, timeout: float
+    ) -> "tuple[True, tuple[np.ndarray, int]] | tuple[False, None]":
+        """
+        Newest frame, whether or not it was taken, once it is newer than frame_number.
+
+        frame_number: Number of the last frame seen, 0 for none.
+        timeout: Time limit in seconds to wait.
+
+        Return: Success, frame and its number. Fails if no newer frame was put before the
+            timeout, or the buffer is closed.
+        """
+        with self.__frame_available:
+            self.__frame_available.wait_for(
+                lambda: self.frame_count > frame_number or self.__is_closed, max(timeout, 0.0)
+            )
+            if self.frame_count <= frame_number or self.__is_closed:
+                return False, None
+
+            return True, (self.__latest_frame, self.frame_count)
+
+    def latest(self) -> "tuple[True, np.ndarray] | tuple[False, None]":
+        """
+        Newest frame, whether or not it was taken.
+
+        Return: Success, frame. Fails if no frame was put yet.
+        """
+        with self.__frame_available:
+            frame = self.__latest_frame
+
+        if frame is None:
+            return False, None
+
+        return True, frame
@@ -2,50 +2,388 @@
 Name-coordinate mapping from CSV file.
 """
 
+import hashlib
+import itertools
+import mmap
+import os
 import pathlib
+import struct
+
+import numpy as np
 
 from .common.modules import location_global
 from .common.modules import position_global_relative_altitude
 
 
+HEADER = "name,latitude,longitude"
+HEADER_WITH_ALTITUDE = "name,latitude,longitude,altitude"
+
+CACHE_FILE_SUFFIX = ".wpc"
+TEMPORARY_FILE_SUFFIX = CACHE_FILE_SUFFIX + ".tmp"
+CACHE_MAGIC = b"WPC1"
+CACHE_VERSION = 1
+# Magic, version, column count, CSV modification time in ns, CSV size, CSV SHA-256,
+# row count, unique name count, name table size in bytes
+CACHE_HEADER_FORMAT = "<4sHHqQ32sQQQ"
+CACHE_HEADER_SIZE = struct.calcsize(CACHE_HEADER_FORMAT)
+# The modification time follows the magic, version and column count
+CACHE_MODIFICATION_TIME_FORMAT = "<q"
+CACHE_MODIFICATION_TIME_OFFSET = struct.calcsize("<4sHH")
+# Characters of the CSV path hash in the cache file name
+CACHE_PATH_HASH_LENGTH = 16
+# Names cannot contain line breaks, as each CSV row is a line
+CACHE_NAME_SEPARATOR = "\n"
+
+# Rows reported when a file fails validation, counted from 1 without the header or blank lines
+MAXIMUM_REPORTED_ROWS = 5
+
+
+class WaypointTable:
+    """
+    Waypoints of a CSV file as columns.
+
+    Attributes:
+        names: Name of each waypoint.
+        coordinates: Latitude, longitude and, if loaded, altitude of each waypoint, one row each.
+        name_to_row: Row of each name, the last row if a name is repeated.
+    """
+
+    def __init__(self, names: "list[str]", coordinates: np.ndarray) -> None:
+        """
+        Constructor.
+        """
+        self.names = names
+        self.coordinates = coordinates
+        self.name_to_row = dict(zip(names, range(len(names))))
+
+
+def load_waypoint_table(
+    waypoint_file_path: pathlib.Path, has_altitude: bool = False
+) -> "tuple[True, WaypointTable] | tuple[False, None]":
+    """
+    Loads a CSV file of name, latitude, longitude and optionally altitude in one pass.
+    A first line exactly matching the header is skipped, as are blank lines.
+
+    waypoint_file_path: Path to CSV file.
+    has_altitude: Whether each row has an altitude column.
+
+    Return: Success, waypoints. Fails if the file does not exist, has no waypoints, or any
+        row is malformed or out of range.
+    """
+    if not waypoint_file_path.exists():
+        return False, None
+
+    header = HEADER_WITH_ALTITUDE if has_altitude else HEADER
+    column_count = len(header.split(","))
+
+    with open(waypoint_file_path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+
+    # Blank lines are skipped
+    rows = list(filter(str.strip, lines))
+    if len(rows) > 0 and rows[0].strip() == header:
+        rows = rows[1:]
+
+    if len(rows) == 0:
+        return False, None
+
+    comma_counts = np.fromiter(
+        map(str.count, rows, itertools.repeat(",")), dtype=np.int64, count=len(rows)
+    )
+    malformed_rows = np.flatnonzero(comma_counts != column_count - 1)
+    if len(malformed_rows) > 0:
+        print(
+            f"ERROR: Expected {column_count} columns in {waypoint_file_path} on rows "
+            f"{(malformed_rows[:MAXIMUM_REPORTED_ROWS] + 1).tolist()}"
+        )
+        return False, None
+
+    # Split once over the whole file, every row has the same number of columns
+    cells = ",".join(rows).split(",")
+    names = cells[0::column_count]
+
+    # Every value is converted at once
+    try:
+        coordinates = np.array(
+            [cells[column::column_count] for column in range(1, column_count)], dtype=np.float64
+        ).T
+    except ValueError as exception:
+        print(f"ERROR: Value that is not a number in {waypoint_file_path}: {exception}")
+        return False, None
+
+    is_valid = (
+        np.isfinite(coordinates).all(axis=1)
+        & (np.abs(coordinates[:, 0]) <= 90.0)
+        & (np.abs(coordinates[:, 1]) <= 180.0)
+    )
+    if not is_valid.all():
+        invalid_rows = np.flatnonzero(~is_valid)
+        print(
+            f"ERROR: Coordinates out of range in {waypoint_file_path} on rows "
+            f"{(invalid_rows[:MAXIMUM_REPORTED_ROWS] + 1).tolist()}"
+        )
+        return False, None
+
+    return True, WaypointTable(names, np.ascontiguousarray(coordinates))
+
+
+def waypoint_cache_path(
+    waypoint_file_path: pathlib.Path, cache_directory_path: pathlib.Path
+) -> pathlib.Path:
+    """
+    Binary cache file of the CSV file in the cache directory. CSV files with the same name in
+    different directories have different cache files.
+    """
+    path_hash = hashlib.sha256(str(waypoint_file_path.resolve()).encode("utf-8")).hexdigest()
+    return pathlib.Path(
+        cache_directory_path,
+        f"{waypoint_file_path.stem}-{path_hash[:CACHE_PATH_HASH_LENGTH]}{CACHE_FILE_SUFFIX}",
+    )
+
+
+def save_waypoint_table_cache(
+    cache_file_path: pathlib.Path,
+    table: WaypointTable,
+    csv_status: os.stat_result,
+    csv_hash: bytes,
+) -> bool:
+    """
+    Saves a table as a fixed header, a name index per row, a table of the unique names, and
+    the coordinates as float64 columns.
+
+    cache_file_path: Path to write.
+    table: Waypoints loaded from the CSV file.
+    csv_status: Status of the CSV file when it was loaded.
+    csv_hash: SHA-256 of the CSV file.
+
+    Return: Success.
+    """
+    # Repeated names are stored once
+    unique_names, name_ids = np.unique(np.array(table.names, dtype=object), return_inverse=True)
+    name_table = CACHE_NAME_SEPARATOR.join(unique_names.tolist()).encode("utf-8")
+
+    row_count, column_count = table.coordinates.shape
+    header = struct.pack(
+        CACHE_HEADER_FORMAT,
+        CACHE_MAGIC,
+        CACHE_VERSION,
+        column_count,
+        csv_status.st_mtime_ns,
+        csv_status.st_size,
+        csv_hash,
+        row_count,
+        len(unique_names),
+        len(name_table),
+    )
+    name_ids = name_ids.astype("<u4").tobytes()
+    # Coordinates start on an 8 byte boundary so they can be viewed in place
+    padding = bytes(-(CACHE_HEADER_SIZE + len(name_ids) + len(name_table)) % 8)
+    columns = np.ascontiguousarray(table.coordinates.T, dtype="<f8").tobytes()
+
+    # Written under a temporary name so that an interrupted save is never loaded
+    temporary_file_path = cache_file_path.with_suffix(TEMPORARY_FILE_SUFFIX)
+    try:
+        cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temporary_file_path, "wb") as file:
+            file.write(header + name_ids + name_table + padding + columns)
+
+        os.replace(temporary_file_path, cache_file_path)
+    except OSError as exception:
+        print(f"Failed to write waypoint cache with exception: {exception}")
+        return False
+
+    return True
+
+
+def load_waypoint_table_cache(
+    cache_file_path: pathlib.Path,
+    waypoint_file_path: pathlib.Path,
+    column_count: int,
+) -> "tuple[True, WaypointTable] | tuple[False, None]":
+    """
+    Loads a cached table if it matches the CSV file. The coordinates are a read only view of
+    the memory mapped cache file. If only the modification time of the CSV file changed, it is
+    updated in the cache so that the CSV file is not hashed again next time.
+
+    cache_file_path: Path to the cache file.
+    waypoint_file_path: Path to the CSV file the cache was made from.
+    column_count: Number of coordinate columns expected.
+
+    Return: Success, waypoints. Fails if there is no cache or it is stale or corrupt.
+    """
+    if not cache_file_path.exists():
+        return False, None
+
+    try:
+        csv_status = waypoint_file_path.stat()
+        with open(cache_file_path, "rb") as file:
+            cache = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    # Required for catching library exceptions
+    # pylint: disable-next=broad-exception-caught
+    except Exception as exception:
+        print(f"Failed to read waypoint cache with exception: {exception}")
+        return False, None
+
+    if len(cache) < CACHE_HEADER_SIZE:
+        return False, None
+
+    (
+        magic,
+        version,
+        cached_column_count,
+        csv_mtime_ns,
+        csv_size,
+        csv_hash,
+        row_count,
+        name_count,
+        name_table_size,
+    ) = struct.unpack_from(CACHE_HEADER_FORMAT, cache)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or cached_column_count != column_count:
+        return False, None
+
+    if csv_size != csv_status.st_size:
+        return False, None
+
+    # A CSV file that was only touched or copied is still valid, but has to be hashed
+    is_touched = csv_mtime_ns != csv_status.st_mtime_ns
+    if is_touched:
+        if hashlib.sha256(waypoint_file_path.read_bytes()).digest() != csv_hash:
+            return False, None
+
+    name_ids_offset = CACHE_HEADER_SIZE
+    name_table_offset = name_ids_offset + 4 * row_count
+    columns_offset = name_table_offset + name_table_size
+    columns_offset += -columns_offset % 8
+    if len(cache) != columns_offset + 8 * column_count * row_count:
+        return False, None
+
+    name_ids = np.frombuffer(cache, dtype="<u4", count=row_count, offset=name_ids_offset)
+    unique_names = (
+        cache[name_table_offset : name_table_offset + name_table_size]
+        .decode("utf-8")
+        .split(CACHE_NAME_SEPARATOR)
+    )
+    if len(unique_names) != name_count or (row_count > 0 and name_ids.max() >= name_count):
+        return False, None
+
+    coordinates = np.frombuffer(
+        cache, dtype="<f8", count=column_count * row_count, offset=columns_offset
+    ).reshape(column_count, row_count)
+
+    names = np.array(unique_names, dtype=object)[name_ids].tolist()
+
+    if is_touched:
+        # A failed update only costs hashing again next time
+        __update_cache_modification_time(cache_file_path, csv_status.st_mtime_ns)
+
+    return True, WaypointTable(names, coordinates.T)
+
+
+def __update_cache_modification_time(cache_file_path: pathlib.Path, csv_mtime_ns: int) -> bool:
+    """
+    Overwrites the CSV modification time in the cache header in place, as the file may be
+    memory mapped. A partly written time only fails to match, so the CSV file is hashed again.
+
+    Return: Success.
+    """
+    try:
+        with open(cache_file_path, "r+b") as file:
+            file.seek(CACHE_MODIFICATION_TIME_OFFSET)
+            file.write(struct.pack(CACHE_MODIFICATION_TIME_FORMAT, csv_mtime_ns))
+    except OSError as exception:
+        print(f"Failed to update waypoint cache with exception: {exception}")
+        return False
+
+    return True
+
+
+def load_waypoint_table_cached(
+    waypoint_file_path: pathlib.Path,
+    cache_directory_path: pathlib.Path,
+    has_altitude: bool = False,
+) -> "tuple[True, WaypointTable] | tuple[False, None]":
+    """
+    Loads a CSV file as load_waypoint_table() does, from its binary cache if the CSV file is
+    unchanged. Otherwise parses the CSV file and writes the cache.
+
+    waypoint_file_path: Path to CSV file.
+    cache_directory_path: Directory of the cache, created if it does not exist.
+    has_altitude: Whether each row has an altitude column.
+
+    Return: Success, waypoints.
+    """
+    if not waypoint_file_path.exists():
+        return False, None
+
+    column_count = len((HEADER_WITH_ALTITUDE if has_altitude else HEADER).split(",")) - 1
+    cache_file_path = waypoint_cache_path(waypoint_file_path, cache_directory_path)
+
+    result, table = load_waypoint_table_cache(cache_file_path, waypoint_file_path, column_count)
+    if result:
+        return True, table
+
+    # Status and hash are taken first, so a CSV file changed while loading is loaded again
+    try:
+        csv_status = waypoint_file_path.stat()
+        csv_hash = hashlib.sha256(waypoint_file_path.read_bytes()).digest()
+    except OSError as exception:
+        print(f"Failed to read waypoint file with exception: {exception}")
+        return False, None
+
+    result, table = load_waypoint_table(waypoint_file_path, has_altitude)
+    if not result:
+        return False, None
+
+    # A failed save only costs parsing again next time
+    save_waypoint_table_cache(cache_file_path, table, csv_status, csv_hash)
+
+    return True, table
+
+
+def __load_waypoint_table(
+    waypoint_file_path: pathlib.Path,
+    cache_directory_path: "pathlib.Path | None",
+    has_altitude: bool,
+) -> "tuple[True, WaypointTable] | tuple[False, None]":
+    """
+    Loads the CSV file through its binary cache if a cache directory is provided.
+    """
+    if cache_directory_path is None:
+        return load_waypoint_table(waypoint_file_path, has_altitude)
+
+    return load_waypoint_table_cached(waypoint_file_path, cache_directory_path, has_altitude)
+
+
 def load_waypoint_name_to_coordinates_map(
     waypoint_file_path: pathlib.Path,
+    cache_directory_path: "pathlib.Path | None" = None,
 ) -> tuple[True, dict[str, location_global.LocationGlobal]] | tuple[False, None]:
     """
     Creates a name to coordinate dictionary from the CSV file.
 
     waypoint_file_path: Path to CSV file.
+    cache_directory_path: Directory of the binary cache, None to always parse the CSV file.
 
     Return: Success, name to coordinate dictionary.
     """
-    if not waypoint_file_path.exists():
+    result, table = __load_waypoint_table(waypoint_file_path, cache_directory_path, False)
+    if not result:
         return False, None
 
     name_to_coordinates_map = {}
-    with open(waypoint_file_path, encoding="utf-8") as file:
-        for line in file:
-            # Skip header and empty lines
-            parts = line.split(",")
-            if line in "name,latitude,longitude\n" or len(parts) < 3:
-                continue
+    for name, (latitude, longitude) in zip(table.names, table.coordinates.tolist()):
+        result, named_location = location_global.LocationGlobal.create(latitude, longitude)
+        if not result:
+            return False, None
 
-            name, latitude, longitude = parts
-            result, named_location = location_global.LocationGlobal.create(
-                float(latitude), float(longitude)
-            )
-            if not result:
-                return False, None
+        name_to_coordinates_map[name] = named_location
 
-            name_to_coordinates_map[name] = named_location
-
-    if len(name_to_coordinates_map) > 0:
-        return True, name_to_coordinates_map
-
-    return False, None
+    return True, name_to_coordinates_map
 
 
 def load_waypoint_name_to_coordinates_and_altitude_map(
     waypoint_file_path: pathlib.Path,
+    cache_directory_path: "pathlib.Path | None" = None,
 ) -> (
     tuple[True, dict[str, position_global_relative_altitude.PositionGlobalRelativeAltitude]]
     | tuple[False, None]
@@ -54,30 +392,22 @@ def load_waypoint_name_to_coordinates_and_altitude_map(
     Creates a name to coordinate and altitude dictionary from the CSV file.
 
     waypoint_file_path: Path to CSV file.
+    cache_directory_path: Directory of the binary cache, None to always parse the CSV file.
 
     Return: Success, name to coordinate and altitude dictionary.
     """
-    if not waypoint_file_path.exists():
+    result, table = __load_waypoint_table(waypoint_file_path, cache_directory_path, True)
+    if not result:
         return False, None
 
     name_to_coordinates_and_altitude_map = {}
-    with open(waypoint_file_path, encoding="utf-8") as file:
-        for line in file:
-            # Skip header and empty lines
-            parts = line.split(",")
-            if line in "name,latitude,longitude,altitude\n" or len(parts) < 4:
-                continue
-
-            name, latitude, longitude, altitude = parts
-            result, point = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
-                float(latitude), float(longitude), float(altitude)
-            )
-            if not result:
-                return False, None
-
-            name_to_coordinates_and_altitude_map[name] = point
+    for name, (latitude, longitude, altitude) in zip(table.names, table.coordinates.tolist()):
+        result, point = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+            latitude, longitude, altitude
+        )
+        if not result:
+            return False, None
 
-    if len(name_to_coordinates_and_altitude_map) > 0:
-        return True, name_to_coordinates_and_altitude_map
+        name_to_coordinates_and_altitude_map[name] = point
 
-    return False, None
+    return True, name_to_coordinates_and_altitude_map
@@ -0,0 +1,111 @@
+"""
+Local east-north frame in metres around an origin, for planning with metric distances.
+"""
+
+import math
+
+import numpy as np
+
+
+# WGS 84 ellipsoid
+SEMI_MAJOR_AXIS = 6378137.0  # metres
+ECCENTRICITY_SQUARED = 6.69437999014e-3
+
+
+class LocalFrame:
+    """
+    Plane tangent to the WGS 84 ellipsoid at the origin, with x east and y north in metres.
+    The conversion is linear in latitude and longitude, so a straight segment in the frame is
+    also a straight segment in latitude and longitude, and clearances are kept in both.
+    Distances are accurate near the origin and degrade over tens of kilometres.
+
+    Attributes:
+        origin_latitude: Decimal degrees.
+        origin_longitude: Decimal degrees.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, origin_latitude: float, origin_longitude: float
+    ) -> "tuple[True, LocalFrame] | tuple[False, None]":
+        """
+        origin_latitude: Decimal degrees, must be away from the poles.
+        origin_longitude: Decimal degrees.
+        """
+        if not math.isfinite(origin_latitude) or not math.isfinite(origin_longitude):
+            return False, None
+
+        if abs(origin_latitude) >= 90.0:
+            return False, None
+
+        return True, LocalFrame(cls.__create_key, origin_latitude, origin_longitude)
+
+    @classmethod
+    def create_around(
+        cls, latitudes: np.ndarray, longitudes: np.ndarray
+    ) -> "tuple[True, LocalFrame] | tuple[False, None]":
+        """
+        Frame with the origin at the centre of the bounding box of the coordinates.
+
+        latitudes, longitudes: Decimal degrees, at least one coordinate.
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if latitudes.size == 0 or latitudes.shape != longitudes.shape:
+            return False, None
+
+        return cls.create(
+            float(latitudes.min() + latitudes.max()) / 2.0,
+            float(longitudes.min() + longitudes.max()) / 2.0,
+        )
+
+    def __init__(
+        self, class_private_create_key: object, origin_latitude: float, origin_longitude: float
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is LocalFrame.__create_key, "Use create() method"
+
+        self.origin_latitude = origin_latitude
+        self.origin_longitude = origin_longitude
+
+        # Radii of curvature at the origin, along the meridian and the prime vertical
+        sin_latitude = math.sin(math.radians(origin_latitude))
+        denominator = 1.0 - ECCENTRICITY_SQUARED * sin_latitude**2
+        meridian_radius = SEMI_MAJOR_AXIS * (1.0 - ECCENTRICITY_SQUARED) / denominator**1.5
+        prime_vertical_radius = SEMI_MAJOR_AXIS / math.sqrt(denominator)
+
+        # Metres per degree
+        self.__north_scale = math.radians(meridian_radius)
+        self.__east_scale = math.radians(prime_vertical_radius) * math.cos(
+            math.radians(origin_latitude)
+        )
+
+    def to_local(
+        self, latitudes: np.ndarray, longitudes: np.ndarray
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        """
+        latitudes, longitudes: Decimal degrees.
+
+        Return: East and north offsets from the origin in metres.
+        """
+        east = (
+            np.asarray(longitudes, dtype=np.float64) - self.origin_longitude
+        ) * self.__east_scale
+        north = (
+            np.asarray(latitudes, dtype=np.float64) - self.origin_latitude
+        ) * self.__north_scale
+        return east, north
+
+    def to_global(self, east: np.ndarray, north: np.ndarray) -> "tuple[np.ndarray, np.ndarray]":
+        """
+        east, north: Offsets from the origin in metres.
+
+        Return: Latitudes and longitudes in decimal degrees.
+        """
+        latitudes = self.origin_latitude + np.asarray(north, dtype=np.float64) / self.__north_scale
+        longitudes = self.origin_longitude + np.asarray(east, dtype=np.float64) / self.__east_scale
+        return latitudes, longitudes
@@ -0,0 +1,163 @@
+"""
+Local copy of the drone's mission, so that waypoint lookups do not download the mission.
+"""
+
+import threading
+
+from .common.modules.mavlink import dronekit
+
+
+# MISSION_CURRENT total when the autopilot does not report it
+UNKNOWN_MISSION_TOTAL = 0xFFFF
+
+
+class MissionMirror:
+    """
+    Mission items and current waypoint of the drone, kept up to date from MAVLink messages.
+    The items are downloaded once when the mirror is stale, which is after creation, after
+    a mission upload is acknowledged, and after the mission length changes.
+    The current waypoint is taken from MISSION_CURRENT without any download.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(cls, drone: dronekit.Vehicle) -> "tuple[True, MissionMirror] | tuple[False, None]":
+        """
+        drone: The connected drone.
+        """
+        if drone is None:
+            return False, None
+
+        return True, MissionMirror(cls.__create_key, drone)
+
+    def __init__(self, class_private_create_key: object, drone: dronekit.Vehicle) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is MissionMirror.__create_key, "Use create() method"
+
+        self.__drone = drone
+
+        # Written by the DroneKit message thread
+        self.__lock = threading.Lock()
+        self.__is_stale = True
+        self.__is_downloading = False
+        self.__current_waypoint = drone.commands.next
+
+        # Command, latitude and longitude of each item after home
+        self.__items: "list[tuple[int, float, float]]" = []
+
+        self.__listeners = [
+            ("MISSION_CURRENT", self.__on_mission_current),
+            ("MISSION_COUNT", self.__on_mission_count),
+            ("MISSION_ACK", self.__on_mission_ack),
+        ]
+        for message_name, listener in self.__listeners:
+            drone.add_message_listener(message_name, listener)
+
+    def close(self) -> None:
+        """
+        Stops following the drone's messages.
+        """
+        for message_name, listener in self.__listeners:
+            self.__drone.remove_message_listener(message_name, listener)
+
+    def invalidate(self) -> None:
+        """
+        Downloads the mission again on the next lookup.
+        """
+        with self.__lock:
+            self.__is_stale = True
+
+    def refresh(self, timeout: float) -> bool:
+        """
+        Downloads the mission if it is stale.
+
+        timeout: Time limit in seconds for the download.
+
+        Return: Success.
+        """
+        with self.__lock:
+            if not self.__is_stale:
+                return True
+
+            # MISSION_COUNT from this download does not invalidate it
+            self.__is_downloading = True
+            self.__is_stale = False
+
+        command_sequence = self.__drone.commands
+        try:
+            command_sequence.download()
+            result = command_sequence.wait_ready(timeout=timeout, raise_exception=False)
+        finally:
+            with self.__lock:
+                self.__is_downloading = False
+
+        if not result:
+            self.invalidate()
+            print("Timed out downloading mission for the mirror")
+            return False
+
+        items = [(command.command, command.x, command.y) for command in command_sequence]
+
+        with self.__lock:
+            self.__items = items
+
+        return True
+
+    def current_waypoint_info(
+        self, timeout: float
+    ) -> "tuple[True, tuple[int, tuple[int, float, float] | None]] | tuple[False, None]":
+        """
+        Current waypoint sequence and its item, downloading the mission only if it is stale.
+
+        timeout: Time limit in seconds for a download.
+
+        Return: Success, current waypoint sequence and (command, latitude, longitude) of the
+            item at that index. The item is None if the index is past the end of the mission.
+        """
+        result = self.refresh(timeout)
+        if not result:
+            return False, None
+
+        with self.__lock:
+            current_waypoint = self.__current_waypoint
+            if current_waypoint < len(self.__items):
+                return True, (current_waypoint, self.__items[current_waypoint])
+
+        return True, (current_waypoint, None)
+
+    # Called by DroneKit with the vehicle, message name and message
+    # pylint: disable=unused-argument
+
+    def __on_mission_current(self, vehicle: dronekit.Vehicle, name: str, message: object) -> None:
+        """
+        Follows the current waypoint.
+        """
+        with self.__lock:
+            self.__current_waypoint = message.seq
+            if self.__is_downloading:
+                return
+
+            # Newer autopilots also report the number of items, excluding home
+            total = getattr(message, "total", 0)
+            if total not in (0, UNKNOWN_MISSION_TOTAL) and total != len(self.__items):
+                self.__is_stale = True
+
+    def __on_mission_count(self, vehicle: dronekit.Vehicle, name: str, message: object) -> None:
+        """
+        The mission is being downloaded by someone else, and may have changed.
+        """
+        with self.__lock:
+            if not self.__is_downloading:
+                self.__is_stale = True
+
+    def __on_mission_ack(self, vehicle: dronekit.Vehicle, name: str, message: object) -> None:
+        """
+        A mission upload finished.
+        """
+        with self.__lock:
+            self.__is_stale = True
+
+    # pylint: enable=unused-argument
@@ -0,0 +1,311 @@
+"""
+Asyncio runtime that runs the parts of a mission as concurrent tasks, so that a slow upload or
+camera read does not hold up the flight time checks.
+"""
+
+import asyncio
+import collections.abc
+import concurrent.futures
+import time
+
+from . import check_stop_condition
+from . import condition_evaluator
+from . import telemetry_monitor
+from . import upload_commands
+from .common.modules.mavlink import dronekit
+
+
+# How long a blocking call may keep the runtime waiting before it checks for a stop
+TELEMETRY_WAIT_TIME = 0.5  # seconds
+
+
+async def upload_commands_async(
+    drone: dronekit.Vehicle,
+    commands: collections.abc.Iterable[dronekit.Command],
+    timeout: float,
+    download_first: bool = True,
+    verify: bool = False,
+) -> bool:
+    """
+    Runs upload_commands() in a worker thread.
+    On timeout or cancellation the caller stops waiting, but the upload in progress is not
+    interrupted, as DroneKit has no way to abort it.
+
+    timeout: Time limit in seconds for the whole upload.
+
+    Return: Success.
+    """
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(
+                upload_commands.upload_commands,
+                drone,
+                list(commands),
+                timeout,
+                download_first,
+                verify,
+            ),
+            timeout,
+        )
+    except TimeoutError:
+        print("Upload of commands timed out")
+        return False
+
+
+async def check_stop_condition_async(
+    start_time: float, drone: dronekit.Vehicle, maximum_flight_time: float, timeout: float
+) -> bool:
+    """
+    Runs check_stop_condition() in a worker thread with the current time.
+
+    timeout: Time limit in seconds for the drone to confirm RTL mode.
+
+    Return: True if the maximum flight time was exceeded, even if RTL timed out.
+    """
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(
+                check_stop_condition.check_stop_condition,
+                start_time,
+                time.time(),
+                drone,
+                maximum_flight_time,
+                timeout,
+            ),
+            timeout,
+        )
+    except TimeoutError:
+        print("RTL timed out")
+        return True
+
+
+async def evaluate_all_conditions_async(
+    evaluator: condition_evaluator.ConditionEvaluator, timeout: float
+) -> bool:
+    """
+    Runs evaluate_all_conditions() in a worker thread.
+
+    timeout: Time limit in seconds for the evaluation.
+
+    Return: True if any condition is met, False otherwise or on timeout.
+    """
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(evaluator.evaluate_all_conditions), timeout)
+    except TimeoutError:
+        print("Evaluation of conditions timed out")
+        return False
+
+
+async def evaluate_due_conditions_async(
+    evaluator: condition_evaluator.ConditionEvaluator, timeout: float
+) -> bool:
+    """
+    Runs evaluate_due_conditions() in a worker thread.
+
+    timeout: Time limit in seconds for the evaluation.
+
+    Return: True if any evaluated condition is met, False otherwise or on timeout.
+    """
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(evaluator.evaluate_due_conditions), timeout)
+    except TimeoutError:
+        print("Evaluation of conditions timed out")
+        return False
+
+
+class MissionRuntime:
+    """
+    Runs mission tasks together with a flight time watchdog. When any task calls stop(), or
+    the maximum flight time is reached, every task is cancelled.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        drone: dronekit.Vehicle,
+        start_time: float,
+        maximum_flight_time: float,
+        drone_timeout: float,
+    ) -> "tuple[True, MissionRuntime] | tuple[False, None]":
+        """
+        drone: The connected drone.
+        start_time: Time the mission started in seconds since the epoch.
+        maximum_flight_time: Time in seconds after which the drone returns to launch.
+        drone_timeout: Time limit in seconds for each call to the drone.
+        """
+        if maximum_flight_time <= 0.0 or drone_timeout <= 0.0:
+            return False, None
+
+        return True, MissionRuntime(
+            cls.__create_key, drone, start_time, maximum_flight_time, drone_timeout
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        drone: dronekit.Vehicle,
+        start_time: float,
+        maximum_flight_time: float,
+        drone_timeout: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is MissionRuntime.__create_key, "Use create() method"
+
+        self.drone = drone
+        self.start_time = start_time
+        self.maximum_flight_time = maximum_flight_time
+        self.drone_timeout = drone_timeout
+
+        # Created in run(), as it belongs to the running event loop
+        self.__stop_event: "asyncio.Event | None" = None
+
+        # RTL mission upload still running after RTL mode was confirmed
+        self.__rtl_upload: concurrent.futures.Future[bool] | None = None
+
+    def stop(self) -> None:
+        """
+        Ends the mission, cancelling every task. Must be called from the event loop.
+        """
+        if self.__stop_event is not None:
+            self.__stop_event.set()
+
+    async def run(self, *coroutines: collections.abc.Coroutine) -> bool:
+        """
+        Runs the coroutines and the flight time watchdog until stop() is called or the
+        maximum flight time is reached. Coroutines that finish early do not end the mission.
+        An RTL mission upload started by the runtime is waited on after the tasks end.
+
+        coroutines: Mission tasks.
+
+        Return: Success, False if any task raised an exception. The flight time watchdog is
+            cancelled with the other tasks, so the drone is then returned to launch at once.
+        """
+        self.__stop_event = asyncio.Event()
+
+        is_successful = True
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(coroutine) for coroutine in coroutines]
+                tasks.append(group.create_task(self.__watch_flight_time()))
+
+                await self.__stop_event.wait()
+
+                for task in tasks:
+                    task.cancel()
+        except* Exception as exception_group:
+            for exception in exception_group.exceptions:
+                print(f"Mission task failed with exception: {exception}")
+
+            is_successful = False
+
+        if not is_successful:
+            await self.__return_to_launch()
+
+        # Tasks are already cancelled, so only the end of the run waits for the upload
+        if self.__rtl_upload is not None:
+            await asyncio.wrap_future(self.__rtl_upload)
+
+        return is_successful
+
+    async def watch_conditions(
+        self, evaluator: condition_evaluator.ConditionEvaluator, period: float
+    ) -> None:
+        """
+        Evaluates the conditions that are due every period, and returns to launch if any is met.
+
+        evaluator: Conditions to evaluate.
+        period: Time in seconds between checks, each condition may set a longer period of its own.
+        """
+        while True:
+            should_return_to_launch = await evaluate_due_conditions_async(
+                evaluator, self.drone_timeout
+            )
+            if should_return_to_launch:
+                await self.__return_to_launch()
+                return
+
+            await asyncio.sleep(period)
+
+    async def ingest_telemetry(
+        self,
+        monitor: telemetry_monitor.TelemetryMonitor,
+        handle_event: "collections.abc.Callable[[telemetry_monitor.TelemetryEvent], None]",
+    ) -> None:
+        """
+        Passes each telemetry event to handle_event as it arrives.
+
+        monitor: Source of the events.
+        handle_event: Called on the event loop for every event.
+        """
+        while True:
+            result, event = await asyncio.to_thread(monitor.next_event, TELEMETRY_WAIT_TIME)
+            if result:
+                handle_event(event)
+
+    async def scan_qr(
+        self,
+        read_qr: "collections.abc.Callable[[], tuple[bool, str | None]]",
+        handle_text: "collections.abc.Callable[[str], None]",
+        period: float,
+    ) -> None:
+        """
+        Reads the camera every period in a worker thread and passes any decoded text on.
+        A worker thread cannot be stopped, so a read still running after the drone timeout is
+        waited on again instead of starting another one.
+
+        read_qr: Camera read that does not wait for a QR code, such as a partial of
+            diversion_qr_input.diversion_qr_input() with a shared session.
+        handle_text: Called on the event loop with each decoded text.
+        period: Time in seconds between reads.
+        """
+        read_task = None
+        while True:
+            if read_task is None:
+                read_task = asyncio.ensure_future(asyncio.to_thread(read_qr))
+
+            try:
+                result, text = await asyncio.wait_for(asyncio.shield(read_task), self.drone_timeout)
+                read_task = None
+            except TimeoutError:
+                print("QR read timed out")
+                result, text = False, None
+
+            if result and text is not None:
+                handle_text(text)
+
+            await asyncio.sleep(period)
+
+    async def __watch_flight_time(self) -> None:
+        """
+        Sleeps until the maximum flight time, then returns to launch.
+        """
+        while True:
+            remaining_time = self.maximum_flight_time - (time.time() - self.start_time)
+            await asyncio.sleep(max(remaining_time, 0.0))
+
+            # The event loop clock may wake up slightly before the wall clock deadline
+            is_returning_to_launch = await check_stop_condition_async(
+                self.start_time, self.drone, self.maximum_flight_time, self.drone_timeout
+            )
+            if is_returning_to_launch:
+                break
+
+        self.stop()
+
+    async def __return_to_launch(self) -> None:
+        """
+        Switches the drone to RTL mode and ends the mission once RTL is confirmed, while the
+        mission is replaced with RTL in the background.
+        """
+        result, time_and_upload = await asyncio.to_thread(
+            check_stop_condition.priority_return_to_launch, self.drone, self.drone_timeout
+        )
+        if result:
+            time_to_rtl, self.__rtl_upload = time_and_upload
+            print(f"Time to RTL (s): {time_to_rtl}")
+
+        self.stop()
@@ -5,6 +5,10 @@ Checks whether the drone has reached its max flight time and sends it back to la
 import time
 
 from . import condition
+from . import lap_time_estimator
+
+
+MISSION_TIME_PRIORITY = 100
 
 
 class MissionTimeCondition(condition.Condition):
@@ -16,13 +20,19 @@ class MissionTimeCondition(condition.Condition):
 
     @classmethod
     def create(
-        cls, start_time: "float | None", maximum_flight_time: "float | None"
+        cls,
+        start_time: "float | None",
+        maximum_flight_time: "float | None",
+        estimator: lap_time_estimator.LapTimeEstimator | None = None,
     ) -> "tuple[bool, MissionTimeCondition | None]":
         """
         start_time: float
             The time the drone started the mission in seconds.
          maximum_flight_time: float
             Max flight time for drone in seconds.
+        estimator: LapTimeEstimator | None
+            Forecasts the next lap from all recorded laps. If not provided, the next lap is
+            assumed to take as long as the previous one.
         """
         if start_time is None:
             return False, None
@@ -30,10 +40,16 @@ class MissionTimeCondition(condition.Condition):
         if maximum_flight_time is None:
             return False, None
 
-        return True, MissionTimeCondition(cls.__create_key, start_time, maximum_flight_time)
+        return True, MissionTimeCondition(
+            cls.__create_key, start_time, maximum_flight_time, estimator
+        )
 
     def __init__(
-        self, class_private_create_key: object, start_time: float, maximum_flight_time: float
+        self,
+        class_private_create_key: object,
+        start_time: float,
+        maximum_flight_time: float,
+        estimator: lap_time_estimator.LapTimeEstimator | None,
     ) -> None:
         """
         Private constructor, use create() method
@@ -43,17 +59,39 @@ class MissionTimeCondition(condition.Condition):
         self.maximum_flight_time = maximum_flight_time
         self.lap_time = 0
         self.previous_time_elapsed = -1
+        self.estimator = estimator
 
     def evaluate_condition(self) -> bool:
         """
         Evaluates whether the drone should land based on time remaining.
         """
         current_time = time.time()
-        if (current_time + self.lap_time) - self.start_time < self.maximum_flight_time:
+        if (current_time + self.next_lap_time()) - self.start_time < self.maximum_flight_time:
             return False
 
         return True
 
+    def next_lap_time(self) -> float:
+        """
+        Expected time to fly the next lap.
+        """
+        if self.estimator is None or self.estimator.lap_count() == 0:
+            return self.lap_time
+
+        return self.estimator.forecast()
+
+    def priority(self) -> int:
+        """
+        The flight time limit is checked before any other condition.
+        """
+        return MISSION_TIME_PRIORITY
+
+    def is_critical(self) -> bool:
+        """
+        Nothing else matters once the drone must return.
+        """
+        return True
+
     def output_time_elapsed(self, frequency: int) -> None:
         """
         Outputs the total time elapsed during the mission.
@@ -71,6 +109,8 @@ class MissionTimeCondition(condition.Condition):
         Updates the time taken to fly one lap.
         """
         self.lap_time = lap_time
+        if self.estimator is not None:
+            self.estimator.complete_lap(lap_time)
 
     def message(self) -> None:
         """
@@ -85,7 +125,8 @@ class MissionTimeCondition(condition.Condition):
         print(f"Time when condition was met: {current_time}")
         print(f"Total flight time: {current_time - self.start_time}")
         print(f"Time of previous lap: {self.lap_time}")
+        print(f"Expected time of next lap: {self.next_lap_time()}")
         print(
-            f"Total flight time + time to fly another lap: {(current_time - self.start_time) + self.lap_time}"
+            f"Total flight time + time to fly another lap: {(current_time - self.start_time) + self.next_lap_time()}"
         )
         print("###########################################################\n")
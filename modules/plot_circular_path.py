@@ -6,10 +6,46 @@ import csv
 import math
 import pathlib
 
-from modules.common.modules import position_global
+import numpy as np
+import pymap3d
+
 from modules.common.modules import position_global_relative_altitude
-from modules.common.modules import location_local
-from modules.common.modules.mavlink import local_global_conversion
+
+
+def move_coordinates_by_offsets(
+    start_point: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    offsets_x: np.ndarray,
+    offsets_y: np.ndarray,
+) -> tuple[True, tuple[np.ndarray, np.ndarray]] | tuple[False, None]:
+    """
+    Given a starting waypoint and arrays of x and y displacements, find the
+    latitude and longitude of every resulting waypoint in a single vectorized pass.
+
+    start_point: The starting waypoint.
+    offsets_x: Offsets in west-east direction in metres. East is positive.
+    offsets_y: Offsets in north-south direction in metres. North is positive.
+
+    Return: Success, latitudes and longitudes in decimal degrees.
+    """
+    offsets_x = np.asarray(offsets_x, dtype=np.float64)
+    offsets_y = np.asarray(offsets_y, dtype=np.float64)
+    if offsets_x.shape != offsets_y.shape:
+        return False, None
+
+    if not np.all(np.isfinite(offsets_x)) or not np.all(np.isfinite(offsets_y)):
+        return False, None
+
+    # Same conversion as local_global_conversion, with the start point on the ground
+    latitudes, longitudes, _ = pymap3d.ned2geodetic(
+        offsets_y,
+        offsets_x,
+        0.0,
+        start_point.latitude,
+        start_point.longitude,
+        0.0,
+    )
+
+    return True, (np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64))
 
 
 def move_coordinates_by_offset(
@@ -30,29 +66,65 @@ def move_coordinates_by_offset(
 
     Return: Success, waypoint.
     """
-    result, offset_local = location_local.LocationLocal.create(offset_y, offset_x)
+    result, coordinates = move_coordinates_by_offsets(start_point, [offset_x], [offset_y])
     if not result:
         return False, None
 
-    # Required for conversion input
-    # TODO: Change when local_global_conversion is updated
-    result, start_point_converted = position_global.PositionGlobal.create(
-        start_point.latitude,
-        start_point.longitude,
-        0.0,
+    latitudes, longitudes = coordinates
+
+    return position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+        float(latitudes[0]), float(longitudes[0]), start_point.relative_altitude
     )
-    if not result:
+
+
+def generate_circular_offsets(
+    radius: float, num_points: int
+) -> tuple[True, tuple[np.ndarray, np.ndarray]] | tuple[False, None]:
+    """
+    Offsets from the centre of `num_points` evenly-separated points on a circle.
+    The first point is repeated at the end to complete the circle.
+
+    radius: The length of the radius, in metres.
+    num_points: The number of points to generate.
+
+    Return: Success, east and north offsets in metres.
+    """
+    if radius <= 0.0:
         return False, None
 
-    result, end_point = local_global_conversion.position_global_from_location_local(
-        start_point_converted, offset_local
-    )
+    if num_points <= 0:
+        return False, None
+
+    # Any two consecutive points are separated by 2 * pi / n radians.
+    angles = 2 * math.pi / num_points * np.arange(num_points + 1)
+    # The drone should return back to the same point to complete a full circle
+    angles[-1] = 0.0
+
+    return True, (radius * np.cos(angles), radius * np.sin(angles))
+
+
+def generate_circular_path_coordinates(
+    centre: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    radius: float,
+    num_points: int,
+) -> tuple[True, tuple[np.ndarray, np.ndarray]] | tuple[False, None]:
+    """
+    Array version of generate_circular_path, without creating a waypoint object per point.
+    The first point is repeated at the end to complete the circle.
+
+    centre: The centre of the circular path.
+    radius: The length of the radius, in metres.
+    num_points: The number of waypoints to generate.
+
+    Return: Success, latitudes and longitudes in decimal degrees.
+    """
+    result, offsets = generate_circular_offsets(radius, num_points)
     if not result:
         return False, None
 
-    return position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
-        end_point.latitude, end_point.longitude, start_point.relative_altitude
-    )
+    offsets_x, offsets_y = offsets
+
+    return move_coordinates_by_offsets(centre, offsets_x, offsets_y)
 
 
 def generate_circular_path(
@@ -74,22 +146,17 @@ def generate_circular_path(
 
     Return: Success, list of waypoints.
     """
-    if radius <= 0.0:
+    result, coordinates = generate_circular_path_coordinates(centre, radius, num_points)
+    if not result:
         return False, None
 
-    if num_points <= 0:
-        return False, None
+    latitudes, longitudes = coordinates
 
     waypoints = []
-
-    # Any two consecutive points are separated by 2 * pi / n radians.
-    for i in range(num_points):
-        # Angle of rotation
-        angle = 2 * math.pi / num_points * i
-        offset_x = radius * math.cos(angle)
-        offset_y = radius * math.sin(angle)
-
-        result, waypoint = move_coordinates_by_offset(centre, offset_x, offset_y)
+    for latitude, longitude in zip(latitudes[:-1].tolist(), longitudes[:-1].tolist()):
+        result, waypoint = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+            latitude, longitude, centre.relative_altitude
+        )
         if not result:
             return False, None
 
@@ -0,0 +1,155 @@
+"""
+Finds QR codes on a downscaled frame and decodes only the region found at full resolution.
+"""
+
+import cv2
+import numpy as np
+
+from .common.modules.qr import qr_scanner
+
+
+# Fractions of the full resolution the QR code is searched for at, coarsest first
+DEFAULT_SCALES = (0.25, 0.5)
+# Padding around the QR code found, as a fraction of its size
+DEFAULT_MARGIN = 0.25
+# Frames without a QR code found between full resolution decodes, 0 to never decode in full
+DEFAULT_FULL_FRAME_INTERVAL = 10
+
+
+class PyramidQrScanner:
+    """
+    Drop in replacement for QrScanner that avoids decoding the full frame.
+    The region of the last QR code decoded is tried first, as the code rarely moves far
+    between frames. Otherwise the QR code is located on downscaled frames, coarsest first, and
+    only that region is decoded at full resolution. Every so often the full frame is decoded in
+    case the code is too small to be located when downscaled.
+
+    Attributes:
+        scales: Fractions of the full resolution the QR code is searched for at, coarsest first.
+        margin: Padding around the QR code found, as a fraction of its size.
+        full_frame_interval: Frames without a QR code found between full resolution decodes.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        scales: "tuple[float, ...]" = DEFAULT_SCALES,
+        margin: float = DEFAULT_MARGIN,
+        full_frame_interval: int = DEFAULT_FULL_FRAME_INTERVAL,
+    ) -> "tuple[True, PyramidQrScanner] | tuple[False, None]":
+        """
+        scales: Fractions of the full resolution the QR code is searched for at, each in
+            (0, 1], coarsest first. The search stops at the first scale it is found at.
+        margin: Padding around the QR code found, as a fraction of its size, not negative.
+        full_frame_interval: Frames without a QR code found between full resolution decodes,
+            0 to never decode in full.
+        """
+        if len(scales) == 0 or not all(0.0 < scale <= 1.0 for scale in scales):
+            return False, None
+
+        if margin < 0.0 or full_frame_interval < 0:
+            return False, None
+
+        return True, PyramidQrScanner(cls.__create_key, tuple(scales), margin, full_frame_interval)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        scales: "tuple[float, ...]",
+        margin: float,
+        full_frame_interval: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is PyramidQrScanner.__create_key, "Use create() method"
+
+        self.scales = scales
+        self.margin = margin
+        self.full_frame_interval = full_frame_interval
+
+        self.__scanner = qr_scanner.QrScanner()
+        self.__detector = cv2.QRCodeDetector()
+
+        # Left, top, right, bottom in full resolution pixels
+        self.__last_region: "tuple[int, int, int, int] | None" = None
+        self.__frames_since_found = 0
+
+    def get_qr_text(self, frame: np.ndarray) -> "tuple[bool, str | None]":
+        """
+        Decodes a QR code from the frame.
+
+        frame: Camera image, colour or grey.
+
+        Return: Success, decoded QR code text.
+        """
+        if self.__last_region is not None:
+            is_qr_text_found, qr_text = self.__decode_region(frame, self.__last_region)
+            if is_qr_text_found:
+                self.__frames_since_found = 0
+                return True, qr_text
+
+            self.__last_region = None
+
+        for scale in self.scales:
+            result, region = self.__locate(frame, scale)
+            if result:
+                break
+
+        if result:
+            is_qr_text_found, qr_text = self.__decode_region(frame, region)
+            if is_qr_text_found:
+                self.__last_region = region
+                self.__frames_since_found = 0
+                return True, qr_text
+
+        self.__frames_since_found += 1
+        if (
+            self.full_frame_interval == 0
+            or self.__frames_since_found % self.full_frame_interval != 0
+        ):
+            return False, None
+
+        return self.__scanner.get_qr_text(frame)
+
+    def __locate(
+        self, frame: np.ndarray, scale: float
+    ) -> "tuple[True, tuple[int, int, int, int]] | tuple[False, None]":
+        """
+        Finds the QR code finder patterns on the frame downscaled by scale.
+
+        Return: Success, left, top, right, bottom of the padded region in full resolution pixels.
+        """
+        small_frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        if small_frame.ndim == 3:
+            small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+
+        is_found, points = self.__detector.detect(small_frame)
+        if not is_found or points is None:
+            return False, None
+
+        corners = points.reshape(-1, 2) / scale
+        minimum = corners.min(axis=0)
+        maximum = corners.max(axis=0)
+        padding = self.margin * (maximum - minimum).max() + 1.0 / scale
+
+        height, width = frame.shape[:2]
+        left = max(int(minimum[0] - padding), 0)
+        top = max(int(minimum[1] - padding), 0)
+        right = min(int(np.ceil(maximum[0] + padding)), width)
+        bottom = min(int(np.ceil(maximum[1] + padding)), height)
+        if right <= left or bottom <= top:
+            return False, None
+
+        return True, (left, top, right, bottom)
+
+    def __decode_region(
+        self, frame: np.ndarray, region: "tuple[int, int, int, int]"
+    ) -> "tuple[bool, str | None]":
+        """
+        Decodes the region of the full resolution frame.
+        """
+        left, top, right, bottom = region
+        return self.__scanner.get_qr_text(np.ascontiguousarray(frame[top:bottom, left:right]))
@@ -0,0 +1,271 @@
+"""
+Decodes QR codes from camera frames in several worker processes.
+"""
+
+import functools
+import math
+import multiprocessing
+import multiprocessing.shared_memory
+import threading
+import time
+
+import numpy as np
+
+from . import pyramid_qr_scanner
+from .common.modules.qr import qr_scanner
+
+
+# Scanner and frame slots of a worker process, set by initialize_worker()
+__worker_state = {}
+
+
+def initialize_worker(
+    slot_names: "list[str]", frame_shape: "tuple[int, ...]", pyramid_scan: bool
+) -> None:
+    """
+    Runs once in each worker process. Attaches to the frame slots and creates a scanner.
+
+    slot_names: Shared memory names of the frame slots.
+    frame_shape: Shape of every frame.
+    pyramid_scan: Use PyramidQrScanner instead of QrScanner.
+    """
+    memories = []
+    frames = []
+    for name in slot_names:
+        # Workers share the parent's resource tracker, which unlinks the memory once
+        memory = multiprocessing.shared_memory.SharedMemory(name=name)
+        memories.append(memory)
+        frames.append(np.ndarray(frame_shape, dtype=np.uint8, buffer=memory.buf))
+
+    __worker_state["memories"] = memories
+    __worker_state["frames"] = frames
+    if pyramid_scan:
+        _, __worker_state["scanner"] = pyramid_qr_scanner.PyramidQrScanner.create()
+    else:
+        __worker_state["scanner"] = qr_scanner.QrScanner()
+
+
+def decode_slot(slot: int) -> "tuple[bool, str | None]":
+    """
+    Runs in a worker process. Decodes the frame in a slot.
+
+    slot: Index of the frame slot.
+
+    Return: Success, decoded QR code text.
+    """
+    return __worker_state["scanner"].get_qr_text(__worker_state["frames"][slot])
+
+
+# Shared memory, counters, and latency statistics are all needed by the callbacks
+# pylint: disable-next=too-many-instance-attributes
+class QrDecodePool:
+    """
+    Spreads frames over worker processes, which decode them in parallel.
+    Frames are copied into shared memory slots, so only the slot index is sent to a worker.
+    A frame is dropped if every slot is still being decoded.
+    Decoding stops at the first QR code found.
+
+    Attributes:
+        frame_shape: Shape of the frames, (height, width, channels).
+        submitted_count: Number of frames sent to the workers.
+        dropped_count: Number of frames dropped as every slot was busy.
+        decode_count: Number of frames decoded.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        worker_count: int,
+        frame_shape: "tuple[int, ...]",
+        slot_count: "int | None" = None,
+        pyramid_scan: bool = False,
+    ) -> "tuple[True, QrDecodePool] | tuple[False, None]":
+        """
+        worker_count: Number of worker processes, usually the number of cores.
+        frame_shape: Shape of the 8 bit frames, (height, width, channels).
+        slot_count: Number of frames in flight, twice the number of workers if not provided,
+            so that each worker has its next frame ready.
+        pyramid_scan: Locate the QR code on a downscaled frame and decode only that region.
+        """
+        if worker_count < 1:
+            return False, None
+
+        if slot_count is None:
+            slot_count = 2 * worker_count
+
+        if slot_count < worker_count:
+            return False, None
+
+        if len(frame_shape) == 0 or min(frame_shape) < 1:
+            return False, None
+
+        return True, QrDecodePool(
+            cls.__create_key, worker_count, tuple(frame_shape), slot_count, pyramid_scan
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        worker_count: int,
+        frame_shape: "tuple[int, ...]",
+        slot_count: int,
+        pyramid_scan: bool,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is QrDecodePool.__create_key, "Use create() method"
+
+        self.frame_shape = frame_shape
+
+        frame_size = math.prod(frame_shape)
+        self.__memories = [
+            multiprocessing.shared_memory.SharedMemory(create=True, size=frame_size)
+            for _ in range(slot_count)
+        ]
+        self.__frames = [
+            np.ndarray(frame_shape, dtype=np.uint8, buffer=memory.buf) for memory in self.__memories
+        ]
+
+        # Notified when a slot becomes free, which is also when a result may have arrived
+        self.__slot_freed = threading.Condition()
+        self.__free_slots = list(range(slot_count))
+        self.__qr_text: "str | None" = None
+
+        self.submitted_count = 0
+        self.dropped_count = 0
+        self.decode_count = 0
+        self.__total_latency = 0.0
+
+        # Spawned rather than forked, as the camera and display threads may hold locks
+        context = multiprocessing.get_context("spawn")
+        self.__pool = context.Pool(
+            worker_count,
+            initializer=initialize_worker,
+            initargs=([memory.name for memory in self.__memories], frame_shape, pyramid_scan),
+        )
+
+    def close(self) -> None:
+        """
+        Stops the workers and frees the shared memory.
+        """
+        self.__pool.terminate()
+        self.__pool.join()
+
+        # Views must be released before the memory can be closed
+        self.__frames = []
+        for memory in self.__memories:
+            memory.close()
+            memory.unlink()
+
+        self.__memories = []
+
+    def submit(self, frame: np.ndarray, capture_time: "float | None" = None) -> bool:
+        """
+        Copies the frame into a free slot and sends it to a worker.
+
+        frame: Camera image of frame_shape.
+        capture_time: time.monotonic() when the frame was captured, now if not provided.
+
+        Return: Success, fails if the frame was dropped, has the wrong shape, or a QR code
+            was already found.
+        """
+        if capture_time is None:
+            capture_time = time.monotonic()
+
+        if frame.shape != self.frame_shape:
+            print(f"ERROR: Frame shape {frame.shape} does not match {self.frame_shape}")
+            return False
+
+        with self.__slot_freed:
+            if self.__qr_text is not None:
+                return False
+
+            if len(self.__free_slots) == 0:
+                self.dropped_count += 1
+                return False
+
+            slot = self.__free_slots.pop()
+
+        # The slot is not read by any worker until it is submitted
+        np.copyto(self.__frames[slot], frame, casting="unsafe")
+
+        self.__pool.apply_async(
+            decode_slot,
+            (slot,),
+            callback=functools.partial(self.__on_decoded, slot, capture_time),
+            error_callback=functools.partial(self.__on_error, slot),
+        )
+        self.submitted_count += 1
+
+        return True
+
+    def wait_for_free_slot(self, timeout: float) -> bool:
+        """
+        Waits until a frame can be submitted or a QR code is found.
+
+        timeout: Time limit in seconds to wait.
+
+        Return: True if a slot is free or a QR code was found.
+        """
+        with self.__slot_freed:
+            return self.__slot_freed.wait_for(
+                lambda: len(self.__free_slots) > 0 or self.__qr_text is not None,
+                max(timeout, 0.0),
+            )
+
+    def result(self, timeout: float = 0.0) -> "tuple[True, str] | tuple[False, None]":
+        """
+        Waits for the first QR code decoded by any worker.
+
+        timeout: Time limit in seconds to wait, 0 to return immediately.
+
+        Return: Success, decoded QR code text.
+        """
+        with self.__slot_freed:
+            self.__slot_freed.wait_for(lambda: self.__qr_text is not None, max(timeout, 0.0))
+            if self.__qr_text is None:
+                return False, None
+
+            return True, self.__qr_text
+
+    def mean_latency(self) -> float:
+        """
+        Mean time in seconds from capture to the end of decoding.
+        """
+        if self.decode_count == 0:
+            return 0.0
+
+        return self.__total_latency / self.decode_count
+
+    def __on_decoded(
+        self, slot: int, capture_time: float, decode_result: "tuple[bool, str | None]"
+    ) -> None:
+        """
+        Runs in the pool's result thread when a worker finishes a frame.
+        """
+        latency = time.monotonic() - capture_time
+        is_qr_text_found, qr_text = decode_result
+
+        with self.__slot_freed:
+            self.__free_slots.append(slot)
+            self.decode_count += 1
+            self.__total_latency += latency
+
+            # Only the first QR code counts
+            if is_qr_text_found and self.__qr_text is None:
+                self.__qr_text = qr_text
+
+            self.__slot_freed.notify_all()
+
+    def __on_error(self, slot: int, exception: BaseException) -> None:
+        """
+        Runs in the pool's result thread when a worker raises.
+        """
+        print(f"ERROR: QR decode failed with exception: {exception}")
+
+        with self.__slot_freed:
+            self.__free_slots.append(slot)
+            self.__slot_freed.notify_all()
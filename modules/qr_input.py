@@ -2,16 +2,24 @@
 Function to read camera input until valid QR code.
 """
 
-import cv2
-
-from .common.modules.camera import camera_factory
+from . import camera_session
+from . import frame_preview
+from . import pyramid_qr_scanner
 from .common.modules.qr import qr_scanner
 
 CAMERA_WIDTH = 1920
 CAMERA_HEIGHT = 1080
 
+# Longest time without a frame before checking for a manual quit
+FRAME_WAIT_TIME = 0.1  # seconds
+
 
-def qr_input(device: "int | str") -> "tuple[bool, str | None]":
+def qr_input(
+    device: "int | str",
+    pyramid_scan: bool = False,
+    session: "camera_session.CameraSession | None" = None,
+    show_preview: bool = True,
+) -> "tuple[bool, str | None]":
     """
     Checks camera input indefinitely until valid text is decoded from QR code.
 
@@ -19,40 +27,46 @@ def qr_input(device: "int | str") -> "tuple[bool, str | None]":
     ----------
     device: int | string
         Camera device name or index (e.g. /dev/video0).
+    pyramid_scan: bool
+        Locate the QR code on a downscaled frame and decode only that region.
+    session: camera_session.CameraSession | None
+        Camera that is already open, device is ignored if provided. It stays open for its other
+        users. Otherwise the camera is opened and closed by this call.
+    show_preview: bool
+        Show the camera in a window from a separate thread. If False there is no display
+        work at all, for headless computers.
 
     Returns
     -------
     tuple[bool, str | None]
         A tuple indicating the success of the operation and the decoded QR code string, or None if unsuccessful.
     """
-    # Camera also created in diversion_qr_input.py with similar code, hence the the next line to make pylint shut up
-    # pylint: disable=duplicate-code
-    result, camera = camera_factory.create_camera(
-        camera_factory.CameraOption.OPENCV,
-        CAMERA_WIDTH,
-        CAMERA_HEIGHT,
-        camera_factory.camera_opencv.ConfigOpenCV(device),
-    )
+    if pyramid_scan:
+        result, scanner = pyramid_qr_scanner.PyramidQrScanner.create()
+        if not result:
+            print("ERROR: Could not create pyramid QR scanner")
+            return False, None
+    else:
+        scanner = qr_scanner.QrScanner()
+
+    # Released by close() below, which leaves a shared camera open for its other users
+    result, session = camera_session.use_session(session, device, CAMERA_WIDTH, CAMERA_HEIGHT)
     if not result:
-        print("OpenCV camera creation error.")
         return False, None
-    # pylint: enable=duplicate-code
 
-    scanner = qr_scanner.QrScanner()
+    preview = None
+    if show_preview:
+        # Shows frames without taking them from the scanner
+        _, preview = frame_preview.FramePreview.create(session.frame_buffer)
 
     is_qr_text_found = False
     qr_text = None
     while not is_qr_text_found:
         # Get new image from camera as long as QR text not found
-        is_image_found, frame = camera.get_image()
-        if not is_image_found:
-            # Log error is camera fails to get image
-            print("ERROR: is_image_found returned false. Cannot get image from camera")
-            continue
-
-        cv2.imshow("Camera", frame)
-
+        is_image_found, frame_and_time = session.take_frame(FRAME_WAIT_TIME)
         if is_image_found:
+            frame, _ = frame_and_time
+
             # Check frame for valid QR code if found
             is_qr_text_found, qr_text = scanner.get_qr_text(frame)
 
@@ -60,10 +74,13 @@ def qr_input(device: "int | str") -> "tuple[bool, str | None]":
             break
 
         # Exit early on manual quit
-        if cv2.waitKey(1) == ord("q"):
+        if preview is not None and preview.is_quit_requested():
             break
 
     # Cleanup
-    cv2.destroyAllWindows()
+    if preview is not None:
+        preview.close()
+
+    session.close()
 
     return is_qr_text_found, qr_text
@@ -4,68 +4,98 @@ Function to read camera input until valid QR code using multithreading.
 
 import queue
 import threading
+import time
 
-import cv2
-
-from .common.modules.camera import camera_factory
+from . import camera_session
+from . import frame_preview
+from . import latest_frame_buffer
+from . import pyramid_qr_scanner
+from . import qr_decode_pool
 from .common.modules.qr import qr_scanner
 
 CAMERA_WIDTH = 1920
 CAMERA_HEIGHT = 1080
+CAMERA_CHANNELS = 3
 
+# Longest time a waiting thread goes without checking whether it should stop
+FRAME_WAIT_TIME = 0.1  # seconds
 
-def camera_capture_thread(
-    device: "int | str",
-    frame_queue: queue.Queue,
+
+def qr_scanner_thread(
+    frame_buffer: latest_frame_buffer.LatestFrameBuffer,
+    result_queue: queue.Queue,
     stop_event: threading.Event,
+    qr_found_event: threading.Event,
+    pyramid_scan: bool = False,
 ) -> None:
     """
-    Captures frames from device camera and places into a queue
+    Scans the newest frame for a valid QR code and places the result in a queue.
+    Prints the latency from capture to the end of decoding when it stops.
 
     Parameters
     ----------
-    device: int | string
-        Camera device name or index (e.g. /dev/video0).
-    frame_queue: queue.Queue
-        Queue that stores frames captured by device camera.
+    frame_buffer: latest_frame_buffer.LatestFrameBuffer
+        Buffer that holds the newest frame captured from camera
+    result_queue: queue.Queue
+        Queue that stores QR scan result.
     stop_event: threading.Event
-        Used to signal the stop of frame capturing.
-
-    Returns
-    ----------
-    None
+        Signals when to stop scanning for a QR code
+    qr_found_event: threading.Event
+        Set when QR code is found.
+    pyramid_scan: bool
+        Locate the QR code on a downscaled frame and decode only that region.
     """
-    result, camera = camera_factory.create_camera(
-        camera_factory.CameraOption.OPENCV,
-        CAMERA_WIDTH,
-        CAMERA_HEIGHT,
-        camera_factory.camera_opencv.ConfigOpenCV(device),
-    )
-    if not result:
-        print("OpenCV camera creation error.")
-        return
+    if pyramid_scan:
+        _, scanner = pyramid_qr_scanner.PyramidQrScanner.create()
+    else:
+        scanner = qr_scanner.QrScanner()
+
+    decode_count = 0
+    total_latency = 0.0
+    maximum_latency = 0.0
+    while not stop_event.is_set() and not qr_found_event.is_set():
+        result, frame_and_time = frame_buffer.take(FRAME_WAIT_TIME)
+        if not result:
+            continue
 
-    while not stop_event.is_set():
-        is_image_found, frame = camera.get_image()
-        if is_image_found:
-            frame_queue.put(frame)
-        else:
-            print("ERROR: Failed to capture image")
+        frame, capture_time = frame_and_time
+        is_qr_text_found, qr_text = scanner.get_qr_text(frame)
 
+        latency = time.monotonic() - capture_time
+        decode_count += 1
+        total_latency += latency
+        maximum_latency = max(maximum_latency, latency)
 
-def qr_scanner_thread(
-    frame_queue: queue.Queue,
+        if is_qr_text_found:
+            result_queue.put((is_qr_text_found, qr_text))
+            qr_found_event.set()
+            stop_event.set()
+
+    if decode_count > 0:
+        print(
+            f"Decoded {decode_count} frames, capture to decode latency "
+            f"mean {1000.0 * total_latency / decode_count:.1f} ms, "
+            f"maximum {1000.0 * maximum_latency:.1f} ms"
+        )
+
+
+def qr_pool_thread(
+    frame_buffer: latest_frame_buffer.LatestFrameBuffer,
+    pool: qr_decode_pool.QrDecodePool,
     result_queue: queue.Queue,
     stop_event: threading.Event,
     qr_found_event: threading.Event,
 ) -> None:
     """
-    Scans frames for a valid QR code and places the result in a queue
+    Sends the newest frame to the decode pool whenever a worker can take it, and places the
+    first QR scan result in a queue.
 
     Parameters
     ----------
-    frame_queue: queue.Queue
-        Queue that contains frames captured from camera
+    frame_buffer: latest_frame_buffer.LatestFrameBuffer
+        Buffer that holds the newest frame captured from camera
+    pool: qr_decode_pool.QrDecodePool
+        Worker processes that decode the frames.
     result_queue: queue.Queue
         Queue that stores QR scan result.
     stop_event: threading.Event
@@ -73,18 +103,39 @@ def qr_scanner_thread(
     qr_found_event: threading.Event
         Set when QR code is found.
     """
-    scanner = qr_scanner.QrScanner()
     while not stop_event.is_set() and not qr_found_event.is_set():
-        if not frame_queue.empty():
-            frame = frame_queue.get()
-            is_qr_text_found, qr_text = scanner.get_qr_text(frame)
-            if is_qr_text_found:
-                result_queue.put((is_qr_text_found, qr_text))
-                qr_found_event.set()
-                stop_event.set()
+        # Frames are only taken when a worker is free, so the workers always get the newest
+        if not pool.wait_for_free_slot(FRAME_WAIT_TIME):
+            continue
+
+        is_qr_text_found, qr_text = pool.result()
+        if is_qr_text_found:
+            result_queue.put((is_qr_text_found, qr_text))
+            qr_found_event.set()
+            stop_event.set()
+            break
+
+        result, frame_and_time = frame_buffer.take(FRAME_WAIT_TIME)
+        if not result:
+            continue
+
+        frame, capture_time = frame_and_time
+        pool.submit(frame, capture_time)
 
+    if pool.decode_count > 0:
+        print(
+            f"Decoded {pool.decode_count} frames in the pool, capture to decode latency "
+            f"mean {1000.0 * pool.mean_latency():.1f} ms"
+        )
 
-def qr_input(device: "int | str") -> "tuple[bool, str | None]":
+
+def qr_input(
+    device: "int | str",
+    decode_worker_count: int = 1,
+    pyramid_scan: bool = False,
+    session: "camera_session.CameraSession | None" = None,
+    show_preview: bool = True,
+) -> "tuple[bool, str | None]":
     """
     Checks camera input indefinitely until valid text is decoded from QR code.
 
@@ -92,49 +143,83 @@ def qr_input(device: "int | str") -> "tuple[bool, str | None]":
     ----------
     device: int | string
         Camera device name or index (e.g. /dev/video0).
+    decode_worker_count: int
+        Number of processes decoding frames in parallel, 1 to decode in a thread of this
+        process instead.
+    pyramid_scan: bool
+        Locate the QR code on a downscaled frame and decode only that region.
+    session: camera_session.CameraSession | None
+        Camera that is already open, device is ignored if provided. It stays open for its other
+        users. Otherwise the camera is opened and closed by this call.
+    show_preview: bool
+        Show the camera in a window from a separate thread. If False there is no display
+        work at all, for headless computers.
 
     Returns
     -------
     tuple[bool, str | None]
         A tuple indicating the success of the operation and the decoded QR code string, or None if unsuccessful.
     """
+    # Released by close() below, which leaves a shared camera open for its other users
+    result, session = camera_session.use_session(session, device, CAMERA_WIDTH, CAMERA_HEIGHT)
+    if not result:
+        return False, None
 
-    frame_queue = queue.Queue(maxsize=10)
+    # Only the newest frame is kept, so scanning never falls behind the camera
+    frame_buffer = session.frame_buffer
     result_queue = queue.Queue()
     stop_event = threading.Event()
     qr_found_event = threading.Event()
 
-    grabber_thread = threading.Thread(
-        target=camera_capture_thread, args=(device, frame_queue, stop_event)
-    )
-    scanner_thread = threading.Thread(
-        target=qr_scanner_thread, args=(frame_queue, result_queue, stop_event, qr_found_event)
-    )
+    pool = None
+    if decode_worker_count > 1:
+        result, pool = qr_decode_pool.QrDecodePool.create(
+            decode_worker_count,
+            (CAMERA_HEIGHT, CAMERA_WIDTH, CAMERA_CHANNELS),
+            pyramid_scan=pyramid_scan,
+        )
+        if not result:
+            print("ERROR: Could not create QR decode pool")
+            session.close()
+            return False, None
+
+        scanner_thread = threading.Thread(
+            target=qr_pool_thread,
+            args=(frame_buffer, pool, result_queue, stop_event, qr_found_event),
+        )
+    else:
+        scanner_thread = threading.Thread(
+            target=qr_scanner_thread,
+            args=(frame_buffer, result_queue, stop_event, qr_found_event, pyramid_scan),
+        )
 
-    grabber_thread.start()
     scanner_thread.start()
 
+    preview = None
+    if show_preview:
+        # Shows frames without taking them from the scanner
+        _, preview = frame_preview.FramePreview.create(frame_buffer)
+
     is_qr_text_found = False
     qr_text = None
 
-    while not stop_event.is_set():
-        if not result_queue.empty():
-            is_qr_text_found, qr_text = result_queue.get()
-            break
-
-        if not frame_queue.empty():
-            frame = frame_queue.get()
-            cv2.imshow("Camera", frame)
-
-        if cv2.waitKey(1) == ord("q"):
+    # Sleeps until the scanner finds a QR code, waking only to check for a manual quit
+    while not stop_event.wait(FRAME_WAIT_TIME):
+        if preview is not None and preview.is_quit_requested():
             stop_event.set()
-            break
 
-    grabber_thread.join()
     scanner_thread.join()
 
     # Cleanup
-    cv2.destroyAllWindows()
+    if preview is not None:
+        preview.close()
+
+    if pool is not None:
+        pool.close()
+
+    session.close()
+
+    print(f"Captured {frame_buffer.frame_count} frames, dropped {frame_buffer.dropped_count}")
 
     if not result_queue.empty():
         is_qr_text_found, qr_text = result_queue.get()
@@ -0,0 +1,171 @@
+"""
+Concentric search rings stored as contiguous coordinate arrays.
+"""
+
+import numpy as np
+
+from .common.modules import position_global_relative_altitude
+
+
+class SearchPathRings:
+    """
+    Structure of arrays for a search path made of rings.
+    Waypoints of ring i are at indices [ring_offsets[i], ring_offsets[i + 1]).
+
+    Attributes:
+        latitudes: Decimal degrees, float64.
+        longitudes: Decimal degrees, float64.
+        altitudes: Relative altitude in metres, float64.
+        ring_offsets: Start index of each ring, followed by the total number of waypoints.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        altitudes: np.ndarray,
+        ring_offsets: np.ndarray,
+    ) -> "tuple[True, SearchPathRings] | tuple[False, None]":
+        """
+        latitudes, longitudes, altitudes: Waypoint coordinates of all rings, in order.
+        ring_offsets: Start index of each ring, followed by the total number of waypoints.
+        """
+        # Copied, as the arrays are made read only and the caller's must stay writeable
+        latitudes = np.array(latitudes, dtype=np.float64, copy=True)
+        longitudes = np.array(longitudes, dtype=np.float64, copy=True)
+        altitudes = np.array(altitudes, dtype=np.float64, copy=True)
+        ring_offsets = np.array(ring_offsets, dtype=np.int64, copy=True)
+
+        if latitudes.ndim != 1 or ring_offsets.ndim != 1:
+            return False, None
+
+        if latitudes.shape != longitudes.shape or latitudes.shape != altitudes.shape:
+            return False, None
+
+        if ring_offsets.size == 0 or ring_offsets[0] != 0 or ring_offsets[-1] != latitudes.size:
+            return False, None
+
+        if np.any(np.diff(ring_offsets) < 0):
+            return False, None
+
+        return True, SearchPathRings(
+            cls.__create_key, latitudes, longitudes, altitudes, ring_offsets
+        )
+
+    @classmethod
+    def create_empty(cls) -> "SearchPathRings":
+        """
+        No rings.
+        """
+        empty = np.empty(0, dtype=np.float64)
+        return SearchPathRings(cls.__create_key, empty, empty, empty, np.zeros(1, dtype=np.int64))
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        altitudes: np.ndarray,
+        ring_offsets: np.ndarray,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is SearchPathRings.__create_key, "Use create() method"
+
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.altitudes = altitudes
+        self.ring_offsets = ring_offsets
+
+        # Views handed out by ring() must not be able to modify the path
+        for array in (self.latitudes, self.longitudes, self.altitudes, self.ring_offsets):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        """
+        Total number of waypoints across all rings.
+        """
+        return self.latitudes.size
+
+    def ring_count(self) -> int:
+        """
+        Number of rings.
+        """
+        return self.ring_offsets.size - 1
+
+    def ring(self, index: int) -> "tuple[np.ndarray, np.ndarray, np.ndarray]":
+        """
+        Zero-copy views of the latitudes, longitudes and altitudes of one ring.
+        """
+        start = self.ring_offsets[index]
+        end = self.ring_offsets[index + 1]
+        return (
+            self.latitudes[start:end],
+            self.longitudes[start:end],
+            self.altitudes[start:end],
+        )
+
+    def ring_waypoints(
+        self, index: int
+    ) -> "tuple[True, list[position_global_relative_altitude.PositionGlobalRelativeAltitude]] | tuple[False, None]":
+        """
+        Waypoint objects of one ring.
+
+        Return: Success, list of waypoints.
+        """
+        return SearchPathRings.__materialize(*self.ring(index))
+
+    def rings_waypoints(
+        self,
+    ) -> "tuple[True, list[list[position_global_relative_altitude.PositionGlobalRelativeAltitude]]] | tuple[False, None]":
+        """
+        Waypoint objects of all rings, as a list of rings.
+
+        Return: Success, list of list of waypoints.
+        """
+        rings = []
+        for i in range(self.ring_count()):
+            result, waypoints = self.ring_waypoints(i)
+            if not result:
+                return False, None
+
+            rings.append(waypoints)
+
+        return True, rings
+
+    def waypoints(
+        self,
+    ) -> "tuple[True, list[position_global_relative_altitude.PositionGlobalRelativeAltitude]] | tuple[False, None]":
+        """
+        Waypoint objects of all rings, as a single linear list.
+
+        Return: Success, list of waypoints.
+        """
+        return SearchPathRings.__materialize(self.latitudes, self.longitudes, self.altitudes)
+
+    @staticmethod
+    def __materialize(
+        latitudes: np.ndarray, longitudes: np.ndarray, altitudes: np.ndarray
+    ) -> "tuple[True, list[position_global_relative_altitude.PositionGlobalRelativeAltitude]] | tuple[False, None]":
+        """
+        Creates a waypoint object per coordinate.
+        """
+        waypoints = []
+        for latitude, longitude, altitude in zip(
+            latitudes.tolist(), longitudes.tolist(), altitudes.tolist()
+        ):
+            result, waypoint = (
+                position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+                    latitude, longitude, altitude
+                )
+            )
+            if not result:
+                return False, None
+
+            waypoints.append(waypoint)
+
+        return True, waypoints
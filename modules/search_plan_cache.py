@@ -0,0 +1,251 @@
+"""
+On-disk cache of generated search plans, so that a relaunch with unchanged inputs does not
+recompute the search path.
+"""
+
+import collections.abc
+import hashlib
+import os
+import pathlib
+import struct
+
+import numpy as np
+
+from . import generate_command
+from . import generate_hotspot_search_path
+from . import search_path_rings
+from .common.modules import position_global_relative_altitude
+from .common.modules.mavlink import dronekit
+
+
+CACHE_FILE_SUFFIX = ".npz"
+# Outside the cache file pattern, so a plan still being written is never loaded or evicted
+TEMPORARY_FILE_SUFFIX = CACHE_FILE_SUFFIX + ".tmp"
+
+
+def search_plan_key(
+    search_centre: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    search_radius: float,
+    horizontal_fov: float,
+    vertical_fov: float,
+    altitude: float,
+) -> str:
+    """
+    Hash of every input that the search plan depends on, including the planner and command
+    generator versions.
+
+    search_centre: Centre of the search area.
+    search_radius: Search radius in metres.
+    horizontal_fov: Camera horizontal field of view in degrees.
+    vertical_fov: Camera vertical field of view in degrees.
+    altitude: Flight altitude in metres, which sets the camera footprint and command altitude.
+
+    Return: Hexadecimal key.
+    """
+    inputs = struct.pack(
+        "<2q7d",
+        generate_hotspot_search_path.PLANNER_VERSION,
+        generate_command.COMMAND_GENERATOR_VERSION,
+        search_centre.latitude,
+        search_centre.longitude,
+        search_centre.relative_altitude,
+        search_radius,
+        horizontal_fov,
+        vertical_fov,
+        altitude,
+    )
+
+    return hashlib.sha256(inputs).hexdigest()
+
+
+def record(items: collections.abc.Iterable, recorded_items: list) -> collections.abc.Iterator:
+    """
+    Passes items through unchanged while keeping a copy of each, so a lazy pipeline can
+    still be saved once it has been consumed.
+
+    items: Iterable to pass through.
+    recorded_items: List that every item is appended to.
+
+    Yields: The items, in order.
+    """
+    for item in items:
+        recorded_items.append(item)
+        yield item
+
+
+def load_search_plan(
+    cache_directory_path: pathlib.Path, key: str
+) -> (
+    tuple[True, tuple[search_path_rings.SearchPathRings, "list[dronekit.Command]"]]
+    | tuple[False, None]
+):
+    """
+    Loads a cached search plan.
+
+    cache_directory_path: Directory of the cache.
+    key: Key from search_plan_key().
+
+    Return: Success, search path rings and mission commands.
+    """
+    cache_file_path = pathlib.Path(cache_directory_path, key + CACHE_FILE_SUFFIX)
+    if not cache_file_path.exists():
+        return False, None
+
+    try:
+        with np.load(cache_file_path, allow_pickle=False) as plan:
+            latitudes = plan["latitudes"]
+            longitudes = plan["longitudes"]
+            altitudes = plan["altitudes"]
+            ring_offsets = plan["ring_offsets"]
+            command_types = plan["command_types"]
+            command_parameters = plan["command_parameters"]
+    # Required for catching library exceptions
+    # pylint: disable-next=broad-exception-caught
+    except Exception as exception:
+        print(f"Failed to read search plan cache with exception: {exception}")
+        return False, None
+
+    result, rings = search_path_rings.SearchPathRings.create(
+        latitudes, longitudes, altitudes, ring_offsets
+    )
+    if not result:
+        return False, None
+
+    if command_types.shape != (len(command_parameters), 4) or command_parameters.shape[1:] != (7,):
+        return False, None
+
+    commands = []
+    for types, parameters in zip(command_types.tolist(), command_parameters.tolist()):
+        frame, command, current, autocontinue = types
+        commands.append(
+            dronekit.Command(0, 0, 0, frame, command, current, autocontinue, *parameters)
+        )
+
+    # Least recently used entries are evicted first
+    try:
+        os.utime(cache_file_path)
+    except OSError as exception:
+        print(f"Failed to update search plan cache access time with exception: {exception}")
+
+    return True, (rings, commands)
+
+
+def save_search_plan(
+    cache_directory_path: pathlib.Path,
+    key: str,
+    rings: "list[list[position_global_relative_altitude.PositionGlobalRelativeAltitude]]",
+    commands: "list[dronekit.Command]",
+    maximum_cache_size: int,
+) -> bool:
+    """
+    Saves a search plan as arrays, then evicts least recently used plans until the cache
+    fits in maximum_cache_size. The plan that was just saved is never evicted.
+
+    cache_directory_path: Directory of the cache, created if it does not exist.
+    key: Key from search_plan_key().
+    rings: Waypoints of the search path, by ring.
+    commands: Mission commands uploaded for the search path.
+    maximum_cache_size: Size limit of the cache directory in bytes.
+
+    Return: Success.
+    """
+    waypoints = [waypoint for ring in rings for waypoint in ring]
+    ring_offsets = np.cumsum([0] + [len(ring) for ring in rings], dtype=np.int64)
+
+    command_types = np.array(
+        [
+            (command.frame, command.command, command.current, command.autocontinue)
+            for command in commands
+        ],
+        dtype=np.int32,
+    ).reshape(-1, 4)
+    command_parameters = np.array(
+        [
+            (
+                command.param1,
+                command.param2,
+                command.param3,
+                command.param4,
+                command.x,
+                command.y,
+                command.z,
+            )
+            for command in commands
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 7)
+
+    cache_file_path = pathlib.Path(cache_directory_path, key + CACHE_FILE_SUFFIX)
+    # Written under a temporary name so that an interrupted save is never loaded
+    temporary_file_path = pathlib.Path(cache_directory_path, key + TEMPORARY_FILE_SUFFIX)
+
+    try:
+        pathlib.Path(cache_directory_path).mkdir(parents=True, exist_ok=True)
+        # Saved through a file object, as NumPy appends .npz to any other file name
+        with open(temporary_file_path, "wb") as file:
+            np.savez(
+                file,
+                latitudes=np.array([waypoint.latitude for waypoint in waypoints], dtype=np.float64),
+                longitudes=np.array(
+                    [waypoint.longitude for waypoint in waypoints], dtype=np.float64
+                ),
+                altitudes=np.array(
+                    [waypoint.relative_altitude for waypoint in waypoints], dtype=np.float64
+                ),
+                ring_offsets=ring_offsets,
+                command_types=command_types,
+                command_parameters=command_parameters,
+            )
+        os.replace(temporary_file_path, cache_file_path)
+    # Required for catching library exceptions
+    # pylint: disable-next=broad-exception-caught
+    except Exception as exception:
+        print(f"Failed to write search plan cache with exception: {exception}")
+        return False
+
+    return evict_search_plans(cache_directory_path, maximum_cache_size, cache_file_path)
+
+
+def evict_search_plans(
+    cache_directory_path: pathlib.Path,
+    maximum_cache_size: int,
+    keep_file_path: "pathlib.Path | None" = None,
+) -> bool:
+    """
+    Deletes least recently used plans until the cache fits in maximum_cache_size.
+
+    cache_directory_path: Directory of the cache.
+    maximum_cache_size: Size limit of the cache directory in bytes.
+    keep_file_path: Plan that must not be deleted.
+
+    Return: Success.
+    """
+    try:
+        cache_files = [
+            (file_path.stat(), file_path)
+            for file_path in pathlib.Path(cache_directory_path).glob("*" + CACHE_FILE_SUFFIX)
+        ]
+    except OSError as exception:
+        print(f"Failed to list search plan cache with exception: {exception}")
+        return False
+
+    cache_size = sum(status.st_size for status, _ in cache_files)
+
+    # Oldest first
+    cache_files.sort(key=lambda cache_file: cache_file[0].st_mtime_ns)
+    for status, file_path in cache_files:
+        if cache_size <= maximum_cache_size:
+            break
+
+        if keep_file_path is not None and file_path == keep_file_path:
+            continue
+
+        try:
+            file_path.unlink()
+        except OSError as exception:
+            print(f"Failed to evict search plan {file_path} with exception: {exception}")
+            return False
+
+        cache_size -= status.st_size
+
+    return True
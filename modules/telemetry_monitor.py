@@ -0,0 +1,180 @@
+"""
+Pushes telemetry changes from the drone to the mission logic as they arrive.
+"""
+
+import queue
+import time
+
+from .common.modules.mavlink import dronekit
+
+
+POSITION_EVENT = "position"
+WAYPOINT_EVENT = "waypoint"
+MODE_EVENT = "mode"
+
+ALL_EVENTS = frozenset([POSITION_EVENT, WAYPOINT_EVENT, MODE_EVENT])
+
+
+class TelemetryEvent:
+    """
+    A change in the drone's telemetry.
+
+    Attributes:
+        kind: One of POSITION_EVENT, WAYPOINT_EVENT, MODE_EVENT.
+        value: (latitude, longitude) for position, sequence number for waypoint,
+            mode name for mode.
+        receive_time: Time in seconds since the epoch that the message was received.
+    """
+
+    def __init__(self, kind: str, value: object, receive_time: float) -> None:
+        """
+        Constructor.
+        """
+        self.kind = kind
+        self.value = value
+        self.receive_time = receive_time
+
+
+class TelemetryMonitor:
+    """
+    Subscribes to the drone's position, current waypoint and mode, and queues an event for
+    each change. The mission logic blocks on next_event() instead of polling.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, drone: dronekit.Vehicle, event_kinds: "frozenset[str]" = ALL_EVENTS
+    ) -> "tuple[True, TelemetryMonitor] | tuple[False, None]":
+        """
+        drone: The connected drone.
+        event_kinds: Kinds of event to subscribe to, others never wake the mission logic.
+        """
+        if drone is None:
+            return False, None
+
+        if len(event_kinds) == 0 or not event_kinds <= ALL_EVENTS:
+            return False, None
+
+        return True, TelemetryMonitor(cls.__create_key, drone, event_kinds)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        drone: dronekit.Vehicle,
+        event_kinds: "frozenset[str]",
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is TelemetryMonitor.__create_key, "Use create() method"
+
+        self.__events: "queue.Queue[TelemetryEvent]" = queue.Queue()
+
+        # Only written by the DroneKit message thread
+        self.__current_waypoint = None
+
+        # Only written by the consumer
+        self.event_count = 0
+        self.total_latency = 0.0
+        self.maximum_latency = 0.0
+
+        # Function to remove each listener with, message or attribute name, and listener
+        self.__listeners = []
+        if POSITION_EVENT in event_kinds:
+            drone.add_message_listener("GLOBAL_POSITION_INT", self.__on_global_position)
+            self.__listeners.append(
+                (drone.remove_message_listener, "GLOBAL_POSITION_INT", self.__on_global_position)
+            )
+
+        if WAYPOINT_EVENT in event_kinds:
+            drone.add_message_listener("MISSION_CURRENT", self.__on_mission_current)
+            self.__listeners.append(
+                (drone.remove_message_listener, "MISSION_CURRENT", self.__on_mission_current)
+            )
+
+        if MODE_EVENT in event_kinds:
+            drone.add_attribute_listener("mode", self.__on_mode)
+            self.__listeners.append((drone.remove_attribute_listener, "mode", self.__on_mode))
+
+    def close(self) -> None:
+        """
+        Stops following the drone's telemetry.
+        """
+        for remove_listener, name, listener in self.__listeners:
+            remove_listener(name, listener)
+
+    def next_event(self, timeout: float) -> "tuple[True, TelemetryEvent] | tuple[False, None]":
+        """
+        Waits for the next telemetry change.
+
+        timeout: Time limit in seconds to wait.
+
+        Return: Success, the event. Fails if no event arrived in time.
+        """
+        try:
+            event = self.__events.get(timeout=max(timeout, 0.0))
+        except queue.Empty:
+            return False, None
+
+        # From the message arriving to the mission logic receiving it
+        latency = time.time() - event.receive_time
+        self.event_count += 1
+        self.total_latency += latency
+        self.maximum_latency = max(self.maximum_latency, latency)
+
+        return True, event
+
+    def mean_latency(self) -> float:
+        """
+        Mean time in seconds from a message arriving to its event being received.
+        """
+        if self.event_count == 0:
+            return 0.0
+
+        return self.total_latency / self.event_count
+
+    # Called by DroneKit with the vehicle, attribute or message name, and value or message
+    # pylint: disable=unused-argument
+
+    def __on_global_position(self, vehicle: dronekit.Vehicle, name: str, message: object) -> None:
+        """
+        Position in degrees, scaled by 1e7 in the message.
+        """
+        self.__put(
+            POSITION_EVENT,
+            (message.lat / 1.0e7, message.lon / 1.0e7),
+            TelemetryMonitor.__message_time(message),
+        )
+
+    def __on_mission_current(self, vehicle: dronekit.Vehicle, name: str, message: object) -> None:
+        """
+        The autopilot repeats MISSION_CURRENT, so only changes are queued.
+        """
+        if message.seq == self.__current_waypoint:
+            return
+
+        self.__current_waypoint = message.seq
+        self.__put(WAYPOINT_EVENT, message.seq, TelemetryMonitor.__message_time(message))
+
+    def __on_mode(self, vehicle: dronekit.Vehicle, name: str, mode: object) -> None:
+        """
+        DroneKit only calls attribute listeners when the mode changes.
+        """
+        self.__put(MODE_EVENT, mode.name, time.time())
+
+    # pylint: enable=unused-argument
+
+    def __put(self, kind: str, value: object, receive_time: float) -> None:
+        """
+        Queues an event.
+        """
+        self.__events.put(TelemetryEvent(kind, value, receive_time))
+
+    @staticmethod
+    def __message_time(message: object) -> float:
+        """
+        Time the message was parsed by pymavlink, or now if it was not recorded.
+        """
+        return getattr(message, "_timestamp", None) or time.time()
@@ -1,43 +1,247 @@
-"""
-Function to upload dronekit commands.
-"""
-
-from .common.modules.mavlink import dronekit
-
-
-def upload_commands(
-    drone: dronekit.Vehicle, commands: "list[dronekit.Command]", timeout: int
-) -> bool:
-    """
-    Add the list of commands to the drone’s command sequence, and upload them.
-    If the list is empty, does not upload anything.
-
-    Parameters
-    -----------
-    drone: dronekit.Vehicle
-        The connected drone.
-    commands: list[dronekit.Command]
-        List of dronekit commands.
-
-    Returns
-    -------
-    None
-    """
-    # If the list is empty, do nothing
-    if len(commands) == 0:
-        return False
-
-    # Download the command sequence and clear it
-    # This is to avoid duplicate or conflicting commands
-    command_sequence = drone.commands
-    command_sequence.download()
-    command_sequence.wait_ready(timeout=timeout)
-    command_sequence.clear()
-
-    # Adds new commands to command sequence
-    for command in commands:
-        command_sequence.add(command)
-
-    # Upload the commands to drone
-    command_sequence.upload()
-    return True
+"""
+Function to upload dronekit commands.
+"""
+
+import collections.abc
+import struct
+import time
+import zlib
+
+from pymavlink import mavutil
+
+from . import generate_command
+from .common.modules.mavlink import dronekit
+
+
+# Items are compared as sent over MAVLink, where parameters and coordinates are float32
+MISSION_ITEM_FORMAT = "<2HB7f"
+
+PARTIAL_UPLOAD_POLL_PERIOD = 0.01  # seconds
+
+
+def upload_commands(
+    drone: dronekit.Vehicle,
+    commands: collections.abc.Iterable[dronekit.Command],
+    timeout: int,
+    download_first: bool = True,
+    verify: bool = False,
+) -> bool:
+    """
+    Add the list of commands to the drone’s command sequence, and upload them.
+    If the list is empty, does not upload anything.
+
+    Parameters
+    -----------
+    drone: dronekit.Vehicle
+        The connected drone.
+    commands: Iterable[dronekit.Command]
+        List of dronekit commands.
+        A lazy iterable is consumed while the current mission is downloading.
+    timeout: int
+        Time limit in seconds for each download.
+    download_first: bool
+        Download the current mission before replacing it, which keeps the home item at index 0.
+        Otherwise the mission is replaced straight away, with a placeholder home item if
+        DroneKit has not seen the mission yet. The autopilot sets home itself.
+    verify: bool
+        Download the mission after the upload and check its item count and checksum.
+
+    Returns
+    -------
+    bool: True if the commands were uploaded, and verified if requested.
+    """
+    commands = iter(commands)
+
+    # If the list is empty, do nothing
+    first_command = next(commands, None)
+    if first_command is None:
+        return False
+
+    command_sequence = drone.commands
+    if download_first:
+        # Download the command sequence and clear it
+        # This is to avoid duplicate or conflicting commands
+        command_sequence.download()
+
+    # Finish generating the commands while the download is in flight
+    pending_commands = [first_command]
+    pending_commands.extend(commands)
+
+    if download_first:
+        command_sequence.wait_ready(timeout=timeout)
+
+    command_sequence.clear()
+
+    # Mission items start at index 1, after home
+    # pylint: disable-next=protected-access
+    if drone._wploader.count() == 0:
+        command_sequence.add(generate_command.waypoint(0.0, 0.0, 0.0, 0.0, 0.0))
+
+    # Adds new commands to command sequence
+    for command in pending_commands:
+        command_sequence.add(command)
+
+    # Upload the commands to drone
+    command_sequence.upload()
+
+    if not verify:
+        return True
+
+    command_sequence.download()
+    result = command_sequence.wait_ready(timeout=timeout, raise_exception=False)
+    if not result:
+        print("Timed out downloading mission to verify upload")
+        return False
+
+    if len(command_sequence) != len(pending_commands):
+        print(f"Uploaded {len(pending_commands)} commands but drone has {len(command_sequence)}")
+        return False
+
+    if mission_checksum(command_sequence) != mission_checksum(pending_commands):
+        print("Mission on drone does not match uploaded commands")
+        return False
+
+    return True
+
+
+def mission_checksum(items: collections.abc.Iterable[dronekit.Command]) -> int:
+    """
+    CRC-32 of the mission items as stored by the vehicle.
+
+    items: Mission items, excluding home.
+
+    Return: Checksum.
+    """
+    checksum = 0
+    for item in items:
+        checksum = zlib.crc32(__mission_item_key(item), checksum)
+
+    return checksum
+
+
+def __mission_item_key(item: dronekit.Command) -> bytes:
+    """
+    Bytes that are equal for two mission items exactly when the vehicle would store the same item.
+    """
+    return struct.pack(
+        MISSION_ITEM_FORMAT,
+        item.frame,
+        item.command,
+        item.autocontinue,
+        item.param1,
+        item.param2,
+        item.param3,
+        item.param4,
+        item.x,
+        item.y,
+        item.z,
+    )
+
+
+def upload_commands_differential(
+    drone: dronekit.Vehicle, commands: collections.abc.Iterable[dronekit.Command], timeout: float
+) -> "tuple[True, float] | tuple[False, None]":
+    """
+    Uploads the commands, sending only the items that differ from the mission last downloaded
+    from or uploaded to the drone by DroneKit. Changes made by another ground station since
+    then are not detected.
+
+    If the number of items is unchanged and the autopilot is ArduPilot, the changed span is
+    sent with a partial mission write. Otherwise the whole mission is replaced.
+    If the list is empty, does not upload anything.
+
+    drone: The connected drone.
+    commands: Commands of the new mission.
+    timeout: Time limit in seconds for the upload.
+
+    Return: Success, time taken in seconds.
+    """
+    start_time = time.perf_counter()
+
+    commands = list(commands)
+    if len(commands) == 0:
+        return False, None
+
+    # The local copy kept by DroneKit is the cached on-vehicle mission, with home at index 0
+    # It is updated before the drone confirms anything, so on failure it is cleared, as the
+    # drone may hold any mix of the old and new items. The next upload then replaces the
+    # whole mission instead of finding no differences.
+    # pylint: disable-next=protected-access
+    mission = drone._wploader
+    if mission.count() == 0:
+        # Nothing known about the mission on the drone
+        # DroneKit raises its own TimeoutError, which is not the builtin one
+        try:
+            result = upload_commands(drone, commands, timeout)
+        except dronekit.TimeoutError:
+            print("Full mission upload timed out")
+            result = False
+
+        if not result:
+            mission.clear()
+            return False, None
+
+        return True, time.perf_counter() - start_time
+
+    command_sequence = drone.commands
+    existing_keys = [__mission_item_key(item) for item in command_sequence]
+    new_keys = [__mission_item_key(command) for command in commands]
+
+    changed_indices = [
+        i
+        for i, (existing_key, new_key) in enumerate(zip(existing_keys, new_keys))
+        if existing_key != new_key
+    ]
+
+    # pylint: disable-next=protected-access
+    is_ardupilot = drone._autopilot_type == mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA
+    if len(existing_keys) != len(new_keys) or not is_ardupilot:
+        command_sequence.clear()
+        for command in commands:
+            command_sequence.add(command)
+
+        try:
+            command_sequence.upload(timeout=timeout)
+        except dronekit.TimeoutError:
+            print("Full mission upload timed out")
+            mission.clear()
+            return False, None
+
+        return True, time.perf_counter() - start_time
+
+    if len(changed_indices) == 0:
+        return True, time.perf_counter() - start_time
+
+    # Mission sequence numbers are offset by home
+    first_sequence = changed_indices[0] + 1
+    last_sequence = changed_indices[-1] + 1
+    for sequence in range(first_sequence, last_sequence + 1):
+        command = commands[sequence - 1]
+        # pylint: disable-next=protected-access
+        drone._handler.fix_targets(command)
+        mission.set(command, sequence)
+
+    # DroneKit answers the drone's requests for any item marked as not uploaded
+    uploaded = [True] * mission.count()
+    uploaded[first_sequence : last_sequence + 1] = [False] * (last_sequence - first_sequence + 1)
+    # pylint: disable=protected-access
+    drone._wp_uploaded = uploaded
+    drone._master.mav.mission_write_partial_list_send(
+        drone._master.target_system, drone._master.target_component, first_sequence, last_sequence
+    )
+    # pylint: enable=protected-access
+
+    while False in uploaded:
+        if time.perf_counter() - start_time > timeout:
+            # pylint: disable-next=protected-access
+            drone._wp_uploaded = None
+            print("Partial mission upload timed out")
+            mission.clear()
+            return False, None
+
+        time.sleep(PARTIAL_UPLOAD_POLL_PERIOD)
+
+    # pylint: disable-next=protected-access
+    drone._wp_uploaded = None
+
+    return True, time.perf_counter() - start_time
@@ -0,0 +1,289 @@
+"""
+Visibility graph shortest path planning around polygonal obstacles.
+"""
+
+import heapq
+import math
+
+import numpy as np
+import shapely
+import shapely.geometry
+
+
+# Fraction of the buffer distance that segments must keep clear of the obstacles,
+# slightly less than 1 so that edges along the buffer between its own nodes are not blocked
+CLEARANCE_TOLERANCE = 0.99
+
+
+class VisibilityGraph:
+    """
+    Graph whose nodes are the vertices of the buffered obstacles, with an edge between every
+    pair of nodes that can see each other without crossing any obstacle.
+    The obstacles are prepared together as one indexed geometry, so each segment is only
+    tested against the obstacle edges near it. Visibility from an obstacle node is computed
+    the first time the node is expanded and kept for later queries; only the start and goal
+    are connected for each query, and the goal visibility is kept while the goal is unchanged.
+    Edges are tested against the obstacles buffered by slightly less than the buffer distance,
+    so paths keep the buffer distance as a clearance. A start or goal may lie inside that
+    clearance, in which case its own segments are only kept out of the obstacles themselves.
+    Every buffered vertex is a node and every visible pair is an edge: pruning reflex vertices
+    or edges that are not tangent to the buffered obstacles is only valid if no path starts or
+    ends inside the buffer.
+    Each expansion tests a segment to every other node, so without a maximum edge length the
+    first query around about 1000 obstacles takes seconds, too long to plan in flight. The
+    maximum edge length limits the nodes tested to those nearby, at the cost of paths that
+    may be slightly longer than the shortest.
+
+    Attributes:
+        nodes: Coordinates of the obstacle nodes, shape (N, 2).
+        maximum_edge_length: Longest edge between obstacle nodes, infinite if not limited.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        obstacles: "list[shapely.geometry.Polygon]",
+        buffer_distance: float,
+        maximum_edge_length: float = math.inf,
+    ) -> "tuple[True, VisibilityGraph] | tuple[False, None]":
+        """
+        obstacles: Areas that paths must not intersect. Empty polygons are ignored.
+        buffer_distance: Distance from the obstacles to place the nodes at and to keep paths
+            away from the obstacles, must be positive.
+        maximum_edge_length: Longest edge between obstacle nodes, must be positive.
+            Edges from the start and goal are not limited.
+        """
+        if buffer_distance <= 0.0 or maximum_edge_length <= 0.0:
+            return False, None
+
+        obstacles = [obstacle for obstacle in obstacles if not obstacle.is_empty]
+
+        obstacle_nodes = [np.empty((0, 2), dtype=np.float64)]
+        clearance_areas = []
+        for obstacle in obstacles:
+            buffered_obstacle = obstacle.buffer(buffer_distance, join_style="mitre")
+            if not isinstance(buffered_obstacle, shapely.geometry.Polygon):
+                return False, None
+
+            # The exterior ring repeats its first coordinate at the end
+            obstacle_nodes.append(
+                np.array(buffered_obstacle.exterior.coords, dtype=np.float64)[:-1, :2]
+            )
+            # Mitred like the buffer the nodes are on, so it stays inside that buffer
+            # while covering every point closer than the tolerance to the obstacle
+            clearance_areas.append(
+                obstacle.buffer(buffer_distance * CLEARANCE_TOLERANCE, join_style="mitre")
+            )
+
+        return True, VisibilityGraph(
+            cls.__create_key,
+            obstacles,
+            shapely.union_all(clearance_areas),
+            np.vstack(obstacle_nodes),
+            maximum_edge_length,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        obstacles: "list[shapely.geometry.Polygon]",
+        clearance_area: shapely.Geometry,
+        nodes: np.ndarray,
+        maximum_edge_length: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is VisibilityGraph.__create_key, "Use create() method"
+
+        # Preparing builds a spatial index over the edges of all the obstacles,
+        # so each segment is only tested against the obstacle edges near it
+        self.__obstacle_area = shapely.geometry.MultiPolygon(obstacles)
+        shapely.prepare(self.__obstacle_area)
+        self.__clearance_area = clearance_area
+        shapely.prepare(self.__clearance_area)
+
+        # Nodes that fall inside the clearance of another obstacle can never be reached
+        is_reachable = ~self.__is_blocked(self.__clearance_area, shapely.points(nodes))
+
+        self.nodes = nodes[is_reachable]
+        self.maximum_edge_length = maximum_edge_length
+
+        self.__visibility_rows: "dict[int, np.ndarray]" = {}
+
+        # Replanning usually keeps the same goal while the start moves
+        self.__last_goal_point = np.full(2, np.nan)
+        self.__last_goal_visibility = np.zeros(0, dtype=bool)
+
+    def __visible_nodes(
+        self,
+        point: np.ndarray,
+        blocking_area: shapely.Geometry,
+        maximum_distance: float = math.inf,
+    ) -> np.ndarray:
+        """
+        Which obstacle nodes can be reached in a straight line from the point.
+
+        point: Coordinates, shape (2,).
+        blocking_area: Prepared area that the segments must not intersect.
+        maximum_distance: Nodes further from the point are not tested and not visible.
+
+        Return: Boolean mask over the obstacle nodes.
+        """
+        # No edge from a node to itself
+        visible = np.any(self.nodes != point, axis=1)
+        if maximum_distance < math.inf:
+            visible &= np.hypot(*(self.nodes - point).T) <= maximum_distance
+
+        candidate_ids = np.flatnonzero(visible)
+        if len(candidate_ids) == 0:
+            return visible
+
+        segments = np.empty((len(candidate_ids), 2, 2), dtype=np.float64)
+        segments[:, 0, :] = point
+        segments[:, 1, :] = self.nodes[candidate_ids]
+
+        visible[candidate_ids] = ~self.__is_blocked(blocking_area, shapely.linestrings(segments))
+
+        return visible
+
+    @staticmethod
+    def __is_blocked(blocking_area: shapely.Geometry, geometries: np.ndarray) -> np.ndarray:
+        """
+        Which geometries intersect the blocking area.
+
+        blocking_area: Prepared area.
+        geometries: Array of segments or points.
+
+        Return: Boolean mask over the geometries.
+        """
+        # The prepared geometry must be the first argument to be used
+        return shapely.intersects(blocking_area, geometries)
+
+    def __blocking_area(self, point: np.ndarray) -> shapely.Geometry:
+        """
+        Area that segments from a start or goal must not intersect, only the obstacles
+        themselves if the point is already inside the clearance.
+        """
+        if self.__is_blocked(self.__clearance_area, shapely.points([point]))[0]:
+            return self.__obstacle_area
+
+        return self.__clearance_area
+
+    def __visibility_row(self, node_id: int) -> np.ndarray:
+        """
+        Visibility from an obstacle node, computed on first use.
+        """
+        row = self.__visibility_rows.get(node_id)
+        if row is None:
+            row = self.__visible_nodes(
+                self.nodes[node_id], self.__clearance_area, self.maximum_edge_length
+            )
+            self.__visibility_rows[node_id] = row
+
+        return row
+
+    def __is_visible(
+        self, point_1: np.ndarray, point_2: np.ndarray, blocking_area: shapely.Geometry
+    ) -> bool:
+        """
+        Whether the segment between the points does not intersect the blocking area.
+        """
+        segment = shapely.linestrings([[point_1, point_2]])
+        return not self.__is_blocked(blocking_area, segment)[0]
+
+    def shortest_path(
+        self, start: "tuple[float, float]", goal: "tuple[float, float]"
+    ) -> "tuple[True, list[int]] | tuple[False, None]":
+        """
+        A* search from start to goal, with Euclidean distance as the edge cost and heuristic.
+
+        start: Coordinates of the start.
+        goal: Coordinates of the goal.
+
+        Return: Success, node ids along the path including the start and goal.
+            Ids 0 to N - 1 are indices into nodes, N is the start and N + 1 is the goal.
+        """
+        node_count = len(self.nodes)
+        start_id = node_count
+        goal_id = node_count + 1
+
+        start_point = np.array(start, dtype=np.float64)
+        goal_point = np.array(goal, dtype=np.float64)
+        points = np.vstack([self.nodes, start_point, goal_point])
+
+        # Only the start and goal are connected for this query
+        start_blocking_area = self.__blocking_area(start_point)
+        goal_blocking_area = self.__blocking_area(goal_point)
+        visible_from_start = self.__visible_nodes(start_point, start_blocking_area)
+        if not np.array_equal(goal_point, self.__last_goal_point):
+            self.__last_goal_visibility = self.__visible_nodes(goal_point, goal_blocking_area)
+            self.__last_goal_point = goal_point
+
+        visible_from_goal = self.__last_goal_visibility
+        # The direct segment is only kept out of the obstacles if either end is in the clearance
+        direct_blocking_area = (
+            start_blocking_area
+            if start_blocking_area is self.__obstacle_area
+            else goal_blocking_area
+        )
+        is_goal_visible_from_start = self.__is_visible(
+            start_point, goal_point, direct_blocking_area
+        )
+
+        heuristic = np.hypot(*(points - goal_point).T)
+
+        distance = np.full(node_count + 2, np.inf)
+        previous = np.full(node_count + 2, -1, dtype=np.int64)
+        is_settled = np.zeros(node_count + 2, dtype=bool)
+
+        distance[start_id] = 0.0
+        queue = [(heuristic[start_id], start_id)]
+
+        while queue:
+            _, node_id = heapq.heappop(queue)
+            if is_settled[node_id]:
+                continue
+
+            is_settled[node_id] = True
+            if node_id == goal_id:
+                break
+
+            if node_id == start_id:
+                neighbour_ids = np.flatnonzero(visible_from_start)
+                is_goal_visible = is_goal_visible_from_start
+            else:
+                neighbour_ids = np.flatnonzero(self.__visibility_row(node_id))
+                is_goal_visible = visible_from_goal[node_id]
+
+            if is_goal_visible:
+                neighbour_ids = np.append(neighbour_ids, goal_id)
+
+            neighbour_ids = neighbour_ids[~is_settled[neighbour_ids]]
+            if len(neighbour_ids) == 0:
+                continue
+
+            # Relax all edges of the node at once
+            candidate_distance = distance[node_id] + np.hypot(
+                *(points[neighbour_ids] - points[node_id]).T
+            )
+            is_shorter = candidate_distance < distance[neighbour_ids]
+            for neighbour_id, neighbour_distance in zip(
+                neighbour_ids[is_shorter].tolist(), candidate_distance[is_shorter].tolist()
+            ):
+                distance[neighbour_id] = neighbour_distance
+                previous[neighbour_id] = node_id
+                heapq.heappush(queue, (neighbour_distance + heuristic[neighbour_id], neighbour_id))
+
+        if not is_settled[goal_id]:
+            return False, None
+
+        path = [goal_id]
+        while path[-1] != start_id:
+            path.append(int(previous[path[-1]]))
+
+        path.reverse()
+
+        return True, path
@@ -5,11 +5,16 @@ including the current waypoint sequence, location, and destination.
 
 from pymavlink import mavutil
 
+from . import mission_mirror
 from .common.modules.mavlink import dronekit
 
 
+MIRROR_DOWNLOAD_TIMEOUT = 30.0  # seconds
+
+
 def get_current_waypoint_info(
     drone: dronekit.Vehicle,
+    mirror: mission_mirror.MissionMirror | None = None,
 ) -> "tuple[bool, tuple[int, tuple[float, float] | None] | None]":
     """
     Function to retrieve information about the current waypoint sequence and destination
@@ -18,6 +23,9 @@ def get_current_waypoint_info(
     ----------
     drone: dronekit.Vehicle
         The connected drone.
+    mirror: MissionMirror | None
+        Local copy of the drone's mission. If given, the mission is only downloaded when the
+        mirror is stale, instead of on every call.
 
     Returns
     -------
@@ -25,6 +33,21 @@ def get_current_waypoint_info(
         (True, destination waypoint information), where information is (index, location).
         location can be None.
     """
+    if mirror is not None:
+        result, mirror_info = mirror.current_waypoint_info(MIRROR_DOWNLOAD_TIMEOUT)
+        if not result:
+            return False, None
+
+        current_waypoint, current_item = mirror_info
+        if current_item is None:
+            return True, (current_waypoint, None)
+
+        command, latitude, longitude = current_item
+        if command != mavutil.mavlink.MAV_CMD_NAV_WAYPOINT:
+            return True, (current_waypoint, None)
+
+        return True, (current_waypoint, (latitude, longitude))
+
     # Download the mission commands from the drone
     drone.commands.download()
     drone.commands.wait_ready()
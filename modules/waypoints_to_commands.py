@@ -2,7 +2,10 @@
 Function to convert list of waypoints to dronekit commands.
 """
 
+import collections.abc
+
 from . import generate_command
+from . import generate_hotspot_search_path
 from .common.modules import location_global
 from .common.modules import position_global_relative_altitude
 from .common.modules.mavlink import flight_controller
@@ -64,3 +67,28 @@ def waypoints_with_altitude_to_commands(
         dronekit_command_list.append(command)
 
     return True, dronekit_command_list
+
+
+def waypoint_rings_to_commands(
+    rings: collections.abc.Iterable[
+        list[position_global_relative_altitude.PositionGlobalRelativeAltitude]
+    ],
+) -> collections.abc.Iterator[flight_controller.dronekit.Command]:
+    """
+    Lazily convert rings of waypoints to dronekit commands, one ring at a time.
+    Empty rings are skipped.
+
+    rings: Iterable of lists of positions, such as a streamed search path.
+
+    Yields: Dronekit commands that can be sent to the drone.
+    Raises: SearchPathError if a ring cannot be converted, as the mission would be incomplete.
+    """
+    for ring in rings:
+        if len(ring) == 0:
+            continue
+
+        result, commands = waypoints_with_altitude_to_commands(ring)
+        if not result:
+            raise generate_hotspot_search_path.SearchPathError("Failed to convert ring to commands")
+
+        yield from commands
@@ -3,13 +3,17 @@ Should write located IR beacons to a kml file for task 1
 File is a work in progress and should not be run yet
 """
 
+import asyncio
+import itertools
 import pathlib
 import time
 import yaml
 
 from modules import add_takeoff_and_rtl_command
-from modules import check_stop_condition
 from modules import generate_hotspot_search_path
+from modules import mission_runtime
+from modules import search_plan_cache
+from modules import telemetry_monitor
 from modules import upload_commands
 from modules import waypoints_to_commands
 from modules.common.modules.mavlink import dronekit
@@ -42,7 +46,6 @@ def main() -> int:
         # pylint: disable=invalid-name
         CONNECTION_ADDRESS = config["connection_address"]
         LOG_DIRECTORY_PATH = pathlib.Path(config["log_directory_path"])
-        DELAY = config["delay"]
         MAXIMUM_FLIGHT_TIME = config["maximum_flight_time"]
         SEARCH_CENTRE = PositionGlobalRelativeAltitude.create(
             float(config["search_centre"][0]), float(config["search_centre"][1]), 0
@@ -52,6 +55,8 @@ def main() -> int:
         CAMERA_VERTICAL_FOV = float(config["camera"]["vertical_fov"])
         DRONE_TIMEOUT = float(config["drone_timeout"])
         TAKEOFF_ALTITUDE = float(config["takeoff_altitude"])
+        PLAN_CACHE_DIRECTORY_PATH = pathlib.Path(config["plan_cache"]["directory_path"])
+        PLAN_CACHE_MAXIMUM_SIZE = int(config["plan_cache"]["maximum_size"])
         # pylint: enable=invalid-name
     except KeyError as exc:
         print(f"Unable to find key in yaml file: {exc}")
@@ -62,49 +67,106 @@ def main() -> int:
     # Wait ready is false as the drone may be on the ground
     drone = dronekit.connect(CONNECTION_ADDRESS, wait_ready=False)
 
-    # Calculate the drone's visible dimensions on the ground, in meters
-    visible_horizontal_length, visible_vertical_length = search_area_dimensions(
-        TAKEOFF_ALTITUDE, 0, 0, True, CAMERA_HORIZONTAL_FOV, CAMERA_VERTICAL_FOV, False
+    # Reuse the search plan from a previous launch if none of its inputs have changed
+    plan_key = search_plan_cache.search_plan_key(
+        SEARCH_CENTRE, SEARCH_RADIUS, CAMERA_HORIZONTAL_FOV, CAMERA_VERTICAL_FOV, TAKEOFF_ALTITUDE
     )
-
-    # Generate itinerary to find hotspots
-    result, waypoints = generate_hotspot_search_path.generate_search_path(
-        SEARCH_CENTRE, SEARCH_RADIUS, (visible_horizontal_length, visible_vertical_length)
+    is_plan_cached, cached_plan = search_plan_cache.load_search_plan(
+        PLAN_CACHE_DIRECTORY_PATH, plan_key
     )
-    if not result:
-        print("ERROR: generating search itinerary failed.")
+
+    generated_rings = []
+    generated_commands = []
+    if is_plan_cached:
+        print("Loaded search itinerary from cache.")
+        _, takeoff_rtl_commands = cached_plan
+    else:
+        # Calculate the drone's visible dimensions on the ground, in meters
+        visible_horizontal_length, visible_vertical_length = search_area_dimensions(
+            TAKEOFF_ALTITUDE, 0, 0, True, CAMERA_HORIZONTAL_FOV, CAMERA_VERTICAL_FOV, False
+        )
+
+        # Generate itinerary to find hotspots
+        # Rings are generated lazily so that the inner rings are converted while the rest are computed
+        result, rings = generate_hotspot_search_path.generate_search_path_lazy(
+            SEARCH_CENTRE, SEARCH_RADIUS, (visible_horizontal_length, visible_vertical_length)
+        )
+        if not result:
+            print("ERROR: generating search itinerary failed.")
+            return -1
+
+    # A ring that fails, the first one included, stops the upload before the mission is
+    # replaced, and nothing is cached
+    try:
+        if not is_plan_cached:
+            first_ring = next(rings, None)
+            if first_ring is None:
+                print("ERROR: Search radius too small for a search itinerary.")
+                return -1
+
+            # Keep what was generated to save it to the cache after the upload
+            waypoint_commands = waypoints_to_commands.waypoint_rings_to_commands(
+                search_plan_cache.record(itertools.chain([first_ring], rings), generated_rings)
+            )
+
+            takeoff_rtl_commands = search_plan_cache.record(
+                add_takeoff_and_rtl_command.add_takeoff_and_rtl_command_lazy(
+                    waypoint_commands, TAKEOFF_ALTITUDE
+                ),
+                generated_commands,
+            )
+
+        result = upload_commands.upload_commands(drone, takeoff_rtl_commands, DRONE_TIMEOUT)
+    except generate_hotspot_search_path.SearchPathError as exception:
+        print(f"ERROR: generating search itinerary failed: {exception}")
         return -1
 
-    result, waypoint_commands = waypoints_to_commands.waypoints_with_altitude_to_commands(waypoints)
     if not result:
-        print("ERROR: Converting waypoints to commands failed.")
-        return -1
+        print("ERROR: Uploading drone commands failed.")
+        return False, None
+
+    if not is_plan_cached:
+        result = search_plan_cache.save_search_plan(
+            PLAN_CACHE_DIRECTORY_PATH,
+            plan_key,
+            generated_rings,
+            generated_commands,
+            PLAN_CACHE_MAXIMUM_SIZE,
+        )
+        if not result:
+            # Not fatal, the plan is regenerated on the next launch
+            print("WARNING: Saving search itinerary to cache failed.")
 
-    result, takeoff_rtl_commands = add_takeoff_and_rtl_command.add_takeoff_and_rtl_command(
-        waypoint_commands, TAKEOFF_ALTITUDE
+    # Telemetry changes are handled as they arrive instead of polling
+    result, monitor = telemetry_monitor.TelemetryMonitor.create(
+        drone, frozenset([telemetry_monitor.WAYPOINT_EVENT, telemetry_monitor.MODE_EVENT])
     )
     if not result:
-        print("ERROR: Adding takeoff/RTL commands failed.")
-        return False, None
+        print("ERROR: Could not create telemetry monitor.")
+        return -1
 
-    result = upload_commands.upload_commands(drone, takeoff_rtl_commands, DRONE_TIMEOUT)
+    # The flight time watchdog runs alongside the telemetry, so neither holds up the other
+    result, runtime = mission_runtime.MissionRuntime.create(
+        drone, time.time(), MAXIMUM_FLIGHT_TIME, DRONE_TIMEOUT
+    )
     if not result:
-        print("ERROR: Uploading drone commands failed.")
-        return False, None
+        print("ERROR: Could not create mission runtime.")
+        return -1
 
-    start_time = time.time()
-    while True:
-        # Send drone back to launch if we exceed max flight time
-        current_time = time.time()
-        is_returning_to_launch = check_stop_condition.check_stop_condition(
-            start_time, current_time, drone, MAXIMUM_FLIGHT_TIME
-        )
+    def print_event(event: telemetry_monitor.TelemetryEvent) -> None:
+        print(f"Elapsed time(s): {time.time() - runtime.start_time}, {event.kind}: {event.value}")
+
+    result = asyncio.run(runtime.run(runtime.ingest_telemetry(monitor, print_event)))
 
-        if is_returning_to_launch:
-            break
+    monitor.close()
+    print(
+        f"Telemetry event latency (s): mean {monitor.mean_latency()}, "
+        f"maximum {monitor.maximum_latency}, over {monitor.event_count} events"
+    )
 
-        print(f"Elapsed time(s): {current_time - start_time}")
-        time.sleep(DELAY)
+    if not result:
+        print("ERROR: Mission runtime failed.")
+        return -1
 
     return 0
 
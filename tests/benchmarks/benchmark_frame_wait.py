@@ -0,0 +1,129 @@
+"""
+Benchmark CPU used by the QR scanner thread while it waits for camera frames, polling a queue
+against blocking on the latest frame buffer.
+"""
+
+import collections.abc
+import queue
+import threading
+import time
+
+import numpy as np
+
+from modules import latest_frame_buffer
+
+
+FRAME_RATE = 30.0  # frames per second
+DURATION = 3.0  # seconds
+WAIT_TIME = 0.1  # seconds
+
+FRAME_WIDTH = 1920
+FRAME_HEIGHT = 1080
+
+
+def produce_frames(
+    put_frame: "collections.abc.Callable[[np.ndarray, float], None]", stop_event: threading.Event
+) -> None:
+    """
+    Puts a frame at the camera frame rate until stopped.
+    """
+    frame = np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+    next_time = time.monotonic()
+    while not stop_event.is_set():
+        put_frame(frame, time.monotonic())
+        next_time += 1.0 / FRAME_RATE
+        time.sleep(max(next_time - time.monotonic(), 0.0))
+
+
+def consume_polling(
+    frame_queue: queue.Queue, stop_event: threading.Event, statistics: "list[float]"
+) -> None:
+    """
+    Previous scanner loop, which checks the queue without blocking.
+    """
+    cpu_start_time = time.thread_time()
+    latencies = []
+    while not stop_event.is_set():
+        if not frame_queue.empty():
+            _, capture_time = frame_queue.get()
+            latencies.append(time.monotonic() - capture_time)
+
+    statistics.extend([time.thread_time() - cpu_start_time, float(np.mean(latencies))])
+
+
+def consume_blocking(
+    frame_buffer: latest_frame_buffer.LatestFrameBuffer,
+    stop_event: threading.Event,
+    statistics: "list[float]",
+) -> None:
+    """
+    Current scanner loop, which sleeps until a frame arrives.
+    """
+    cpu_start_time = time.thread_time()
+    latencies = []
+    while not stop_event.is_set():
+        result, frame_and_time = frame_buffer.take(WAIT_TIME)
+        if result:
+            latencies.append(time.monotonic() - frame_and_time[1])
+
+    statistics.extend([time.thread_time() - cpu_start_time, float(np.mean(latencies))])
+
+
+def run(
+    put_frame: "collections.abc.Callable[[np.ndarray, float], None]",
+    consume: collections.abc.Callable,
+    source: object,
+) -> "tuple[float, float]":
+    """
+    Runs a producer and consumer for the benchmark duration.
+
+    Return: Consumer CPU time in seconds and mean latency in seconds.
+    """
+    stop_event = threading.Event()
+    statistics = []
+
+    producer = threading.Thread(target=produce_frames, args=(put_frame, stop_event))
+    consumer = threading.Thread(target=consume, args=(source, stop_event, statistics))
+    producer.start()
+    consumer.start()
+
+    time.sleep(DURATION)
+    stop_event.set()
+
+    producer.join()
+    consumer.join()
+
+    return statistics[0], statistics[1]
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    frame_queue = queue.Queue(maxsize=10)
+    polling_cpu_time, polling_latency = run(
+        lambda frame, capture_time: frame_queue.put((frame, capture_time)),
+        consume_polling,
+        frame_queue,
+    )
+
+    result, frame_buffer = latest_frame_buffer.LatestFrameBuffer.create()
+    if not result:
+        print("ERROR: Could not create frame buffer")
+        return -1
+
+    blocking_cpu_time, blocking_latency = run(frame_buffer.put, consume_blocking, frame_buffer)
+
+    print("consumer, CPU (% of a core), mean latency (ms)")
+    print(f"polling, {100.0 * polling_cpu_time / DURATION:.1f}, {1000.0 * polling_latency:.3f}")
+    print(f"blocking, {100.0 * blocking_cpu_time / DURATION:.1f}, {1000.0 * blocking_latency:.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
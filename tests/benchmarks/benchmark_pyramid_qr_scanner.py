@@ -0,0 +1,104 @@
+"""
+Benchmark full frame QR decoding against locating the code on a downscaled frame first.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from modules import pyramid_qr_scanner
+from modules.common.modules.qr import qr_scanner
+
+
+REPEATS = 50
+
+FRAME_WIDTH = 1920
+FRAME_HEIGHT = 1080
+
+# Size in pixels and top left corner of the QR code in the frame
+QR_SIZE = 300
+QR_LEFT = 1200
+QR_TOP = 500
+QR_TEXT = "Follow route: Quebec; Lima; Alpha; Tango"
+
+RANDOM_SEED = 0
+
+
+def generate_frame() -> np.ndarray:
+    """
+    Grey noise with a QR code on a white quiet zone.
+    """
+    generator = np.random.default_rng(RANDOM_SEED)
+    frame = generator.integers(64, 192, (FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+
+    code = cv2.QRCodeEncoder.create().encode(QR_TEXT)
+    code = cv2.resize(code, (QR_SIZE, QR_SIZE), interpolation=cv2.INTER_NEAREST)
+    code = cv2.copyMakeBorder(code, 20, 20, 20, 20, cv2.BORDER_CONSTANT, value=255)
+
+    height, width = code.shape
+    frame[QR_TOP : QR_TOP + height, QR_LEFT : QR_LEFT + width] = code[:, :, np.newaxis]
+
+    return frame
+
+
+def time_scanner(scanner: object, frame: np.ndarray) -> "tuple[float, int]":
+    """
+    Return: Mean decode time in seconds and number of successful decodes.
+    """
+    found_count = 0
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        is_qr_text_found, qr_text = scanner.get_qr_text(frame)
+        if is_qr_text_found and qr_text == QR_TEXT:
+            found_count += 1
+
+    return (time.perf_counter() - start_time) / REPEATS, found_count
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    frame = generate_frame()
+
+    result, pyramid_scanner = pyramid_qr_scanner.PyramidQrScanner.create()
+    if not result:
+        print("ERROR: Could not create pyramid QR scanner")
+        return -1
+
+    # Without the last region, so every frame is located again
+    result, locate_only_scanner = pyramid_qr_scanner.PyramidQrScanner.create()
+    if not result:
+        print("ERROR: Could not create pyramid QR scanner")
+        return -1
+
+    print("scanner, mean time (ms), scans per second, found")
+    for name, scanner, new_frame_each_time in [
+        ("full frame", qr_scanner.QrScanner(), False),
+        ("pyramid, last region", pyramid_scanner, False),
+        ("pyramid, locate", locate_only_scanner, True),
+    ]:
+        if new_frame_each_time:
+            # Shifting the frame moves the code out of the last region
+            mean_time, found_count = 0.0, 0
+            for shift in range(REPEATS):
+                shifted_frame = np.roll(frame, (shift % 2) * QR_SIZE, axis=1)
+                start_time = time.perf_counter()
+                is_qr_text_found, _ = scanner.get_qr_text(shifted_frame)
+                mean_time += (time.perf_counter() - start_time) / REPEATS
+                found_count += int(is_qr_text_found)
+        else:
+            mean_time, found_count = time_scanner(scanner, frame)
+
+        print(f"{name}, {1000.0 * mean_time:.2f}, {1.0 / mean_time:.1f}, {found_count}/{REPEATS}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
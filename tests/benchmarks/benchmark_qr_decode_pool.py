@@ -0,0 +1,67 @@
+"""
+Benchmark QR decode throughput of the process pool as the number of workers grows.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from modules import qr_decode_pool
+
+
+DURATION = 5.0  # seconds
+WAIT_TIME = 1.0  # seconds
+
+FRAME_SHAPE = (1080, 1920, 3)
+
+RANDOM_SEED = 0
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    generator = np.random.default_rng(RANDOM_SEED)
+    # Noise has no QR code, so every frame is searched in full
+    frame = generator.integers(0, 256, FRAME_SHAPE, dtype=np.uint8)
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print("workers, frames per second, mean latency (ms), dropped")
+    for worker_count in worker_counts:
+        result, pool = qr_decode_pool.QrDecodePool.create(worker_count, FRAME_SHAPE)
+        if not result:
+            print(f"ERROR: Could not create pool with {worker_count} workers")
+            return -1
+
+        # Wait for the workers to start, so start up is not counted
+        pool.submit(frame)
+        while pool.decode_count == 0:
+            time.sleep(0.01)
+
+        start_decode_count = pool.decode_count
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < DURATION:
+            if pool.wait_for_free_slot(WAIT_TIME):
+                pool.submit(frame)
+
+        frame_rate = (pool.decode_count - start_decode_count) / (time.monotonic() - start_time)
+        print(
+            f"{worker_count}, {frame_rate:.1f}, {1000.0 * pool.mean_latency():.1f}, "
+            f"{pool.dropped_count}"
+        )
+
+        pool.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
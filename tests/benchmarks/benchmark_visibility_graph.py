@@ -0,0 +1,104 @@
+"""
+Benchmark visibility graph planning as the number of obstacles grows.
+"""
+
+import itertools
+import math
+import time
+
+import numpy as np
+import shapely.geometry
+
+from modules import visibility_graph
+
+
+OBSTACLE_COUNTS = [1, 10, 100, 1000]
+REPEATS = 5
+
+# Obstacles are squares placed on a grid of cells of this size
+CELL_SIZE = 10.0
+OBSTACLE_SIZE = 6.0
+BUFFER_DISTANCE = 0.5
+# Unlimited, then limited to the neighbouring cells
+MAXIMUM_EDGE_LENGTHS = [math.inf, 3 * CELL_SIZE]
+
+RANDOM_SEED = 0
+
+
+def generate_obstacles(
+    obstacle_count: int, generator: np.random.Generator
+) -> "list[shapely.geometry.Polygon]":
+    """
+    Non-overlapping squares, jittered inside randomly chosen cells of a square grid.
+    """
+    grid_size = math.ceil(math.sqrt(obstacle_count))
+    cells = generator.choice(grid_size * grid_size, obstacle_count, replace=False)
+
+    obstacles = []
+    for cell in cells.tolist():
+        x = (cell % grid_size) * CELL_SIZE + generator.uniform(0.0, CELL_SIZE - OBSTACLE_SIZE)
+        y = (cell // grid_size) * CELL_SIZE + generator.uniform(0.0, CELL_SIZE - OBSTACLE_SIZE)
+        obstacles.append(shapely.geometry.box(x, y, x + OBSTACLE_SIZE, y + OBSTACLE_SIZE))
+
+    return obstacles
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    print(
+        "obstacles, maximum edge length (m), nodes, create (ms), first query (ms), "
+        "repeat query (ms), path nodes, path length (m)"
+    )
+    for obstacle_count, maximum_edge_length in itertools.product(
+        OBSTACLE_COUNTS, MAXIMUM_EDGE_LENGTHS
+    ):
+        # Same obstacles for every maximum edge length
+        generator = np.random.default_rng([RANDOM_SEED, obstacle_count])
+        obstacles = generate_obstacles(obstacle_count, generator)
+
+        # Cross the whole field diagonally
+        field_size = math.ceil(math.sqrt(obstacle_count)) * CELL_SIZE
+        start = (-CELL_SIZE, -CELL_SIZE)
+        goal = (field_size + CELL_SIZE, field_size + CELL_SIZE)
+
+        create_start_time = time.perf_counter()
+        result, graph = visibility_graph.VisibilityGraph.create(
+            obstacles, BUFFER_DISTANCE, maximum_edge_length
+        )
+        create_time = time.perf_counter() - create_start_time
+        if not result:
+            print(f"ERROR: Could not create graph with {obstacle_count} obstacles")
+            return -1
+
+        query_times = []
+        path = None
+        for _ in range(REPEATS):
+            query_start_time = time.perf_counter()
+            result, path = graph.shortest_path(start, goal)
+            query_times.append(time.perf_counter() - query_start_time)
+            if not result:
+                print(f"ERROR: No path found with {obstacle_count} obstacles")
+                return -1
+
+        coordinates = [start] + [tuple(graph.nodes[node_id]) for node_id in path[1:-1]] + [goal]
+        path_length = sum(
+            math.dist(coordinates[i], coordinates[i + 1]) for i in range(len(coordinates) - 1)
+        )
+
+        print(
+            f"{obstacle_count}, {maximum_edge_length}, {len(graph.nodes)}, "
+            f"{create_time * 1000:.2f}, {query_times[0] * 1000:.2f}, "
+            f"{min(query_times[1:]) * 1000:.2f}, {len(path)}, {path_length:.1f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
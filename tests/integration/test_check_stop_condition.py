@@ -5,6 +5,7 @@ Test the drone stop condition.
 import time
 
 from modules import add_takeoff_and_landing_command
+from modules import check_stop_condition
 from modules import condition_evaluator
 from modules import mission_time_condition
 from modules import waypoints_to_commands
@@ -82,6 +83,21 @@ def main() -> int:
 
         time.sleep(DELAY)
 
+    # Switch to RTL mode first, then replace the mission so the drone does not resume it
+    result, time_and_upload = check_stop_condition.priority_return_to_launch(
+        controller.drone, DRONE_TIMEOUT
+    )
+    if not result:
+        print("Unable to return to launch.")
+        return -1
+
+    time_to_rtl, upload_future = time_and_upload
+    print(f"Time to RTL (s): {time_to_rtl}")
+
+    if not upload_future.result():
+        print("Unable to replace the mission with RTL.")
+        return -1
+
     return 0
 
 
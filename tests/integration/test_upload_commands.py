@@ -81,6 +81,57 @@ def upload_empty_command_list_and_assert(drone: dronekit.Vehicle) -> None:
         assert math.isclose(command.z, commands[i].z, abs_tol=TOLERANCE)
 
 
+def upload_without_download_and_verify(
+    drone: dronekit.Vehicle, commands: "list[dronekit.Command]"
+) -> None:
+    """
+    Test the case of replacing the mission without downloading it first.
+    """
+    result = upload_commands.upload_commands(
+        drone, commands, DRONE_TIMEOUT, download_first=False, verify=True
+    )
+    assert result
+
+
+def upload_changed_command_and_assert(
+    drone: dronekit.Vehicle, commands: "list[dronekit.Command]"
+) -> None:
+    """
+    Test the case of a single changed waypoint, which is sent without the rest of the mission.
+    """
+    result, full_upload_time = upload_commands.upload_commands_differential(
+        drone, commands, DRONE_TIMEOUT
+    )
+    assert result
+    assert full_upload_time is not None
+
+    changed_command = generate_command.waypoint(
+        WAYPOINT_HOLD_TIME, ACCEPT_RADIUS, commands[0].x + 0.001, commands[0].y, ALTITUDE
+    )
+    changed_commands = [changed_command] + commands[1:]
+
+    result, differential_upload_time = upload_commands.upload_commands_differential(
+        drone, changed_commands, DRONE_TIMEOUT
+    )
+    assert result
+    assert differential_upload_time is not None
+    print(
+        f"Upload time: full {full_upload_time:.3f} s, "
+        f"one changed item {differential_upload_time:.3f} s"
+    )
+
+    # Retrieve current drone commands and see if they match with inputs
+    command_sequence = retrieve_commands(drone)
+
+    assert len(command_sequence) == len(changed_commands)
+    for i, command in enumerate(command_sequence):
+        assert command.frame == changed_commands[i].frame
+        assert command.command == changed_commands[i].command
+        assert math.isclose(command.x, changed_commands[i].x, abs_tol=TOLERANCE)
+        assert math.isclose(command.y, changed_commands[i].y, abs_tol=TOLERANCE)
+        assert math.isclose(command.z, changed_commands[i].z, abs_tol=TOLERANCE)
+
+
 def main() -> int:
     """
     Main function.
@@ -114,6 +165,12 @@ def main() -> int:
     # Test with empty command sequence
     upload_empty_command_list_and_assert(dronekit_vehicle)
 
+    # Test replacing the mission without downloading it first
+    upload_without_download_and_verify(dronekit_vehicle, commands_input)
+
+    # Test sending only a changed waypoint
+    upload_changed_command_and_assert(dronekit_vehicle, commands_input)
+
     return 0
 
 
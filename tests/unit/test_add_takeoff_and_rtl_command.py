@@ -105,3 +105,17 @@ def test_add_takeoff_and_rtl_on_nonempty_commands(
 
     assert result
     assert_expected_takeoff_and_rtl_commands(commands_actual, commands_expected, ALTITUDE)
+
+
+def test_add_takeoff_and_rtl_lazy(
+    non_empty_commands: "list[flight_controller.dronekit.Command]",
+) -> None:
+    """
+    Tests functionality correctness of add_takeoff_and_rtl_command_lazy on a generator of commands.
+    """
+    commands_expected = copy.deepcopy(non_empty_commands)
+    commands_actual = add_takeoff_and_rtl_command.add_takeoff_and_rtl_command_lazy(
+        (command for command in non_empty_commands), ALTITUDE
+    )
+
+    assert_expected_takeoff_and_rtl_commands(list(commands_actual), commands_expected, ALTITUDE)
@@ -4,9 +4,13 @@ Testing the advanced_csv_to_commands module
 
 import pathlib
 
+import pytest
+
 from modules import advanced_csv_to_commands
 from modules import generate_command
+from modules import upload_commands
 from modules.common.modules.mavlink import flight_controller
+from tests.unit import test_upload_commands
 
 
 def test_normal_file() -> None:
@@ -131,3 +135,135 @@ def test_non_int_param() -> None:
     success, mission = advanced_csv_to_commands.csv_to_commands_list(non_integer_param_path)
     assert not success
     assert mission is None
+
+
+def test_all_errors_collected(tmp_path: pathlib.Path) -> None:
+    """
+    Every invalid row is reported with its line number, not just the first
+    """
+    # Setup
+    mission_path = tmp_path / "mission.csv"
+    mission_path.write_text(
+        advanced_csv_to_commands.HEADER
+        + "\n"
+        + "global_relative_alt,takeoff,1,0,0,0,0,0,50\n"
+        + "global_relative_alt,waypoint,0,0.1,0,0,43.47,-80.54,10\n"
+        + "\n"
+        + "globbal,waypoint,0,0.1,0,0,43.47,-80.54,10\n"
+        + "global_relative_alt,do_jump,4.5,2,0,0,0,0,0\n"
+        + "global_relative_alt,land,0,0,0,0,north,-80.54,0\n"
+        + "global_relative_alt,land,0,0,0,43.47,-80.54\n",
+        encoding="utf-8",
+    )
+    errors = []
+
+    # Run
+    with pytest.raises(advanced_csv_to_commands.MissionFileError):
+        list(advanced_csv_to_commands.generate_commands(mission_path, errors, 2))
+
+    # Test
+    assert sorted(error.line_number for error in errors) == [2, 5, 6, 7, 8]
+
+
+def test_commands_generated_lazily(tmp_path: pathlib.Path) -> None:
+    """
+    Commands of a batch are available before the rest of the file is read
+    """
+    # Setup
+    mission_path = tmp_path / "mission.csv"
+    mission_path.write_text(
+        "global_relative_alt,takeoff,0,0,0,0,0,0,50\n"
+        + "global_relative_alt,land,0,0,0,0,43.47,-80.54,0\n",
+        encoding="utf-8",
+    )
+    errors = []
+
+    # Run
+    commands = advanced_csv_to_commands.generate_commands(mission_path, errors, 1)
+    first_command = next(commands)
+
+    # Test
+    assert first_command.z == 50.0
+    assert len(list(commands)) == 1
+    assert len(errors) == 0
+
+
+@pytest.mark.parametrize("jump_target", ["four", "inf"])
+def test_invalid_number(tmp_path: pathlib.Path, jump_target: str) -> None:
+    """
+    A parameter that is not a finite number fails the file instead of raising
+    """
+    # Setup
+    mission_path = tmp_path / "mission.csv"
+    mission_path.write_text(
+        "global_relative_alt,do_jump,4,2,0,0,0,0,0\n"
+        + f"global_relative_alt,do_jump,{jump_target},2,0,0,0,0,0\n",
+        encoding="utf-8",
+    )
+
+    # Run
+    success, mission = advanced_csv_to_commands.csv_to_commands_list(mission_path)
+
+    # Test
+    assert not success
+    assert mission is None
+
+
+def test_no_commands_after_invalid_batch(tmp_path: pathlib.Path) -> None:
+    """
+    Commands stop at the first invalid batch, and the error is raised once the file is read
+    """
+    # Setup
+    mission_path = tmp_path / "mission.csv"
+    mission_path.write_text(
+        "global_relative_alt,takeoff,0,0,0,0,0,0,50\n"
+        + "global_relative_alt,waypoint,0,0.1,0,0,43.47,-80.54,10\n"
+        + "global_relative_alt,do_jump,4.5,2,0,0,0,0,0\n"
+        + "global_relative_alt,waypoint,0,0.1,0,0,43.48,-80.55,10\n"
+        + "global_relative_alt,do_jump,1,2,0,0,0,0,0\n",
+        encoding="utf-8",
+    )
+    errors = []
+    commands = advanced_csv_to_commands.generate_commands(mission_path, errors, 2)
+
+    # Run
+    first_batch = [next(commands), next(commands)]
+    with pytest.raises(advanced_csv_to_commands.MissionFileError):
+        next(commands)
+
+    # Test
+    assert [command.z for command in first_batch] == [50.0, 10.0]
+    assert [error.line_number for error in errors] == [3]
+
+
+def test_invalid_row_prevents_partial_upload(tmp_path: pathlib.Path) -> None:
+    """
+    A streamed upload of a file with an invalid row in the middle leaves the mission on the
+    drone untouched
+    """
+    # Setup
+    mission_path = tmp_path / "mission.csv"
+    mission_path.write_text(
+        "global_relative_alt,takeoff,0,0,0,0,0,0,50\n"
+        + "global_relative_alt,waypoint,0,0.1,0,0,43.47,-80.54,10\n"
+        + "global_relative_alt,waypoint,0,0.1,0,0,west,-80.55,10\n"
+        + "global_relative_alt,land,0,0,0,0,43.47,-80.54,0\n",
+        encoding="utf-8",
+    )
+    existing_mission = [generate_command.return_to_launch()]
+    drone = test_upload_commands.FakeVehicle(existing_mission)
+    errors = []
+
+    # Run
+    with pytest.raises(advanced_csv_to_commands.MissionFileError):
+        upload_commands.upload_commands(
+            drone,
+            advanced_csv_to_commands.generate_commands(mission_path, errors, 2),
+            test_upload_commands.UPLOAD_TIMEOUT,
+            download_first=False,
+        )
+
+    # Test
+    assert list(drone.commands) == existing_mission
+    assert drone.commands.upload_count == 0
+    assert [error.line_number for error in errors] == [3]
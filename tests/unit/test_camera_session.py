@@ -0,0 +1,214 @@
+"""
+Test sharing one open camera between readers.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from modules import camera_session
+
+
+# Test functions use test fixture signature names and access class privates,
+# and fixtures request the stub camera only to patch the camera factory
+# No enable
+# pylint: disable=protected-access,redefined-outer-name,too-few-public-methods,unused-argument
+
+
+# Long enough that a wait only ends by a frame or close
+WAIT_TIME = 5.0  # seconds
+
+# Time the stub camera takes to capture a frame
+FRAME_PERIOD = 0.001  # seconds
+
+
+class StubCamera:
+    """
+    Camera that captures small frames until it is told to fail.
+    """
+
+    def __init__(self) -> None:
+        self.capture_count = 0
+        self.is_failing = False
+
+    def get_image(self) -> "tuple[True, np.ndarray] | tuple[False, None]":
+        """
+        Waits for the next frame, as a real camera does.
+        """
+        time.sleep(FRAME_PERIOD)
+        self.capture_count += 1
+        if self.is_failing:
+            return False, None
+
+        return True, np.zeros((2, 2, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def camera(monkeypatch: pytest.MonkeyPatch) -> StubCamera:  # type: ignore
+    """
+    Stub camera returned by the camera factory.
+    """
+    stub_camera = StubCamera()
+
+    def create_camera(*_: object) -> "tuple[True, StubCamera]":
+        return True, stub_camera
+
+    monkeypatch.setattr(camera_session.camera_factory, "create_camera", create_camera)
+
+    yield stub_camera
+
+
+@pytest.fixture
+def session(camera: StubCamera) -> camera_session.CameraSession:  # type: ignore
+    """
+    Open session on the stub camera.
+    """
+    result, session = camera_session.CameraSession.create(0)
+    assert result
+    assert session is not None
+    assert session.user_count() == 1
+
+    yield session
+
+    # Closes every user left, closing a closed session does nothing
+    for _ in range(session.user_count()):
+        session.close()
+
+
+def test_create_camera_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    A camera that does not open fails the session.
+    """
+    # Setup
+    monkeypatch.setattr(camera_session.camera_factory, "create_camera", lambda *_: (False, None))
+
+    # Run
+    result, session = camera_session.CameraSession.create(0)
+
+    # Check
+    assert not result
+    assert session is None
+
+
+def test_take_frame(session: camera_session.CameraSession) -> None:
+    """
+    Frames captured in the background are taken with their capture time.
+    """
+    # Run
+    result, frame_and_time = session.take_frame(WAIT_TIME)
+
+    # Check
+    assert result
+    frame, capture_time = frame_and_time
+    assert frame.shape == (2, 2, 3)
+    assert capture_time <= time.monotonic()
+
+
+def test_capture_failure(camera: StubCamera, session: camera_session.CameraSession) -> None:
+    """
+    Failed captures are skipped without stopping the session.
+    """
+    # Setup
+    camera.is_failing = True
+    # Discards a frame captured before the failures started
+    time.sleep(2 * FRAME_PERIOD)
+    session.take_frame()
+    capture_count = camera.capture_count
+
+    # Run
+    result, _ = session.take_frame(10 * FRAME_PERIOD)
+    camera.is_failing = False
+    retry_result, _ = session.take_frame(WAIT_TIME)
+
+    # Check
+    assert not result
+    assert camera.capture_count > capture_count
+    assert retry_result
+
+
+def test_shared_close(camera: StubCamera, session: camera_session.CameraSession) -> None:
+    """
+    The camera keeps capturing until the last user closes the session.
+    """
+    # Setup
+    assert session.acquire()
+    assert session.acquire()
+    assert session.user_count() == 3
+
+    # Run
+    session.close()
+    session.close()
+    result, _ = session.take_frame(WAIT_TIME)
+
+    session.close()
+    capture_count = camera.capture_count
+    closed_result, _ = session.take_frame(WAIT_TIME)
+    time.sleep(10 * FRAME_PERIOD)
+
+    # Check
+    assert result
+    assert not closed_result
+    assert session.user_count() == 0
+    # The last close waits for the capture thread to end
+    assert camera.capture_count == capture_count
+
+
+def test_acquire_after_close(session: camera_session.CameraSession) -> None:
+    """
+    A session closed by its last user cannot be opened again.
+    """
+    # Setup
+    session.close()
+
+    # Run
+    result = session.acquire()
+    session.close()
+
+    # Check
+    assert not result
+    assert session.user_count() == 0
+
+
+def test_use_session(session: camera_session.CameraSession) -> None:
+    """
+    An open session is shared with one more user instead of opening the camera again.
+    """
+    # Run
+    result, shared_session = camera_session.use_session(session, 1)
+
+    # Check
+    assert result
+    assert shared_session is session
+    assert session.user_count() == 2
+
+
+def test_use_session_new(camera: StubCamera) -> None:
+    """
+    Without a session, a new one is opened on the device.
+    """
+    # Run
+    result, session = camera_session.use_session(None, 0)
+
+    # Check
+    assert result
+    assert session.user_count() == 1
+    assert session.take_frame(WAIT_TIME)[0]
+    assert camera.capture_count > 0
+
+    session.close()
+
+
+def test_use_session_closed(session: camera_session.CameraSession) -> None:
+    """
+    A closed session is not used.
+    """
+    # Setup
+    session.close()
+
+    # Run
+    result, shared_session = camera_session.use_session(session, 0)
+
+    # Check
+    assert not result
+    assert shared_session is None
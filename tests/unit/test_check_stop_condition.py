@@ -0,0 +1,223 @@
+"""
+Test the priority return to launch.
+"""
+
+import collections.abc
+import threading
+import time
+
+from modules import check_stop_condition
+from modules.common.modules.mavlink import dronekit
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name,too-few-public-methods
+
+
+DRONE_TIMEOUT = 1.0  # seconds
+SHORT_TIMEOUT = 0.05  # seconds
+
+MAXIMUM_FLIGHT_TIME = 10.0  # seconds
+
+
+class FakeMission:
+    """
+    Local copy of the mission, which already holds home.
+    """
+
+    def count(self) -> int:
+        """
+        Number of items including home.
+        """
+        return 1
+
+
+class FakeCommandSequence:
+    """
+    Records clearing and uploading the mission in the drone's events.
+    """
+
+    def __init__(self, events: list, is_upload_timed_out: bool) -> None:
+        self.__events = events
+        self.__is_upload_timed_out = is_upload_timed_out
+        self.commands: "list[dronekit.Command]" = []
+        # Cleared to hold the upload until it is set again
+        self.upload_allowed_event = threading.Event()
+        self.upload_allowed_event.set()
+
+    def clear(self) -> None:
+        """
+        Removes every command.
+        """
+        self.__events.append("clear")
+        self.commands.clear()
+
+    def add(self, command: dronekit.Command) -> None:
+        """
+        Appends a command.
+        """
+        self.commands.append(command)
+
+    def upload(self) -> None:
+        """
+        Sends the commands, as DroneKit does when the autopilot does not answer in time.
+        """
+        assert self.upload_allowed_event.wait(DRONE_TIMEOUT)
+        if self.__is_upload_timed_out:
+            raise dronekit.TimeoutError("Timed out uploading mission")
+
+        self.__events.append("upload")
+
+
+class FakeVehicle:
+    """
+    Vehicle that records mode changes and mission uploads in the order they happen.
+    """
+
+    def __init__(self, is_mode_confirmed: bool = True, is_upload_timed_out: bool = False) -> None:
+        self.events: list = []
+        self.is_mode_confirmed = is_mode_confirmed
+        self.commands = FakeCommandSequence(self.events, is_upload_timed_out)
+        self._wploader = FakeMission()
+        self.__mode = dronekit.VehicleMode("AUTO")
+        self.__listeners: "list[collections.abc.Callable]" = []
+
+    @property
+    def mode(self) -> dronekit.VehicleMode:
+        """
+        Mode reported by the autopilot.
+        """
+        return self.__mode
+
+    @mode.setter
+    def mode(self, mode: dronekit.VehicleMode) -> None:
+        self.events.append(("mode", mode.name))
+
+        if not self.is_mode_confirmed:
+            return
+
+        self.__mode = mode
+        for listener in list(self.__listeners):
+            listener(self, "mode", mode)
+
+    def add_attribute_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Adds a listener for the mode.
+        """
+        assert name == "mode"
+        self.__listeners.append(listener)
+
+    def remove_attribute_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Removes a listener for the mode.
+        """
+        assert name == "mode"
+        self.__listeners.remove(listener)
+
+    def listener_count(self) -> int:
+        """
+        Number of listeners still added.
+        """
+        return len(self.__listeners)
+
+
+def test_mode_set_before_upload() -> None:
+    """
+    The mode change is sent before the mission upload starts, and the upload replaces the
+    mission with RTL.
+    """
+    # Setup
+    drone = FakeVehicle()
+
+    # Run
+    result, time_and_upload = check_stop_condition.priority_return_to_launch(drone, DRONE_TIMEOUT)
+
+    # Check
+    assert result
+    time_to_rtl, upload_future = time_and_upload
+    assert time_to_rtl >= 0.0
+    assert upload_future.result(DRONE_TIMEOUT)
+    assert drone.events == [("mode", "RTL"), "clear", "upload"]
+    assert drone.mode.name == "RTL"
+    assert len(drone.commands.commands) == 1
+    assert drone.listener_count() == 0
+
+
+def test_upload_failure() -> None:
+    """
+    A failed upload is reported by its future, separately from the confirmed RTL mode.
+    """
+    # Setup
+    drone = FakeVehicle(is_upload_timed_out=True)
+
+    # Run
+    result, time_and_upload = check_stop_condition.priority_return_to_launch(drone, DRONE_TIMEOUT)
+
+    # Check
+    assert result
+    _, upload_future = time_and_upload
+    assert not upload_future.result(DRONE_TIMEOUT)
+    assert drone.events == [("mode", "RTL"), "clear"]
+    assert drone.mode.name == "RTL"
+
+
+def test_return_before_upload() -> None:
+    """
+    The call returns once RTL mode is confirmed, while the upload is still running.
+    """
+    # Setup
+    drone = FakeVehicle()
+    drone.commands.upload_allowed_event.clear()
+
+    # Run
+    result, time_and_upload = check_stop_condition.priority_return_to_launch(drone, DRONE_TIMEOUT)
+
+    # Check
+    assert result
+    _, upload_future = time_and_upload
+    assert not upload_future.done()
+
+    drone.commands.upload_allowed_event.set()
+    assert upload_future.result(DRONE_TIMEOUT)
+    assert drone.events == [("mode", "RTL"), "clear", "upload"]
+
+
+def test_mode_not_confirmed() -> None:
+    """
+    The drone not reporting RTL mode in time is a failure.
+    """
+    # Setup
+    drone = FakeVehicle(is_mode_confirmed=False)
+
+    # Run
+    result, time_and_upload = check_stop_condition.priority_return_to_launch(drone, SHORT_TIMEOUT)
+
+    # Check
+    assert not result
+    assert time_and_upload is None
+    assert drone.events[0] == ("mode", "RTL")
+    assert drone.listener_count() == 0
+
+
+def test_check_stop_condition() -> None:
+    """
+    Returns to launch only once the maximum flight time is exceeded.
+    """
+    # Setup
+    drone = FakeVehicle()
+    start_time = time.time()
+
+    # Run
+    is_early_stop = check_stop_condition.check_stop_condition(
+        start_time, start_time + 1.0, drone, MAXIMUM_FLIGHT_TIME, DRONE_TIMEOUT
+    )
+    is_late_stop = check_stop_condition.check_stop_condition(
+        start_time, start_time + MAXIMUM_FLIGHT_TIME, drone, MAXIMUM_FLIGHT_TIME, DRONE_TIMEOUT
+    )
+
+    # Check
+    assert not is_early_stop
+    assert is_late_stop
+    # The upload may still be running
+    assert drone.events[0] == ("mode", "RTL")
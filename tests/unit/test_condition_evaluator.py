@@ -0,0 +1,170 @@
+"""
+Test scheduling of condition evaluations.
+"""
+
+from modules import condition
+from modules import condition_evaluator
+
+
+class CountingCondition(condition.Condition):
+    """
+    Condition with a fixed value, period, priority and criticality that records its evaluations.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        value: bool,
+        evaluations: "list[CountingCondition]",
+        period: float = 0.0,
+        priority: int = 0,
+        is_critical: bool = False,
+    ) -> None:
+        """
+        evaluations: Shared list each evaluation is appended to.
+        """
+        self.value = value
+        self.evaluations = evaluations
+        self.period = period
+        self.priority_value = priority
+        self.is_critical_value = is_critical
+        self.message_count = 0
+
+    def evaluate_condition(self) -> bool:
+        """
+        Records the evaluation.
+        """
+        self.evaluations.append(self)
+        return self.value
+
+    def message(self) -> None:
+        """
+        Counts the messages.
+        """
+        self.message_count += 1
+
+    def evaluation_period(self) -> float:
+        return self.period
+
+    def priority(self) -> int:
+        return self.priority_value
+
+    def is_critical(self) -> bool:
+        return self.is_critical_value
+
+
+class TestEvaluateDueConditions:
+    """
+    Test evaluate_due_conditions().
+    """
+
+    def test_priority_order(self) -> None:
+        """
+        Higher priority conditions are evaluated first.
+        """
+        # Setup
+        evaluations = []
+        low = CountingCondition(False, evaluations, priority=1)
+        high = CountingCondition(False, evaluations, priority=2)
+        evaluator = condition_evaluator.ConditionEvaluator([low, high])
+
+        # Run
+        result = evaluator.evaluate_due_conditions()
+
+        # Check
+        assert not result
+        assert evaluations == [high, low]
+
+    def test_critical_short_circuit(self) -> None:
+        """
+        No condition is evaluated after a critical condition is met.
+        """
+        # Setup
+        evaluations = []
+        critical = CountingCondition(True, evaluations, priority=2, is_critical=True)
+        other = CountingCondition(True, evaluations, priority=1)
+        evaluator = condition_evaluator.ConditionEvaluator([other, critical])
+
+        # Run
+        result = evaluator.evaluate_due_conditions()
+
+        # Check
+        assert result
+        assert evaluations == [critical]
+        assert critical.message_count == 1
+        assert other.message_count == 0
+
+    def test_non_critical_continues(self) -> None:
+        """
+        Every due condition is evaluated if the met ones are not critical.
+        """
+        # Setup
+        evaluations = []
+        first = CountingCondition(True, evaluations, priority=2)
+        second = CountingCondition(True, evaluations, priority=1)
+        evaluator = condition_evaluator.ConditionEvaluator([first, second])
+
+        # Run
+        result = evaluator.evaluate_due_conditions()
+
+        # Check
+        assert result
+        assert evaluations == [first, second]
+        assert first.message_count == 1
+        assert second.message_count == 1
+
+    def test_period(self) -> None:
+        """
+        A condition is not evaluated again until its period has passed.
+        """
+        # Setup
+        evaluations = []
+        slow = CountingCondition(False, evaluations, period=3600.0)
+        fast = CountingCondition(False, evaluations)
+        evaluator = condition_evaluator.ConditionEvaluator([slow, fast])
+
+        # Run
+        evaluator.evaluate_due_conditions()
+        evaluator.evaluate_due_conditions()
+
+        # Check
+        assert evaluations == [slow, fast, fast]
+
+    def test_statistics(self) -> None:
+        """
+        Number of evaluations and mean time are reported per condition.
+        """
+        # Setup
+        evaluations = []
+        slow = CountingCondition(False, evaluations, period=3600.0)
+        fast = CountingCondition(False, evaluations)
+        evaluator = condition_evaluator.ConditionEvaluator([slow, fast])
+
+        # Run
+        for _ in range(3):
+            evaluator.evaluate_due_conditions()
+
+        statistics = evaluator.evaluation_statistics()
+
+        # Check
+        assert [(item, count) for item, count, _ in statistics] == [(slow, 1), (fast, 3)]
+        assert all(mean_time >= 0.0 for _, _, mean_time in statistics)
+
+
+def test_evaluate_all_conditions_ignores_schedule() -> None:
+    """
+    evaluate_all_conditions() evaluates every condition every time.
+    """
+    # Setup
+    evaluations = []
+    slow = CountingCondition(True, evaluations, period=3600.0, is_critical=True)
+    other = CountingCondition(False, evaluations)
+    evaluator = condition_evaluator.ConditionEvaluator([slow, other])
+
+    # Run
+    evaluator.evaluate_all_conditions()
+    result = evaluator.evaluate_all_conditions()
+
+    # Check
+    assert result
+    assert evaluations == [slow, other, slow, other]
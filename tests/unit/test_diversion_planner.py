@@ -0,0 +1,106 @@
+"""
+Test planning diversions with a reused planner.
+"""
+
+import pytest
+
+from modules import diversion_planner
+from modules import diversion_waypoints_from_vertices
+from modules.common.modules import location_global
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+def create_location(latitude: float, longitude: float) -> location_global.LocationGlobal:
+    """
+    Location that must be valid.
+    """
+    result, location = location_global.LocationGlobal.create(latitude, longitude)
+    assert result
+    assert location is not None
+
+    return location
+
+
+@pytest.fixture
+def restricted_vertices() -> list[location_global.LocationGlobal]:  # type: ignore
+    """
+    Square of about 100 m.
+    """
+    yield [
+        create_location(43.4330, -80.5780),
+        create_location(43.4330, -80.5770),
+        create_location(43.4340, -80.5770),
+        create_location(43.4340, -80.5780),
+    ]
+
+
+def test_create_without_areas() -> None:
+    """
+    Frame cannot be centred without any restricted area.
+    """
+    # Run
+    result, planner = diversion_planner.DiversionPlanner.create([])
+
+    # Check
+    assert not result
+    assert planner is None
+
+
+def test_replan_matches_single_plan(
+    restricted_vertices: list[location_global.LocationGlobal],
+) -> None:
+    """
+    Replanning from a moving start gives the same paths as planning each from scratch.
+    """
+    # Setup
+    result, planner = diversion_planner.DiversionPlanner.create([restricted_vertices])
+    assert result
+    assert planner is not None
+
+    rejoin_waypoint = create_location(43.4350, -80.5776)
+    starts = [create_location(43.4320, -80.5774 + 0.0001 * i) for i in range(5)]
+
+    for start in starts:
+        result, expected = diversion_waypoints_from_vertices.diversion_waypoints_from_vertices(
+            start, rejoin_waypoint, restricted_vertices
+        )
+        assert result
+        assert expected is not None
+
+        # Run
+        result, actual = planner.plan(start, rejoin_waypoint)
+
+        # Check
+        assert result
+        assert actual is not None
+        assert actual[0] == start
+        assert actual[-1] == rejoin_waypoint
+        assert len(actual) == len(expected)
+        for actual_waypoint, expected_waypoint in zip(actual, expected):
+            assert actual_waypoint.latitude == pytest.approx(expected_waypoint.latitude)
+            assert actual_waypoint.longitude == pytest.approx(expected_waypoint.longitude)
+
+
+def test_plan_into_restricted_area(
+    restricted_vertices: list[location_global.LocationGlobal],
+) -> None:
+    """
+    No path to a waypoint inside the restricted area.
+    """
+    # Setup
+    result, planner = diversion_planner.DiversionPlanner.create([restricted_vertices])
+    assert result
+    assert planner is not None
+
+    # Run
+    result, path = planner.plan(
+        create_location(43.4320, -80.5774), create_location(43.4335, -80.5775)
+    )
+
+    # Check
+    assert not result
+    assert path is None
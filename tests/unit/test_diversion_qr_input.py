@@ -0,0 +1,120 @@
+"""
+Test checking a shared camera session once for a diversion QR code.
+"""
+
+import numpy as np
+import pytest
+
+from modules import camera_session
+from modules import diversion_qr_input
+from tests.unit import test_camera_session
+
+
+# Test functions use test fixture signature names and access class privates,
+# and fixtures request the stub camera only to patch the camera factory
+# No enable
+# pylint: disable=protected-access,redefined-outer-name,too-few-public-methods,unused-argument
+
+
+QR_TEXT = "Avoid the area bounded by: Alpha; Beta; Gamma. Rejoin the route at Lima"
+
+
+class FakeScanner:
+    """
+    Scanner that finds the same text in every frame.
+    """
+
+    def get_qr_text(self, frame: np.ndarray) -> "tuple[True, str]":
+        """
+        Decoded text.
+        """
+        assert frame.shape == (2, 2, 3)
+        return True, QR_TEXT
+
+
+@pytest.fixture
+def camera(monkeypatch: pytest.MonkeyPatch) -> test_camera_session.StubCamera:  # type: ignore
+    """
+    Stub camera returned by the camera factory.
+    """
+    stub_camera = test_camera_session.StubCamera()
+    monkeypatch.setattr(
+        camera_session.camera_factory, "create_camera", lambda *_: (True, stub_camera)
+    )
+
+    yield stub_camera
+
+
+@pytest.fixture
+def session(camera: test_camera_session.StubCamera) -> camera_session.CameraSession:  # type: ignore
+    """
+    Open session on the stub camera, with a new frame to check.
+    """
+    result, session = camera_session.CameraSession.create(0)
+    assert result
+    assert session is not None
+
+    # Waits for a frame newer than any taken, so the check has something new to decode
+    assert session.take_frame(test_camera_session.WAIT_TIME)[0]
+    assert session.frame_buffer.wait_for_newer(
+        session.frame_buffer.frame_count, test_camera_session.WAIT_TIME
+    )[0]
+
+    yield session
+
+    session.close()
+
+
+@pytest.fixture
+def shown_frames(monkeypatch: pytest.MonkeyPatch) -> "list[np.ndarray]":  # type: ignore
+    """
+    Frames shown in the window, recorded instead of displayed.
+    """
+    frames = []
+    monkeypatch.setattr(diversion_qr_input.qr_scanner, "QrScanner", FakeScanner)
+    monkeypatch.setattr(diversion_qr_input.cv2, "imshow", lambda name, frame: frames.append(frame))
+    monkeypatch.setattr(diversion_qr_input.cv2, "waitKey", lambda delay: -1)
+
+    yield frames
+
+
+@pytest.mark.parametrize("show_preview", [True, False])
+def test_shared_session(
+    session: camera_session.CameraSession,
+    shown_frames: "list[np.ndarray]",
+    show_preview: bool,
+) -> None:
+    """
+    The frame checked is shown if requested, and the shared session stays open.
+    """
+    # Run
+    result, text = diversion_qr_input.diversion_qr_input(
+        0, session=session, show_preview=show_preview
+    )
+
+    # Check
+    assert result
+    assert text == QR_TEXT
+    assert len(shown_frames) == (1 if show_preview else 0)
+    assert session.user_count() == 1
+    assert session.take_frame(test_camera_session.WAIT_TIME)[0]
+
+
+def test_own_session(
+    camera: test_camera_session.StubCamera, shown_frames: "list[np.ndarray]"
+) -> None:
+    """
+    Without a session, the camera is opened for the call and closed again.
+    """
+    # Setup
+    capture_count = camera.capture_count
+
+    # Run
+    result, text = diversion_qr_input.diversion_qr_input(0)
+
+    # Check
+    assert result
+    assert text == QR_TEXT
+    # Headless unless a preview is requested
+    assert len(shown_frames) == 0
+    assert camera.capture_count > capture_count
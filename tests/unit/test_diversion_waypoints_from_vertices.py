@@ -2,10 +2,12 @@
 Test cases for creating waypoints to avoid area bounded by verticies and rejoining path
 """
 
+import numpy as np
 import pytest
 import shapely.geometry
 
 from modules import diversion_waypoints_from_vertices
+from modules import local_frame
 from modules.common.modules import location_global
 
 
@@ -187,3 +189,54 @@ def test_efficiency(restricted_vertices: list[location_global.LocationGlobal]) -
 
     for waypoint in path:
         assert waypoint.longitude >= 0.0
+
+
+def test_clearance() -> None:
+    """
+    Path keeps the clearance in metres from a small restricted area.
+    """
+    # Setup
+    clearance = 20.0
+
+    corners = [(43.4330, -80.5780), (43.4330, -80.5770), (43.4340, -80.5770), (43.4340, -80.5780)]
+    vertices = []
+    for latitude, longitude in corners:
+        result, vertex = location_global.LocationGlobal.create(latitude, longitude)
+        assert result
+        assert vertex is not None
+
+        vertices.append(vertex)
+
+    result, start = location_global.LocationGlobal.create(43.4320, -80.5774)
+    assert result
+    assert start is not None
+
+    result, end = location_global.LocationGlobal.create(43.4350, -80.5776)
+    assert result
+    assert end is not None
+
+    # Run
+    result, path = diversion_waypoints_from_vertices.diversion_waypoints_from_vertices(
+        start, end, vertices, clearance
+    )
+
+    # Check
+    assert result
+    assert path[0] == start
+    assert path[-1] == end
+
+    result, frame = local_frame.LocalFrame.create(43.4335, -80.5775)
+    assert result
+    assert frame is not None
+
+    east, north = frame.to_local(
+        [vertex.latitude for vertex in vertices], [vertex.longitude for vertex in vertices]
+    )
+    restricted_area = shapely.geometry.Polygon(np.column_stack([east, north]))
+
+    east, north = frame.to_local(
+        [waypoint.latitude for waypoint in path], [waypoint.longitude for waypoint in path]
+    )
+    detour = shapely.geometry.LineString(np.column_stack([east, north]))
+    # Small tolerance for the frame origin not being the one used for planning
+    assert detour.distance(restricted_area) >= clearance * 0.99
@@ -0,0 +1,197 @@
+"""
+Test showing camera frames from a rate-limited thread.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from modules import frame_preview
+from modules import latest_frame_buffer
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+MAXIMUM_RATE = 20.0  # frames per second
+CAMERA_PERIOD = 0.001  # seconds
+RUN_TIME = 0.5  # seconds
+
+# Long enough that a wait only ends by the event
+WAIT_TIME = 5.0  # seconds
+
+
+class FakeWindow:
+    """
+    Records the OpenCV window calls instead of opening a window.
+    """
+
+    def __init__(self) -> None:
+        self.shown_frames: "list[np.ndarray]" = []
+        self.destroyed_names: "list[str]" = []
+        self.thread_names: "set[str]" = set()
+        self.key = -1
+        self.shown_event = threading.Event()
+
+    def imshow(self, name: str, frame: np.ndarray) -> None:
+        """
+        Records the frame shown.
+        """
+        assert name == frame_preview.DEFAULT_WINDOW_NAME
+        self.thread_names.add(threading.current_thread().name)
+        self.shown_frames.append(frame)
+        self.shown_event.set()
+
+    def wait_key(self, delay: int) -> int:
+        """
+        Key pressed in the window.
+        """
+        assert delay == 1
+        return self.key
+
+    def destroy_window(self, name: str) -> None:
+        """
+        Records the window closed.
+        """
+        self.destroyed_names.append(name)
+
+
+@pytest.fixture
+def window(monkeypatch: pytest.MonkeyPatch) -> FakeWindow:  # type: ignore
+    """
+    Window calls recorded instead of made.
+    """
+    fake_window = FakeWindow()
+    monkeypatch.setattr(frame_preview.cv2, "imshow", fake_window.imshow)
+    monkeypatch.setattr(frame_preview.cv2, "waitKey", fake_window.wait_key)
+    monkeypatch.setattr(frame_preview.cv2, "destroyWindow", fake_window.destroy_window)
+
+    yield fake_window
+
+
+@pytest.fixture
+def frame_buffer() -> latest_frame_buffer.LatestFrameBuffer:  # type: ignore
+    """
+    Empty buffer.
+    """
+    result, buffer = latest_frame_buffer.LatestFrameBuffer.create()
+    assert result
+    assert buffer is not None
+
+    yield buffer
+
+
+def make_frame(value: int) -> np.ndarray:
+    """
+    Small image filled with value.
+    """
+    return np.full((2, 2, 3), value % 256, dtype=np.uint8)
+
+
+def test_create_invalid_rate(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    The maximum rate must be positive.
+    """
+    # Run
+    result, preview = frame_preview.FramePreview.create(frame_buffer, 0.0)
+
+    # Check
+    assert not result
+    assert preview is None
+
+
+def test_rate_limit(
+    window: FakeWindow, frame_buffer: latest_frame_buffer.LatestFrameBuffer
+) -> None:
+    """
+    Frames arriving faster than the maximum rate are skipped, the newest is shown,
+    and the frames are left in the buffer for the scanner.
+    """
+    # Setup
+    result, preview = frame_preview.FramePreview.create(frame_buffer, MAXIMUM_RATE)
+    assert result
+
+    # Run
+    start_time = time.monotonic()
+    frame_count = 0
+    while time.monotonic() - start_time < RUN_TIME:
+        frame_count += 1
+        frame_buffer.put(make_frame(frame_count))
+        time.sleep(CAMERA_PERIOD)
+
+    run_time = time.monotonic() - start_time
+    preview.close()
+
+    # Check
+    assert 0 < len(window.shown_frames) <= run_time * MAXIMUM_RATE + 1
+    assert len(window.shown_frames) < frame_count
+    # Shown from the preview thread only
+    assert threading.current_thread().name not in window.thread_names
+    assert frame_buffer.take()[0]
+
+
+def test_quit_key(window: FakeWindow, frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    Pressing the quit key in the window is reported.
+    """
+    # Setup
+    result, preview = frame_preview.FramePreview.create(frame_buffer)
+    assert result
+    assert not preview.is_quit_requested()
+    window.key = ord(frame_preview.QUIT_KEY)
+
+    # Run
+    frame_buffer.put(make_frame(1))
+    assert window.shown_event.wait(WAIT_TIME)
+    preview.close()
+
+    # Check
+    assert preview.is_quit_requested()
+
+
+def test_close(window: FakeWindow, frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    Closing stops showing frames and closes the window.
+    """
+    # Setup
+    result, preview = frame_preview.FramePreview.create(frame_buffer)
+    assert result
+    frame_buffer.put(make_frame(1))
+    assert window.shown_event.wait(WAIT_TIME)
+
+    # Run
+    start_time = time.monotonic()
+    preview.close()
+    close_time = time.monotonic() - start_time
+
+    shown_count = len(window.shown_frames)
+    frame_buffer.put(make_frame(2))
+    time.sleep(2 * frame_preview.FRAME_WAIT_TIME)
+
+    # Check
+    assert window.destroyed_names == [frame_preview.DEFAULT_WINDOW_NAME]
+    assert len(window.shown_frames) == shown_count
+    # Does not wait out the rest of the frame period
+    assert close_time < frame_preview.FRAME_WAIT_TIME + 1.0 / frame_preview.DEFAULT_MAXIMUM_RATE
+
+
+def test_close_without_frames(
+    window: FakeWindow, frame_buffer: latest_frame_buffer.LatestFrameBuffer
+) -> None:
+    """
+    A window that was never shown is not closed.
+    """
+    # Setup
+    result, preview = frame_preview.FramePreview.create(frame_buffer)
+    assert result
+
+    # Run
+    preview.close()
+
+    # Check
+    assert len(window.shown_frames) == 0
+    assert len(window.destroyed_names) == 0
@@ -142,6 +142,99 @@ class TestGenerateSearchPath:
         assert waypoints is None
 
 
+class TestGenerateSearchPathRings:
+    """
+    Test suite for generate_search_path_rings.
+    """
+
+    def test_matches_search_paths(self) -> None:
+        """
+        Array-backed rings hold the same waypoints as the list of list of waypoints.
+        """
+        result, center = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+            43.43, -80.57, 30.0
+        )
+        assert result
+        assert center is not None
+
+        search_radius = 100.0
+        search_area_dimensions = (12.0, 7.0)
+
+        result, rings = generate_hotspot_search_path.generate_search_path_rings(
+            center, search_radius, search_area_dimensions
+        )
+        assert result
+        assert rings is not None
+
+        result, waypoints = generate_hotspot_search_path.generate_search_paths(
+            center, search_radius, search_area_dimensions
+        )
+        assert result
+        assert waypoints is not None
+
+        assert rings.ring_count() == len(waypoints)
+        for i, circle in enumerate(waypoints):
+            latitudes, longitudes, altitudes = rings.ring(i)
+            assert latitudes.tolist() == [waypoint.latitude for waypoint in circle]
+            assert longitudes.tolist() == [waypoint.longitude for waypoint in circle]
+            assert altitudes.tolist() == [waypoint.relative_altitude for waypoint in circle]
+
+
+class TestGenerateSearchPathLazy:
+    """
+    Test suite for generate_search_path_lazy.
+    """
+
+    def test_matches_search_paths(self) -> None:
+        """
+        Streamed rings are the same as the eagerly generated rings.
+        """
+        result, center = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+            43.43, -80.57, 30.0
+        )
+        assert result
+        assert center is not None
+
+        search_radius = 100.0
+        search_area_dimensions = (12.0, 7.0)
+
+        result, rings = generate_hotspot_search_path.generate_search_path_lazy(
+            center, search_radius, search_area_dimensions
+        )
+        assert result
+        assert rings is not None
+
+        result, expected_rings = generate_hotspot_search_path.generate_search_paths(
+            center, search_radius, search_area_dimensions
+        )
+        assert result
+        assert expected_rings is not None
+
+        actual_rings = list(rings)
+        assert len(actual_rings) == len(expected_rings)
+        for actual_ring, expected_ring in zip(actual_rings, expected_rings):
+            assert len(actual_ring) == len(expected_ring)
+            for actual, expected in zip(actual_ring, expected_ring):
+                assert verify_close_enough(actual, expected, 1e-9)
+
+    def test_invalid_dimensions(self) -> None:
+        """
+        Invalid input is rejected before any ring is generated.
+        """
+        result, center = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+            0.0, 0.0, 100.0
+        )
+        assert result
+        assert center is not None
+
+        result, rings = generate_hotspot_search_path.generate_search_path_lazy(
+            center, 10.0, (-3.0, 3.0)
+        )
+
+        assert result is False
+        assert rings is None
+
+
 def generate_waypoints(
     number_of_circles: int, points_per_circle: list[int]
 ) -> list[list[position_global_relative_altitude.PositionGlobalRelativeAltitude]]:
@@ -0,0 +1,153 @@
+"""
+Test forecasting lap durations.
+"""
+
+import numpy as np
+import pytest
+
+from modules import lap_time_estimator
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+CAPACITY = 3
+SEGMENT_CAPACITY = 4
+SMOOTHING_FACTOR = 0.5
+SAFETY_FACTOR = 2.0
+
+
+@pytest.fixture
+def estimator() -> lap_time_estimator.LapTimeEstimator:  # type: ignore
+    """
+    Estimator that keeps 3 laps.
+    """
+    result, lap_estimator = lap_time_estimator.LapTimeEstimator.create(
+        CAPACITY, SEGMENT_CAPACITY, SMOOTHING_FACTOR, SAFETY_FACTOR
+    )
+    assert result
+    assert lap_estimator is not None
+
+    yield lap_estimator
+
+
+def test_create_invalid_smoothing_factor() -> None:
+    """
+    Smoothing factor must be in (0, 1].
+    """
+    # Run
+    result, lap_estimator = lap_time_estimator.LapTimeEstimator.create(
+        CAPACITY, SEGMENT_CAPACITY, 0.0, SAFETY_FACTOR
+    )
+
+    # Check
+    assert not result
+    assert lap_estimator is None
+
+
+def test_no_laps(estimator: lap_time_estimator.LapTimeEstimator) -> None:
+    """
+    Nothing to forecast from.
+    """
+    # Check
+    assert estimator.lap_count() == 0
+    assert estimator.forecast() == 0.0
+    assert estimator.percentile(50.0) == 0.0
+    assert len(estimator.lap_durations()) == 0
+
+
+def test_forecast(estimator: lap_time_estimator.LapTimeEstimator) -> None:
+    """
+    Forecast is the weighted mean plus the safety margin.
+    """
+    # Run
+    estimator.complete_lap(100.0)
+    estimator.complete_lap(120.0)
+
+    # Check
+    # Mean moves halfway to the new lap, variance is (1 - 0.5) * (0 + 20 * 10)
+    assert estimator.mean() == pytest.approx(110.0)
+    assert estimator.standard_deviation() == pytest.approx(10.0)
+    assert estimator.forecast() == pytest.approx(130.0)
+
+
+def test_constant_laps(estimator: lap_time_estimator.LapTimeEstimator) -> None:
+    """
+    Identical laps forecast exactly that duration.
+    """
+    # Run
+    for _ in range(10):
+        estimator.complete_lap(60.0)
+
+    # Check
+    assert estimator.forecast() == pytest.approx(60.0)
+    assert estimator.percentile(90.0) == pytest.approx(60.0)
+
+
+def test_ring_buffer(estimator: lap_time_estimator.LapTimeEstimator) -> None:
+    """
+    Only the most recent laps are kept, oldest first.
+    """
+    # Run
+    for duration in [10.0, 20.0, 30.0, 40.0, 50.0]:
+        estimator.complete_lap(duration)
+
+    # Check
+    assert estimator.lap_count() == 5
+    np.testing.assert_array_equal(estimator.lap_durations(), [30.0, 40.0, 50.0])
+    assert estimator.percentile(50.0) == pytest.approx(40.0)
+
+
+def test_segments(estimator: lap_time_estimator.LapTimeEstimator) -> None:
+    """
+    Lap duration is the sum of its segments, which are kept per lap.
+    """
+    # Setup
+    estimator.complete_lap(40.0)
+
+    # Run
+    assert estimator.add_segment(10.0)
+    assert estimator.add_segment(15.0)
+    remaining_forecast = estimator.remaining_forecast()
+    estimator.complete_lap()
+
+    # Check
+    assert remaining_forecast == pytest.approx(15.0)
+    np.testing.assert_array_equal(estimator.lap_durations(), [40.0, 25.0])
+    np.testing.assert_array_equal(estimator.segment_durations(0), [10.0, 15.0])
+    assert len(estimator.segment_durations(1)) == 0
+
+
+def test_segments_full_buffer(estimator: lap_time_estimator.LapTimeEstimator) -> None:
+    """
+    Segments of the lap in progress do not overwrite the oldest kept lap.
+    """
+    # Setup
+    for duration in [1.0, 2.0, 3.0]:
+        assert estimator.add_segment(duration)
+        estimator.complete_lap()
+
+    # Run
+    assert estimator.add_segment(9.0)
+
+    # Check
+    np.testing.assert_array_equal(estimator.lap_durations(), [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(estimator.segment_durations(CAPACITY - 1), [1.0])
+    np.testing.assert_array_equal(estimator.segment_durations(0), [3.0])
+
+
+def test_too_many_segments(estimator: lap_time_estimator.LapTimeEstimator) -> None:
+    """
+    Segments beyond the capacity are rejected.
+    """
+    # Setup
+    for _ in range(SEGMENT_CAPACITY):
+        assert estimator.add_segment(1.0)
+
+    # Run
+    result = estimator.add_segment(1.0)
+
+    # Check
+    assert not result
@@ -0,0 +1,179 @@
+"""
+Test keeping only the newest camera frame.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from modules import latest_frame_buffer
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+# Long enough that a wait only ends by a frame or close
+WAIT_TIME = 5.0  # seconds
+
+
+@pytest.fixture
+def frame_buffer() -> latest_frame_buffer.LatestFrameBuffer:  # type: ignore
+    """
+    Empty buffer.
+    """
+    result, buffer = latest_frame_buffer.LatestFrameBuffer.create()
+    assert result
+    assert buffer is not None
+
+    yield buffer
+
+
+def make_frame(value: int) -> np.ndarray:
+    """
+    Small image filled with value.
+    """
+    return np.full((2, 2, 3), value, dtype=np.uint8)
+
+
+def test_take_empty(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    Nothing to take before a frame is put.
+    """
+    # Run
+    result, frame_and_time = frame_buffer.take()
+
+    # Check
+    assert not result
+    assert frame_and_time is None
+
+
+def test_take(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    A frame is taken once, with its capture time.
+    """
+    # Setup
+    frame_buffer.put(make_frame(1), 5.0)
+
+    # Run
+    result_first, frame_and_time = frame_buffer.take()
+    result_second, _ = frame_buffer.take()
+
+    # Check
+    assert result_first
+    frame, capture_time = frame_and_time
+    assert frame[0, 0, 0] == 1
+    assert capture_time == 5.0
+    assert not result_second
+    assert frame_buffer.dropped_count == 0
+
+
+def test_newest_frame_wins(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    Frames that were not taken are replaced and counted as dropped.
+    """
+    # Setup
+    for value in range(3):
+        frame_buffer.put(make_frame(value), float(value))
+
+    # Run
+    result, frame_and_time = frame_buffer.take()
+
+    # Check
+    assert result
+    frame, capture_time = frame_and_time
+    assert frame[0, 0, 0] == 2
+    assert capture_time == 2.0
+    assert frame_buffer.frame_count == 3
+    assert frame_buffer.dropped_count == 2
+
+
+def test_latest_after_take(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    The newest frame is still available for display after it is taken.
+    """
+    # Setup
+    result_empty, _ = frame_buffer.latest()
+    frame_buffer.put(make_frame(7))
+    frame_buffer.take()
+
+    # Run
+    result, frame = frame_buffer.latest()
+
+    # Check
+    assert not result_empty
+    assert result
+    assert frame[0, 0, 0] == 7
+
+
+def test_take_waits_for_frame(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    take() blocks until a frame is put from another thread.
+    """
+    # Setup
+    timer = threading.Timer(0.05, frame_buffer.put, args=(make_frame(3),))
+    timer.start()
+
+    # Run
+    result, frame_and_time = frame_buffer.take(WAIT_TIME)
+    timer.join()
+
+    # Check
+    assert result
+    assert frame_and_time[0][0, 0, 0] == 3
+
+
+def test_take_timeout(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    take() fails once the timeout passes without a frame.
+    """
+    # Run
+    start_time = time.monotonic()
+    result, _ = frame_buffer.take(0.05)
+    elapsed_time = time.monotonic() - start_time
+
+    # Check
+    assert not result
+    assert elapsed_time >= 0.05
+
+
+def test_close_wakes_waiters(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    Closing the buffer ends waits immediately.
+    """
+    # Setup
+    timer = threading.Timer(0.05, frame_buffer.close)
+    timer.start()
+
+    # Run
+    start_time = time.monotonic()
+    result, _ = frame_buffer.take(WAIT_TIME)
+    elapsed_time = time.monotonic() - start_time
+    timer.join()
+
+    # Check
+    assert not result
+    assert elapsed_time < WAIT_TIME
+
+
+def test_wait_for_newer(frame_buffer: latest_frame_buffer.LatestFrameBuffer) -> None:
+    """
+    wait_for_newer() returns frames newer than the given number, taken or not.
+    """
+    # Setup
+    frame_buffer.put(make_frame(4))
+    frame_buffer.take()
+
+    # Run
+    result_new, frame_and_number = frame_buffer.wait_for_newer(0, WAIT_TIME)
+    result_seen, _ = frame_buffer.wait_for_newer(1, 0.0)
+
+    # Check
+    assert result_new
+    frame, frame_number = frame_and_number
+    assert frame[0, 0, 0] == 4
+    assert frame_number == 1
+    assert not result_seen
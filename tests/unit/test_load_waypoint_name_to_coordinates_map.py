@@ -2,8 +2,11 @@
 Testing with real files.
 """
 
+import os
 import pathlib
+import struct
 
+import numpy as np
 import pytest
 
 from modules import load_waypoint_name_to_coordinates_map
@@ -41,7 +44,7 @@ def verify_name_to_coordinate_map(
 
 def test_normal_file() -> None:
     """
-    Normal CSV file.
+    Normal CSV file, parsed without a cache.
     """
     # Setup
     normal_csv_file_path = pathlib.Path("tests", "test_csv", "test_normal_csv.csv")
@@ -172,3 +175,265 @@ def test_nonexistent_file() -> None:
     # Test
     assert not result
     assert actual is None
+
+
+def test_waypoint_table() -> None:
+    """
+    Normal CSV file loaded as columns.
+    """
+    # Setup
+    normal_csv_file_path = pathlib.Path("tests", "test_csv", "test_normal_csv_with_altitude.csv")
+
+    # Run
+    result, table = load_waypoint_name_to_coordinates_map.load_waypoint_table(
+        normal_csv_file_path, has_altitude=True
+    )
+
+    # Test
+    assert result
+    assert table is not None
+    assert table.names == ["WARG", "University of Waterloo Station for 301 ION"]
+    np.testing.assert_allclose(
+        table.coordinates,
+        [
+            [43.47323264522664, -80.54011639872981, 10.0],
+            [43.4735247614021, -80.54144667502672, 10.0],
+        ],
+    )
+    assert table.name_to_row["University of Waterloo Station for 301 ION"] == 1
+
+
+def test_waypoint_table_without_header(tmp_path: pathlib.Path) -> None:
+    """
+    The header is optional, and blank lines are skipped.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text("Alpha,43.4,-80.5\n\nBravo,43.5,-80.6\n", encoding="utf-8")
+
+    # Run
+    result, table = load_waypoint_name_to_coordinates_map.load_waypoint_table(file_path)
+
+    # Test
+    assert result
+    assert table is not None
+    assert table.names == ["Alpha", "Bravo"]
+    assert table.coordinates.shape == (2, 2)
+
+
+def test_waypoint_table_header_only(tmp_path: pathlib.Path) -> None:
+    """
+    A file with only the header has no waypoints.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text("name,latitude,longitude\n", encoding="utf-8")
+
+    # Run
+    result, table = load_waypoint_name_to_coordinates_map.load_waypoint_table(file_path)
+
+    # Test
+    assert not result
+    assert table is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Header must match exactly, so a partial header is a malformed row
+        "name,latitude\nAlpha,43.4,-80.5\n",
+        # Too many columns
+        "Alpha,43.4,-80.5,10.0\n",
+        # Not a number
+        "Alpha,43.4,west\n",
+        # Latitude out of range
+        "Alpha,93.4,-80.5\n",
+        # Not finite
+        "Alpha,nan,-80.5\n",
+    ],
+)
+def test_waypoint_table_invalid(tmp_path: pathlib.Path, text: str) -> None:
+    """
+    Any invalid row fails the whole file.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text("Bravo,43.5,-80.6\n" + text, encoding="utf-8")
+
+    # Run
+    result, table = load_waypoint_name_to_coordinates_map.load_waypoint_table(file_path)
+
+    # Test
+    assert not result
+    assert table is None
+
+
+def test_waypoint_cache_created(tmp_path: pathlib.Path) -> None:
+    """
+    The first load writes the cache, and the next load maps it without parsing the CSV file.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text(
+        "name,latitude,longitude,altitude\nAlpha,43.4,-80.5,10.0\nBravo,43.5,-80.6,20.0\n"
+        "Alpha,43.6,-80.7,30.0\n",
+        encoding="utf-8",
+    )
+    cache_directory_path = tmp_path / "cache"
+    cache_file_path = load_waypoint_name_to_coordinates_map.waypoint_cache_path(
+        file_path, cache_directory_path
+    )
+
+    # Run
+    first_result, first_table = load_waypoint_name_to_coordinates_map.load_waypoint_table_cached(
+        file_path, cache_directory_path, has_altitude=True
+    )
+    is_cache_written = cache_file_path.exists()
+    second_result, second_table = load_waypoint_name_to_coordinates_map.load_waypoint_table_cached(
+        file_path, cache_directory_path, has_altitude=True
+    )
+
+    # Test
+    assert first_result
+    assert is_cache_written
+    assert list(cache_directory_path.iterdir()) == [cache_file_path]
+    assert second_result
+    assert second_table is not None
+    assert second_table.names == ["Alpha", "Bravo", "Alpha"]
+    np.testing.assert_array_equal(second_table.coordinates, first_table.coordinates)
+    # Viewed in place in the mapped file
+    assert not second_table.coordinates.flags.writeable
+    assert not second_table.coordinates.flags.owndata
+
+
+def test_waypoint_cache_stale(tmp_path: pathlib.Path) -> None:
+    """
+    A changed CSV file is parsed again and the cache rewritten.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text("Alpha,43.4,-80.5\n", encoding="utf-8")
+    load_waypoint_name_to_coordinates_map.load_waypoint_table_cached(file_path, tmp_path)
+    file_path.write_text("Alpha,43.4,-80.5\nBravo,43.5,-80.6\n", encoding="utf-8")
+
+    # Run
+    result, table = load_waypoint_name_to_coordinates_map.load_waypoint_table_cached(
+        file_path, tmp_path
+    )
+    cache_result, cache_table = load_waypoint_name_to_coordinates_map.load_waypoint_table_cache(
+        load_waypoint_name_to_coordinates_map.waypoint_cache_path(file_path, tmp_path),
+        file_path,
+        2,
+    )
+
+    # Test
+    assert result
+    assert table.names == ["Alpha", "Bravo"]
+    assert cache_result
+    assert cache_table.names == ["Alpha", "Bravo"]
+
+
+def test_waypoint_cache_touched(tmp_path: pathlib.Path) -> None:
+    """
+    A CSV file with a new modification time but the same content still uses the cache,
+    which then records the new modification time.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text("Alpha,43.4,-80.5\n", encoding="utf-8")
+    load_waypoint_name_to_coordinates_map.load_waypoint_table_cached(file_path, tmp_path)
+    status = file_path.stat()
+    touched_mtime_ns = status.st_mtime_ns + 1_000_000_000
+    os.utime(file_path, ns=(status.st_atime_ns, touched_mtime_ns))
+    cache_file_path = load_waypoint_name_to_coordinates_map.waypoint_cache_path(file_path, tmp_path)
+
+    # Run
+    result, table = load_waypoint_name_to_coordinates_map.load_waypoint_table_cache(
+        cache_file_path, file_path, 2
+    )
+
+    # Test
+    assert result
+    assert table.names == ["Alpha"]
+    (cached_mtime_ns,) = struct.unpack_from(
+        load_waypoint_name_to_coordinates_map.CACHE_MODIFICATION_TIME_FORMAT,
+        cache_file_path.read_bytes(),
+        load_waypoint_name_to_coordinates_map.CACHE_MODIFICATION_TIME_OFFSET,
+    )
+    assert cached_mtime_ns == touched_mtime_ns
+
+
+@pytest.mark.parametrize("cache_bytes", [b"", b"WPC1", b"\x00" * 256])
+def test_waypoint_cache_corrupt(tmp_path: pathlib.Path, cache_bytes: bytes) -> None:
+    """
+    A corrupt cache falls back to the CSV file.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text("Alpha,43.4,-80.5\n", encoding="utf-8")
+    load_waypoint_name_to_coordinates_map.waypoint_cache_path(file_path, tmp_path).write_bytes(
+        cache_bytes
+    )
+
+    # Run
+    result, table = load_waypoint_name_to_coordinates_map.load_waypoint_table_cached(
+        file_path, tmp_path
+    )
+
+    # Test
+    assert result
+    assert table.names == ["Alpha"]
+    np.testing.assert_allclose(table.coordinates, [[43.4, -80.5]])
+
+
+def test_waypoint_cache_opt_in(tmp_path: pathlib.Path) -> None:
+    """
+    The dictionary loaders only write a cache when given a cache directory.
+    """
+    # Setup
+    file_path = tmp_path / "waypoints.csv"
+    file_path.write_text("Alpha,43.4,-80.5\n", encoding="utf-8")
+    cache_directory_path = tmp_path / "cache"
+
+    # Run
+    result, _ = load_waypoint_name_to_coordinates_map.load_waypoint_name_to_coordinates_map(
+        file_path
+    )
+    is_cache_written = cache_directory_path.exists()
+    cached_result, actual = (
+        load_waypoint_name_to_coordinates_map.load_waypoint_name_to_coordinates_map(
+            file_path, cache_directory_path
+        )
+    )
+
+    # Test
+    assert result
+    assert not is_cache_written
+    assert sorted(tmp_path.iterdir()) == [cache_directory_path, file_path]
+    assert cached_result
+    assert actual["Alpha"].latitude == pytest.approx(43.4)
+    assert load_waypoint_name_to_coordinates_map.waypoint_cache_path(
+        file_path, cache_directory_path
+    ).exists()
+
+
+def test_waypoint_cache_same_name(tmp_path: pathlib.Path) -> None:
+    """
+    CSV files with the same name in different directories do not share a cache file.
+    """
+    # Setup
+    first_file_path = tmp_path / "first" / "waypoints.csv"
+    second_file_path = tmp_path / "second" / "waypoints.csv"
+
+    # Run
+    first_cache_file_path = load_waypoint_name_to_coordinates_map.waypoint_cache_path(
+        first_file_path, tmp_path
+    )
+    second_cache_file_path = load_waypoint_name_to_coordinates_map.waypoint_cache_path(
+        second_file_path, tmp_path
+    )
+
+    # Test
+    assert first_cache_file_path != second_cache_file_path
+    assert first_cache_file_path.parent == tmp_path
+    assert first_cache_file_path.name.startswith("waypoints-")
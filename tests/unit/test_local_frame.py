@@ -0,0 +1,86 @@
+"""
+Test conversion between latitude and longitude and the local metre frame.
+"""
+
+import numpy as np
+import pytest
+
+from modules import local_frame
+
+
+def test_create_at_pole() -> None:
+    """
+    Frame cannot be placed at a pole.
+    """
+    # Run
+    result, frame = local_frame.LocalFrame.create(90.0, 0.0)
+
+    # Check
+    assert not result
+    assert frame is None
+
+
+def test_create_around_empty() -> None:
+    """
+    Frame needs at least one coordinate.
+    """
+    # Run
+    result, frame = local_frame.LocalFrame.create_around(np.empty(0), np.empty(0))
+
+    # Check
+    assert not result
+    assert frame is None
+
+
+def test_create_around() -> None:
+    """
+    Origin is the centre of the bounding box.
+    """
+    # Run
+    result, frame = local_frame.LocalFrame.create_around(
+        np.array([43.0, 43.2, 43.1]), np.array([-80.0, -80.4, -80.1])
+    )
+
+    # Check
+    assert result
+    assert frame is not None
+    assert frame.origin_latitude == pytest.approx(43.1)
+    assert frame.origin_longitude == pytest.approx(-80.2)
+
+
+def test_to_local() -> None:
+    """
+    Offsets match the WGS 84 distances near the origin.
+    """
+    # Setup
+    result, frame = local_frame.LocalFrame.create(43.0, -80.0)
+    assert result
+    assert frame is not None
+
+    # Run
+    east, north = frame.to_local(np.array([43.001, 43.0]), np.array([-80.0, -80.002]))
+
+    # Check
+    np.testing.assert_allclose(east, [0.0, -163.08], atol=0.01)
+    np.testing.assert_allclose(north, [111.09, 0.0], atol=0.01)
+
+
+def test_round_trip() -> None:
+    """
+    Converting to the frame and back gives the original coordinates.
+    """
+    # Setup
+    result, frame = local_frame.LocalFrame.create(43.43, -80.57)
+    assert result
+    assert frame is not None
+
+    latitudes = np.array([43.42, 43.43, 43.45])
+    longitudes = np.array([-80.6, -80.57, -80.55])
+
+    # Run
+    east, north = frame.to_local(latitudes, longitudes)
+    actual_latitudes, actual_longitudes = frame.to_global(east, north)
+
+    # Check
+    np.testing.assert_allclose(actual_latitudes, latitudes, rtol=0.0, atol=1e-12)
+    np.testing.assert_allclose(actual_longitudes, longitudes, rtol=0.0, atol=1e-12)
@@ -0,0 +1,236 @@
+"""
+Test the local mission mirror and when it downloads the mission again.
+"""
+
+import collections.abc
+
+import pytest
+
+from modules import generate_command
+from modules import mission_mirror
+from modules.common.modules.mavlink import dronekit
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name,too-few-public-methods
+
+
+DOWNLOAD_TIMEOUT = 1.0  # seconds
+
+
+class FakeMessage:
+    """
+    MAVLink message with the given fields.
+    """
+
+    def __init__(self, **fields: int) -> None:
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+class FakeCommandSequence:
+    """
+    Mission items after home, counting downloads.
+    """
+
+    def __init__(self, drone: "FakeDrone", commands: "list[dronekit.Command]") -> None:
+        self.__drone = drone
+        self.commands = commands
+        self.next = 0
+        self.download_count = 0
+        self.is_download_timed_out = False
+
+    def __iter__(self) -> collections.abc.Iterator[dronekit.Command]:
+        return iter(self.commands)
+
+    def download(self) -> None:
+        """
+        Starts a download, which the autopilot answers with MISSION_COUNT.
+        """
+        self.download_count += 1
+        self.__drone.send("MISSION_COUNT", FakeMessage(count=len(self.commands) + 1))
+
+    def wait_ready(self, timeout: float, raise_exception: bool) -> bool:
+        """
+        Whether the download finished in time.
+        """
+        assert timeout > 0.0
+        assert not raise_exception
+        return not self.is_download_timed_out
+
+
+class FakeDrone:
+    """
+    Vehicle that records its message listeners so messages can be sent to them.
+    """
+
+    def __init__(self, commands: "list[dronekit.Command]") -> None:
+        self.commands = FakeCommandSequence(self, commands)
+        self.listeners: "dict[str, list]" = {}
+
+    def add_message_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Adds a listener for a message name.
+        """
+        self.listeners.setdefault(name, []).append(listener)
+
+    def remove_message_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Removes a listener for a message name.
+        """
+        self.listeners[name].remove(listener)
+
+    def send(self, name: str, message: FakeMessage) -> None:
+        """
+        Calls every listener of the message name, as the DroneKit message thread does.
+        """
+        for listener in list(self.listeners.get(name, [])):
+            listener(self, name, message)
+
+
+@pytest.fixture
+def drone() -> FakeDrone:  # type: ignore
+    """
+    Drone with a takeoff, a waypoint and a return to launch.
+    """
+    yield FakeDrone(
+        [
+            generate_command.takeoff(40.0),
+            generate_command.waypoint(0.0, 10.0, 43.47, -80.54, 40.0),
+            generate_command.return_to_launch(),
+        ]
+    )
+
+
+@pytest.fixture
+def mirror(drone: FakeDrone) -> mission_mirror.MissionMirror:  # type: ignore
+    """
+    Mirror that has downloaded the mission once.
+    """
+    result, mirror = mission_mirror.MissionMirror.create(drone)
+    assert result
+    assert mirror is not None
+
+    result, _ = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+    assert result
+    assert drone.commands.download_count == 1
+
+    yield mirror
+
+
+def test_lookup_without_download(drone: FakeDrone, mirror: mission_mirror.MissionMirror) -> None:
+    """
+    The current waypoint follows MISSION_CURRENT without downloading the mission again,
+    including when the reported total matches the mirror.
+    """
+    # Run
+    # The total excludes home, as MAVLink defines it
+    for _ in range(3):
+        drone.send("MISSION_CURRENT", FakeMessage(seq=1, total=3))
+        result, info = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+
+    # Check
+    assert result
+    assert info == (1, (drone.commands.commands[1].command, 43.47, -80.54))
+    assert drone.commands.download_count == 1
+
+
+@pytest.mark.parametrize("total", [0, mission_mirror.UNKNOWN_MISSION_TOTAL])
+def test_mission_current_unknown_total(
+    drone: FakeDrone, mirror: mission_mirror.MissionMirror, total: int
+) -> None:
+    """
+    A total the autopilot does not report does not invalidate the mirror.
+    """
+    # Run
+    drone.send("MISSION_CURRENT", FakeMessage(seq=2, total=total))
+    result, info = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+
+    # Check
+    assert result
+    assert info[0] == 2
+    assert drone.commands.download_count == 1
+
+
+def test_mission_current_new_total(drone: FakeDrone, mirror: mission_mirror.MissionMirror) -> None:
+    """
+    A different number of items in MISSION_CURRENT downloads the mission again.
+    """
+    # Setup
+    drone.commands.commands = drone.commands.commands[:2]
+
+    # Run
+    drone.send("MISSION_CURRENT", FakeMessage(seq=2, total=2))
+    result, info = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+
+    # Check
+    assert result
+    assert drone.commands.download_count == 2
+    # Past the end of the new mission
+    assert info == (2, None)
+
+
+def test_mission_count(drone: FakeDrone, mirror: mission_mirror.MissionMirror) -> None:
+    """
+    A download by someone else may mean a new mission, so the mirror downloads it too.
+    The mirror's own download does not invalidate it.
+    """
+    # Run
+    drone.send("MISSION_COUNT", FakeMessage(count=4))
+    result, _ = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+    assert result
+
+    result, _ = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+
+    # Check
+    assert result
+    assert drone.commands.download_count == 2
+
+
+def test_mission_ack(drone: FakeDrone, mirror: mission_mirror.MissionMirror) -> None:
+    """
+    An acknowledged upload downloads the mission again.
+    """
+    # Setup
+    drone.commands.commands = drone.commands.commands[1:]
+
+    # Run
+    drone.send("MISSION_ACK", FakeMessage(type=0))
+    result, info = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+
+    # Check
+    assert result
+    assert drone.commands.download_count == 2
+    assert info == (0, (drone.commands.commands[0].command, 43.47, -80.54))
+
+
+def test_download_timeout(drone: FakeDrone, mirror: mission_mirror.MissionMirror) -> None:
+    """
+    A failed download leaves the mirror stale, so the next lookup tries again.
+    """
+    # Setup
+    drone.send("MISSION_ACK", FakeMessage(type=0))
+    drone.commands.is_download_timed_out = True
+
+    # Run
+    result, info = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+    drone.commands.is_download_timed_out = False
+    retry_result, _ = mirror.current_waypoint_info(DOWNLOAD_TIMEOUT)
+
+    # Check
+    assert not result
+    assert info is None
+    assert retry_result
+    assert drone.commands.download_count == 3
+
+
+def test_close(drone: FakeDrone, mirror: mission_mirror.MissionMirror) -> None:
+    """
+    Closing removes every listener.
+    """
+    # Run
+    mirror.close()
+
+    # Check
+    assert all(len(listeners) == 0 for listeners in drone.listeners.values())
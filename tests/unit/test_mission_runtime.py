@@ -0,0 +1,236 @@
+"""
+Test running mission tasks concurrently.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from modules import condition
+from modules import condition_evaluator
+from modules import mission_runtime
+from tests.unit import test_check_stop_condition
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+# Long enough that the flight time watchdog never fires during a test
+MAXIMUM_FLIGHT_TIME = 3600.0  # seconds
+DRONE_TIMEOUT = 1.0  # seconds
+
+# A read takes several drone timeouts
+SHORT_DRONE_TIMEOUT = 0.02  # seconds
+SLOW_READ_TIME = 0.1  # seconds
+
+
+class ConstantCondition(condition.Condition):
+    """
+    Condition that always evaluates to the same value.
+    """
+
+    def __init__(self, value: bool) -> None:
+        """
+        Constructor.
+        """
+        self.value = value
+
+    def evaluate_condition(self) -> bool:
+        """
+        Constant value.
+        """
+        return self.value
+
+    def message(self) -> None:
+        """
+        No message.
+        """
+
+
+@pytest.fixture
+def runtime() -> mission_runtime.MissionRuntime:  # type: ignore
+    """
+    Runtime without a drone.
+    """
+    result, mission = mission_runtime.MissionRuntime.create(
+        None, time.time(), MAXIMUM_FLIGHT_TIME, DRONE_TIMEOUT
+    )
+    assert result
+    assert mission is not None
+
+    yield mission
+
+
+def test_create_without_flight_time() -> None:
+    """
+    Maximum flight time must be positive.
+    """
+    # Run
+    result, mission = mission_runtime.MissionRuntime.create(None, time.time(), 0.0, DRONE_TIMEOUT)
+
+    # Check
+    assert not result
+    assert mission is None
+
+
+def test_stop_cancels_tasks(runtime: mission_runtime.MissionRuntime) -> None:
+    """
+    Stopping from one task cancels the others.
+    """
+    # Setup
+    events = []
+
+    async def slow_task() -> None:
+        try:
+            await asyncio.sleep(MAXIMUM_FLIGHT_TIME)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    async def stopping_task() -> None:
+        await asyncio.sleep(0.01)
+        events.append("stopping")
+        runtime.stop()
+
+    # Run
+    result = asyncio.run(runtime.run(slow_task(), stopping_task()))
+
+    # Check
+    assert result
+    assert events == ["stopping", "cancelled"]
+
+
+def test_failed_task() -> None:
+    """
+    An exception in a task ends the mission with failure, and the drone returns to launch
+    as the flight time watchdog is cancelled too.
+    """
+    # Setup
+    drone = test_check_stop_condition.FakeVehicle()
+    result, runtime = mission_runtime.MissionRuntime.create(
+        drone, time.time(), MAXIMUM_FLIGHT_TIME, DRONE_TIMEOUT
+    )
+    assert result
+
+    async def failing_task() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("Test failure")
+
+    # Run
+    result = asyncio.run(runtime.run(failing_task()))
+
+    # Check
+    assert not result
+    assert drone.events == [("mode", "RTL"), "clear", "upload"]
+
+
+def test_scan_qr(runtime: mission_runtime.MissionRuntime) -> None:
+    """
+    Decoded text is passed on, reads without text are skipped.
+    """
+    # Setup
+    reads = [(False, None), (True, "Follow route: Quebec; Lima")]
+    texts = []
+
+    def read_qr() -> "tuple[bool, str | None]":
+        return reads.pop(0)
+
+    def handle_text(text: str) -> None:
+        texts.append(text)
+        runtime.stop()
+
+    # Run
+    result = asyncio.run(runtime.run(runtime.scan_qr(read_qr, handle_text, 0.0)))
+
+    # Check
+    assert result
+    assert texts == ["Follow route: Quebec; Lima"]
+
+
+def test_scan_qr_slow_read() -> None:
+    """
+    A read that outlasts the drone timeout is waited on again, without starting another read.
+    """
+    # Setup
+    result, runtime = mission_runtime.MissionRuntime.create(
+        None, time.time(), MAXIMUM_FLIGHT_TIME, SHORT_DRONE_TIMEOUT
+    )
+    assert result
+
+    lock = threading.Lock()
+    running_reads = [0]
+    started_reads = []
+
+    def read_qr() -> "tuple[bool, str | None]":
+        with lock:
+            running_reads[0] += 1
+            started_reads.append(running_reads[0])
+
+        time.sleep(SLOW_READ_TIME)
+
+        with lock:
+            running_reads[0] -= 1
+
+        return True, "Follow route: Quebec; Lima"
+
+    texts = []
+
+    def handle_text(text: str) -> None:
+        texts.append(text)
+        runtime.stop()
+
+    # Run
+    result = asyncio.run(runtime.run(runtime.scan_qr(read_qr, handle_text, 0.0)))
+
+    # Check
+    assert result
+    assert texts == ["Follow route: Quebec; Lima"]
+    assert started_reads == [1]
+
+
+def test_evaluate_all_conditions_async() -> None:
+    """
+    Evaluation in a worker thread gives the same result as evaluating directly.
+    """
+    # Setup
+    evaluator_false = condition_evaluator.ConditionEvaluator([ConstantCondition(False)])
+    evaluator_true = condition_evaluator.ConditionEvaluator(
+        [ConstantCondition(False), ConstantCondition(True)]
+    )
+
+    # Run
+    result_false = asyncio.run(
+        mission_runtime.evaluate_all_conditions_async(evaluator_false, DRONE_TIMEOUT)
+    )
+    result_true = asyncio.run(
+        mission_runtime.evaluate_all_conditions_async(evaluator_true, DRONE_TIMEOUT)
+    )
+
+    # Check
+    assert not result_false
+    assert result_true
+
+
+def test_watch_conditions_returns_to_launch() -> None:
+    """
+    A met condition switches the drone to RTL mode before uploading the RTL mission,
+    then ends the mission.
+    """
+    # Setup
+    drone = test_check_stop_condition.FakeVehicle()
+    result, runtime = mission_runtime.MissionRuntime.create(
+        drone, time.time(), MAXIMUM_FLIGHT_TIME, DRONE_TIMEOUT
+    )
+    assert result
+    evaluator = condition_evaluator.ConditionEvaluator([ConstantCondition(True)])
+
+    # Run
+    result = asyncio.run(runtime.run(runtime.watch_conditions(evaluator, 0.0)))
+
+    # Check
+    assert result
+    assert drone.events == [("mode", "RTL"), "clear", "upload"]
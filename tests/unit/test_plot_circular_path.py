@@ -4,6 +4,7 @@ Test plotting waypoints in a circular fashion around a center
 
 import pathlib
 
+import numpy as np
 import pytest
 
 from modules import plot_circular_path
@@ -70,6 +71,69 @@ class TestMoveOffset:
         assert verify_close_enough(actual, expected, DEFAULT_TOLERANCE)
 
 
+class TestMoveOffsets:
+    """
+    Test move_coordinates_by_offsets function.
+    """
+
+    def test_matches_single_offset(self) -> None:
+        """
+        Batch conversion gives the same result as converting each offset on its own.
+        """
+        # Setup
+        result, starting_point = (
+            position_global_relative_altitude.PositionGlobalRelativeAltitude.create(10, 12, 1)
+        )
+        assert result
+        assert starting_point is not None
+
+        offsets_x = np.array([100_000.0, -250.0, 0.0, 37.5])
+        offsets_y = np.array([100_000.0, 80.0, -1_000.0, 0.0])
+
+        # Run
+        result, coordinates = plot_circular_path.move_coordinates_by_offsets(
+            starting_point, offsets_x, offsets_y
+        )
+
+        # Check
+        assert result
+        assert coordinates is not None
+
+        latitudes, longitudes = coordinates
+        assert latitudes.shape == offsets_x.shape
+        assert longitudes.shape == offsets_x.shape
+
+        for i, (offset_x, offset_y) in enumerate(zip(offsets_x, offsets_y)):
+            result, expected = plot_circular_path.move_coordinates_by_offset(
+                starting_point, offset_x, offset_y
+            )
+            assert result
+            assert expected is not None
+
+            assert latitudes[i] == pytest.approx(expected.latitude, rel=DEFAULT_TOLERANCE)
+            assert longitudes[i] == pytest.approx(expected.longitude, rel=DEFAULT_TOLERANCE)
+
+    def test_mismatched_offsets(self) -> None:
+        """
+        Fail when the offset arrays have different shapes.
+        """
+        # Setup
+        result, starting_point = (
+            position_global_relative_altitude.PositionGlobalRelativeAltitude.create(10, 12, 1)
+        )
+        assert result
+        assert starting_point is not None
+
+        # Run
+        result, coordinates = plot_circular_path.move_coordinates_by_offsets(
+            starting_point, np.zeros(3), np.zeros(2)
+        )
+
+        # Check
+        assert not result
+        assert coordinates is None
+
+
 class TestGenerateCircularPath:
     """
     Test generate_circular_path function.
@@ -0,0 +1,132 @@
+"""
+Test the array-backed search ring representation.
+"""
+
+import numpy as np
+import pytest
+
+from modules import search_path_rings
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture
+def rings() -> search_path_rings.SearchPathRings:  # type: ignore
+    """
+    Two rings with 3 and 4 waypoints.
+    """
+    result, rings = search_path_rings.SearchPathRings.create(
+        np.arange(7, dtype=np.float64),
+        np.arange(7, dtype=np.float64) + 10.0,
+        np.full(7, 100.0),
+        np.array([0, 3, 7]),
+    )
+    assert result
+    assert rings is not None
+
+    yield rings
+
+
+class TestSearchPathRings:
+    """
+    Test SearchPathRings.
+    """
+
+    def test_ring_views(self, rings: search_path_rings.SearchPathRings) -> None:
+        """
+        Rings are zero-copy slices of the coordinate arrays.
+        """
+        # Run
+        latitudes, longitudes, altitudes = rings.ring(1)
+
+        # Check
+        assert len(rings) == 7
+        assert rings.ring_count() == 2
+        assert latitudes.tolist() == [3.0, 4.0, 5.0, 6.0]
+        assert longitudes.tolist() == [13.0, 14.0, 15.0, 16.0]
+        assert altitudes.tolist() == [100.0] * 4
+        assert np.shares_memory(latitudes, rings.latitudes)
+        assert not latitudes.flags.writeable
+
+    def test_materialize(self, rings: search_path_rings.SearchPathRings) -> None:
+        """
+        Waypoint objects are only created on request, in order.
+        """
+        # Run
+        result, ring_waypoints = rings.rings_waypoints()
+        assert result
+        assert ring_waypoints is not None
+
+        result, waypoints = rings.waypoints()
+        assert result
+        assert waypoints is not None
+
+        # Check
+        assert [len(ring) for ring in ring_waypoints] == [3, 4]
+        assert [waypoint.latitude for waypoint in waypoints] == list(range(7))
+        assert [waypoint.longitude for ring in ring_waypoints for waypoint in ring] == [
+            waypoint.longitude for waypoint in waypoints
+        ]
+
+    def test_empty(self) -> None:
+        """
+        No rings.
+        """
+        # Run
+        rings = search_path_rings.SearchPathRings.create_empty()
+        result, waypoints = rings.waypoints()
+
+        # Check
+        assert rings.ring_count() == 0
+        assert result
+        assert waypoints == []
+
+    invalid_inputs = [
+        (np.zeros(3), np.zeros(3), np.zeros(2), np.array([0, 3])),  # Mismatched lengths
+        (np.zeros(3), np.zeros(3), np.zeros(3), np.array([0, 2])),  # Offsets do not cover path
+        (np.zeros(3), np.zeros(3), np.zeros(3), np.array([1, 3])),  # Offsets do not start at 0
+        (np.zeros(3), np.zeros(3), np.zeros(3), np.array([0, 2, 1, 3])),  # Decreasing offsets
+    ]
+
+    @pytest.mark.parametrize("latitudes,longitudes,altitudes,ring_offsets", invalid_inputs)
+    def test_invalid_input(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        altitudes: np.ndarray,
+        ring_offsets: np.ndarray,
+    ) -> None:
+        """
+        Parameterized test with invalid inputs.
+        """
+        # Run
+        result, rings = search_path_rings.SearchPathRings.create(
+            latitudes, longitudes, altitudes, ring_offsets
+        )
+
+        # Check
+        assert not result
+        assert rings is None
+
+    def test_input_stays_writeable(self) -> None:
+        """
+        The caller's arrays are copied rather than made read only.
+        """
+        # Setup
+        latitudes = np.arange(3, dtype=np.float64)
+        ring_offsets = np.array([0, 3], dtype=np.int64)
+
+        # Run
+        result, rings = search_path_rings.SearchPathRings.create(
+            latitudes, latitudes + 10.0, np.full(3, 100.0), ring_offsets
+        )
+
+        # Check
+        assert result
+        assert rings is not None
+        assert latitudes.flags.writeable
+        assert ring_offsets.flags.writeable
+        assert not np.shares_memory(latitudes, rings.latitudes)
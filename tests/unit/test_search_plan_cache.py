@@ -0,0 +1,171 @@
+"""
+Test the search plan cache.
+"""
+
+import os
+import pathlib
+
+import pytest
+
+from modules import generate_command
+from modules import generate_hotspot_search_path
+from modules import search_plan_cache
+from modules.common.modules import position_global_relative_altitude
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+MAXIMUM_CACHE_SIZE = 10_000_000  # bytes
+
+
+@pytest.fixture
+def centre() -> position_global_relative_altitude.PositionGlobalRelativeAltitude:  # type: ignore
+    """
+    Search centre.
+    """
+    result, centre = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+        43.434, -80.577, 0.0
+    )
+    assert result
+    assert centre is not None
+
+    yield centre
+
+
+def test_key_depends_on_inputs(
+    centre: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+) -> None:
+    """
+    Any input change gives a different key.
+    """
+    result, raised_centre = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+        centre.latitude, centre.longitude, centre.relative_altitude + 5.0
+    )
+    assert result
+
+    key = search_plan_cache.search_plan_key(centre, 100.0, 66.0, 41.0, 10.0)
+
+    assert key == search_plan_cache.search_plan_key(centre, 100.0, 66.0, 41.0, 10.0)
+    assert key != search_plan_cache.search_plan_key(centre, 101.0, 66.0, 41.0, 10.0)
+    assert key != search_plan_cache.search_plan_key(centre, 100.0, 66.0, 42.0, 10.0)
+    assert key != search_plan_cache.search_plan_key(centre, 100.0, 66.0, 41.0, 11.0)
+    assert key != search_plan_cache.search_plan_key(raised_centre, 100.0, 66.0, 41.0, 10.0)
+
+
+def test_save_and_load(
+    centre: position_global_relative_altitude.PositionGlobalRelativeAltitude,
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    A saved plan loads back with the same waypoints and commands.
+    """
+    # Setup
+    result, rings = generate_hotspot_search_path.generate_search_paths(centre, 30.0, (8.0, 5.0))
+    assert result
+    assert rings is not None
+
+    commands = [generate_command.takeoff(10.0)]
+    for ring in rings:
+        for waypoint in ring:
+            commands.append(
+                generate_command.waypoint(
+                    0.0, 5.0, waypoint.latitude, waypoint.longitude, waypoint.relative_altitude
+                )
+            )
+    commands.append(generate_command.return_to_launch())
+
+    key = search_plan_cache.search_plan_key(centre, 30.0, 66.0, 41.0, 10.0)
+
+    # Run
+    result = search_plan_cache.save_search_plan(tmp_path, key, rings, commands, MAXIMUM_CACHE_SIZE)
+    assert result
+
+    result, plan = search_plan_cache.load_search_plan(tmp_path, key)
+
+    # Check
+    assert result
+    assert plan is not None
+
+    loaded_rings, loaded_commands = plan
+    assert loaded_rings.ring_count() == len(rings)
+    for i, ring in enumerate(rings):
+        latitudes, longitudes, _ = loaded_rings.ring(i)
+        assert latitudes.tolist() == [waypoint.latitude for waypoint in ring]
+        assert longitudes.tolist() == [waypoint.longitude for waypoint in ring]
+
+    assert len(loaded_commands) == len(commands)
+    for loaded_command, command in zip(loaded_commands, commands):
+        assert loaded_command.frame == command.frame
+        assert loaded_command.command == command.command
+        assert loaded_command.param1 == command.param1
+        assert loaded_command.param2 == command.param2
+        assert loaded_command.x == command.x
+        assert loaded_command.y == command.y
+        assert loaded_command.z == command.z
+
+
+def test_missing_plan(tmp_path: pathlib.Path) -> None:
+    """
+    Cache miss.
+    """
+    result, plan = search_plan_cache.load_search_plan(tmp_path, "0" * 64)
+
+    assert not result
+    assert plan is None
+
+
+def test_eviction(tmp_path: pathlib.Path) -> None:
+    """
+    Least recently used plans are evicted once the cache is over its size limit.
+    """
+    # Setup
+    commands = [generate_command.return_to_launch()]
+    for i, key in enumerate(["old", "used", "new"]):
+        result = search_plan_cache.save_search_plan(tmp_path, key, [], commands, MAXIMUM_CACHE_SIZE)
+        assert result
+
+        os.utime(pathlib.Path(tmp_path, key + ".npz"), (i, i))
+
+    # Loading marks the plan as recently used
+    result, _ = search_plan_cache.load_search_plan(tmp_path, "used")
+    assert result
+
+    plan_size = pathlib.Path(tmp_path, "new.npz").stat().st_size
+
+    # Run
+    result = search_plan_cache.evict_search_plans(tmp_path, 2 * plan_size)
+
+    # Check
+    assert result
+    assert not pathlib.Path(tmp_path, "old.npz").exists()
+    assert pathlib.Path(tmp_path, "used.npz").exists()
+    assert pathlib.Path(tmp_path, "new.npz").exists()
+
+
+def test_temporary_file_ignored(tmp_path: pathlib.Path) -> None:
+    """
+    A plan left half written is neither evicted nor counted toward the size limit.
+    """
+    # Setup
+    commands = [generate_command.return_to_launch()]
+    result = search_plan_cache.save_search_plan(tmp_path, "plan", [], commands, MAXIMUM_CACHE_SIZE)
+    assert result
+
+    plan_size = pathlib.Path(tmp_path, "plan.npz").stat().st_size
+    temporary_file_path = pathlib.Path(tmp_path, "other" + search_plan_cache.TEMPORARY_FILE_SUFFIX)
+    temporary_file_path.write_bytes(bytes(10 * plan_size))
+
+    # Run
+    result = search_plan_cache.evict_search_plans(tmp_path, plan_size)
+
+    # Check
+    assert result
+    assert pathlib.Path(tmp_path, "plan.npz").exists()
+    assert temporary_file_path.exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "other" + search_plan_cache.TEMPORARY_FILE_SUFFIX,
+        "plan.npz",
+    ]
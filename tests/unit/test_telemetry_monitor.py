@@ -0,0 +1,248 @@
+"""
+Test telemetry events pushed from the drone's listeners.
+"""
+
+import collections.abc
+import time
+
+import pytest
+
+from modules import telemetry_monitor
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name,too-few-public-methods
+
+
+EVENT_WAIT_TIME = 1.0  # seconds
+NO_EVENT_WAIT_TIME = 0.01  # seconds
+
+# Age of a message when it is handed to the listener
+MESSAGE_AGE = 0.5  # seconds
+
+
+class FakeMessage:
+    """
+    MAVLink message with the given fields.
+    """
+
+    def __init__(self, **fields: object) -> None:
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+class FakeDrone:
+    """
+    Vehicle that records its message and attribute listeners so they can be called.
+    """
+
+    def __init__(self) -> None:
+        self.message_listeners: "dict[str, list]" = {}
+        self.attribute_listeners: "dict[str, list]" = {}
+
+    def add_message_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Adds a listener for a message name.
+        """
+        self.message_listeners.setdefault(name, []).append(listener)
+
+    def remove_message_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Removes a listener for a message name.
+        """
+        self.message_listeners[name].remove(listener)
+
+    def add_attribute_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Adds a listener for an attribute.
+        """
+        self.attribute_listeners.setdefault(name, []).append(listener)
+
+    def remove_attribute_listener(self, name: str, listener: collections.abc.Callable) -> None:
+        """
+        Removes a listener for an attribute.
+        """
+        self.attribute_listeners[name].remove(listener)
+
+    def send(self, name: str, message: FakeMessage) -> None:
+        """
+        Calls every listener of the message name, as the DroneKit message thread does.
+        """
+        for listener in list(self.message_listeners.get(name, [])):
+            listener(self, name, message)
+
+    def set_attribute(self, name: str, value: object) -> None:
+        """
+        Calls every listener of the attribute, as DroneKit does when it changes.
+        """
+        for listener in list(self.attribute_listeners.get(name, [])):
+            listener(self, name, value)
+
+    def listener_count(self) -> int:
+        """
+        Number of listeners still added.
+        """
+        return sum(
+            len(listeners)
+            for listeners in [*self.message_listeners.values(), *self.attribute_listeners.values()]
+        )
+
+
+@pytest.fixture
+def drone() -> FakeDrone:  # type: ignore
+    """
+    Drone without listeners.
+    """
+    yield FakeDrone()
+
+
+@pytest.fixture
+def monitor(drone: FakeDrone) -> telemetry_monitor.TelemetryMonitor:  # type: ignore
+    """
+    Monitor subscribed to every event.
+    """
+    result, monitor = telemetry_monitor.TelemetryMonitor.create(drone)
+    assert result
+    assert monitor is not None
+
+    yield monitor
+
+    monitor.close()
+
+
+def test_create_invalid(drone: FakeDrone) -> None:
+    """
+    A missing drone or unknown event kinds are rejected.
+    """
+    assert telemetry_monitor.TelemetryMonitor.create(None) == (False, None)
+    assert telemetry_monitor.TelemetryMonitor.create(drone, frozenset()) == (False, None)
+    assert telemetry_monitor.TelemetryMonitor.create(drone, frozenset(["battery"])) == (
+        False,
+        None,
+    )
+    assert drone.listener_count() == 0
+
+
+def test_only_requested_events(drone: FakeDrone) -> None:
+    """
+    Only the requested kinds of event are subscribed to.
+    """
+    # Run
+    result, monitor = telemetry_monitor.TelemetryMonitor.create(
+        drone, frozenset([telemetry_monitor.WAYPOINT_EVENT])
+    )
+
+    # Check
+    assert result
+    assert list(drone.message_listeners) == ["MISSION_CURRENT"]
+    assert len(drone.attribute_listeners) == 0
+
+    monitor.close()
+
+
+def test_position_event(drone: FakeDrone, monitor: telemetry_monitor.TelemetryMonitor) -> None:
+    """
+    Positions are converted to degrees, with the time the message was parsed.
+    """
+    # Setup
+    message_time = time.time() - MESSAGE_AGE
+
+    # Run
+    drone.send(
+        "GLOBAL_POSITION_INT",
+        FakeMessage(lat=434_700_000, lon=-805_400_000, _timestamp=message_time),
+    )
+    result, event = monitor.next_event(EVENT_WAIT_TIME)
+
+    # Check
+    assert result
+    assert event.kind == telemetry_monitor.POSITION_EVENT
+    assert event.value == pytest.approx((43.47, -80.54))
+    assert event.receive_time == message_time
+
+
+def test_repeated_waypoint(drone: FakeDrone, monitor: telemetry_monitor.TelemetryMonitor) -> None:
+    """
+    Repeated MISSION_CURRENT messages only queue an event when the waypoint changes.
+    """
+    # Run
+    for sequence in [1, 1, 2, 2, 2]:
+        drone.send("MISSION_CURRENT", FakeMessage(seq=sequence))
+
+    events = []
+    while True:
+        result, event = monitor.next_event(NO_EVENT_WAIT_TIME)
+        if not result:
+            break
+
+        events.append(event)
+
+    # Check
+    assert [(event.kind, event.value) for event in events] == [
+        (telemetry_monitor.WAYPOINT_EVENT, 1),
+        (telemetry_monitor.WAYPOINT_EVENT, 2),
+    ]
+
+
+def test_mode_event(drone: FakeDrone, monitor: telemetry_monitor.TelemetryMonitor) -> None:
+    """
+    Mode changes are queued with the mode name.
+    """
+    # Run
+    drone.set_attribute("mode", FakeMessage(name="RTL"))
+    result, event = monitor.next_event(EVENT_WAIT_TIME)
+
+    # Check
+    assert result
+    assert event.kind == telemetry_monitor.MODE_EVENT
+    assert event.value == "RTL"
+
+
+def test_no_event(monitor: telemetry_monitor.TelemetryMonitor) -> None:
+    """
+    Waiting without any telemetry times out.
+    """
+    # Run
+    result, event = monitor.next_event(NO_EVENT_WAIT_TIME)
+
+    # Check
+    assert not result
+    assert event is None
+    assert monitor.event_count == 0
+    assert monitor.mean_latency() == 0.0
+
+
+def test_latency(drone: FakeDrone, monitor: telemetry_monitor.TelemetryMonitor) -> None:
+    """
+    Latency is measured from the message time to the event being received.
+    """
+    # Setup
+    drone.send("MISSION_CURRENT", FakeMessage(seq=1, _timestamp=time.time() - MESSAGE_AGE))
+    drone.send("MISSION_CURRENT", FakeMessage(seq=2, _timestamp=time.time()))
+
+    # Run
+    for _ in range(2):
+        result, _ = monitor.next_event(EVENT_WAIT_TIME)
+        assert result
+
+    # Check
+    assert monitor.event_count == 2
+    assert monitor.maximum_latency >= MESSAGE_AGE
+    assert MESSAGE_AGE / 2 <= monitor.mean_latency() < monitor.maximum_latency
+
+
+def test_close(drone: FakeDrone) -> None:
+    """
+    Closing removes every listener that was added.
+    """
+    # Setup
+    result, monitor = telemetry_monitor.TelemetryMonitor.create(drone)
+    assert result
+    assert drone.listener_count() == 3
+
+    # Run
+    monitor.close()
+
+    # Check
+    assert drone.listener_count() == 0
@@ -0,0 +1,370 @@
+"""
+Test the mission checksum used to verify uploads, and differential uploads.
+"""
+
+import collections.abc
+
+import pytest
+from pymavlink import mavutil
+
+from modules import generate_command
+from modules import upload_commands
+from modules.common.modules.mavlink import dronekit
+
+
+ALTITUDE = 40  # metres
+HOLD_TIME = 0.0  # seconds
+ACCEPT_RADIUS = 10.0  # metres
+
+UPLOAD_TIMEOUT = 0.05  # seconds
+
+
+# Fakes stand in for the private DroneKit state used by differential uploads
+# No enable
+# pylint: disable=protected-access,too-few-public-methods
+
+
+class FakeMission:
+    """
+    Mission cached by DroneKit, with home at index 0.
+    """
+
+    def __init__(self, commands: "list[dronekit.Command]") -> None:
+        self.items = [generate_command.waypoint(0.0, 0.0, 0.0, 0.0, 0.0)] + list(commands)
+        self.set_sequences = []
+
+    def count(self) -> int:
+        """
+        Number of items including home.
+        """
+        return len(self.items)
+
+    def clear(self) -> None:
+        """
+        Forgets every item, including home.
+        """
+        self.items = []
+
+    def set(self, command: dronekit.Command, sequence: int) -> None:
+        """
+        Replaces an item.
+        """
+        self.items[sequence] = command
+        self.set_sequences.append(sequence)
+
+
+class FakeCommandSequence:
+    """
+    Mission items after home, as seen through Vehicle.commands.
+    """
+
+    def __init__(self, mission: FakeMission, is_upload_timed_out: bool) -> None:
+        self.__mission = mission
+        self.__is_upload_timed_out = is_upload_timed_out
+        self.upload_count = 0
+
+    def __iter__(self) -> collections.abc.Iterator[dronekit.Command]:
+        return iter(self.__mission.items[1:])
+
+    def clear(self) -> None:
+        """
+        Removes every item after home.
+        """
+        self.__mission.items = self.__mission.items[:1]
+
+    def add(self, command: dronekit.Command) -> None:
+        """
+        Appends an item.
+        """
+        self.__mission.items.append(command)
+
+    def upload(self, timeout: float) -> None:
+        """
+        Uploads the whole mission, raising as DroneKit does on timeout.
+        """
+        self.upload_count += 1
+        if self.__is_upload_timed_out:
+            raise dronekit.TimeoutError(f"Timed out after {timeout} s")
+
+
+class FakeHandler:
+    """
+    Connection handler.
+    """
+
+    def fix_targets(self, command: dronekit.Command) -> None:
+        """
+        Sets the target system and component.
+        """
+        command.target_system = 1
+        command.target_component = 1
+
+
+class FakeMav:
+    """
+    MAVLink sender that records partial writes and, if answering, marks the requested items
+    as uploaded the way DroneKit does when the drone requests them.
+    """
+
+    def __init__(self, vehicle: "FakeVehicle", is_answering: bool) -> None:
+        self.__vehicle = vehicle
+        self.__is_answering = is_answering
+        self.partial_writes = []
+
+    def mission_write_partial_list_send(
+        self, target_system: int, target_component: int, start_index: int, end_index: int
+    ) -> None:
+        """
+        Records the write and answers it.
+        """
+        assert (target_system, target_component) == (1, 1)
+        self.partial_writes.append((start_index, end_index))
+        if self.__is_answering:
+            for sequence in range(start_index, end_index + 1):
+                self.__vehicle._wp_uploaded[sequence] = True
+
+
+class FakeMaster:
+    """
+    MAVLink connection.
+    """
+
+    def __init__(self, vehicle: "FakeVehicle", is_answering: bool) -> None:
+        self.target_system = 1
+        self.target_component = 1
+        self.mav = FakeMav(vehicle, is_answering)
+
+
+class FakeVehicle:
+    """
+    ArduPilot vehicle that DroneKit has already downloaded a mission from.
+    """
+
+    def __init__(
+        self,
+        commands: "list[dronekit.Command]",
+        is_answering: bool = True,
+        is_upload_timed_out: bool = False,
+    ) -> None:
+        self._wploader = FakeMission(commands)
+        self.commands = FakeCommandSequence(self._wploader, is_upload_timed_out)
+        self._autopilot_type = mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA
+        self._handler = FakeHandler()
+        self._master = FakeMaster(self, is_answering)
+        self._wp_uploaded = None
+
+
+def make_mission(last_latitude: float) -> "list[dronekit.Command]":
+    """
+    Takeoff, two waypoints and return to launch, where only the last waypoint varies.
+    """
+    return [
+        generate_command.takeoff(ALTITUDE),
+        generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, 43.47, -80.54, ALTITUDE),
+        generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, last_latitude, -80.54, ALTITUDE),
+        generate_command.return_to_launch(),
+    ]
+
+
+def test_checksum_same_commands() -> None:
+    """
+    Separately generated equal commands have the same checksum.
+    """
+    # Setup
+    commands_1 = [
+        generate_command.takeoff(ALTITUDE),
+        generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, 43.47, -80.54, ALTITUDE),
+        generate_command.return_to_launch(),
+    ]
+    commands_2 = [
+        generate_command.takeoff(ALTITUDE),
+        generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, 43.47, -80.54, ALTITUDE),
+        generate_command.return_to_launch(),
+    ]
+
+    # Run
+    checksum_1 = upload_commands.mission_checksum(commands_1)
+    checksum_2 = upload_commands.mission_checksum(commands_2)
+
+    # Check
+    assert checksum_1 == checksum_2
+
+
+def test_checksum_float32_rounding() -> None:
+    """
+    Coordinates that are equal once sent as float32 have the same checksum.
+    """
+    # Setup
+    command_1 = generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, 43.47, -80.54, ALTITUDE)
+    command_2 = generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, 43.47 + 1e-12, -80.54, ALTITUDE)
+
+    # Run
+    checksum_1 = upload_commands.mission_checksum([command_1])
+    checksum_2 = upload_commands.mission_checksum([command_2])
+
+    # Check
+    assert checksum_1 == checksum_2
+
+
+def test_checksum_changed_command() -> None:
+    """
+    Moving a waypoint changes the checksum.
+    """
+    # Setup
+    command_1 = generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, 43.47, -80.54, ALTITUDE)
+    command_2 = generate_command.waypoint(HOLD_TIME, ACCEPT_RADIUS, 43.471, -80.54, ALTITUDE)
+
+    # Run
+    checksum_1 = upload_commands.mission_checksum([command_1])
+    checksum_2 = upload_commands.mission_checksum([command_2])
+
+    # Check
+    assert checksum_1 != checksum_2
+
+
+def test_checksum_order() -> None:
+    """
+    Reordering the commands changes the checksum.
+    """
+    # Setup
+    takeoff_command = generate_command.takeoff(ALTITUDE)
+    landing_command = generate_command.landing()
+
+    # Run
+    checksum_1 = upload_commands.mission_checksum([takeoff_command, landing_command])
+    checksum_2 = upload_commands.mission_checksum([landing_command, takeoff_command])
+
+    # Check
+    assert checksum_1 != checksum_2
+
+
+def test_differential_unchanged() -> None:
+    """
+    Nothing is sent when the mission is unchanged.
+    """
+    # Setup
+    drone = FakeVehicle(make_mission(43.48))
+
+    # Run
+    result, _ = upload_commands.upload_commands_differential(
+        drone, make_mission(43.48), UPLOAD_TIMEOUT
+    )
+
+    # Check
+    assert result
+    assert len(drone._master.mav.partial_writes) == 0
+    assert drone.commands.upload_count == 0
+
+
+def test_differential_changed_suffix() -> None:
+    """
+    Only the changed items are written, the unchanged prefix is not sent.
+    """
+    # Setup
+    drone = FakeVehicle(make_mission(43.48))
+    new_mission = make_mission(43.49)
+
+    # Run
+    result, _ = upload_commands.upload_commands_differential(drone, new_mission, UPLOAD_TIMEOUT)
+
+    # Check
+    assert result
+    # The third item is at sequence 3, after home
+    assert drone._master.mav.partial_writes == [(3, 3)]
+    assert drone._wploader.set_sequences == [3]
+    assert drone._wploader.items[3].x == 43.49
+    assert drone.commands.upload_count == 0
+    assert drone._wp_uploaded is None
+
+
+def test_differential_partial_timeout() -> None:
+    """
+    A partial write the drone never requests times out.
+    """
+    # Setup
+    drone = FakeVehicle(make_mission(43.48), is_answering=False)
+
+    # Run
+    result, time_taken = upload_commands.upload_commands_differential(
+        drone, make_mission(43.49), UPLOAD_TIMEOUT
+    )
+
+    # Check
+    assert not result
+    assert time_taken is None
+    assert drone._wp_uploaded is None
+    # Nothing is known about the drone's mission, so a retry is not skipped as unchanged
+    assert drone._wploader.count() == 0
+
+
+def test_differential_full_upload_timeout() -> None:
+    """
+    A new number of items replaces the whole mission, and the DroneKit timeout is reported.
+    """
+    # Setup
+    drone = FakeVehicle(make_mission(43.48), is_upload_timed_out=True)
+
+    # Run
+    result, time_taken = upload_commands.upload_commands_differential(
+        drone, make_mission(43.48)[:3], UPLOAD_TIMEOUT
+    )
+
+    # Check
+    assert not result
+    assert time_taken is None
+    assert drone.commands.upload_count == 1
+    assert len(drone._master.mav.partial_writes) == 0
+    assert drone._wploader.count() == 0
+
+
+def test_differential_retry_after_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Retrying the same commands after a timeout uploads the whole mission again.
+    """
+    # Setup
+    drone = FakeVehicle(make_mission(43.48), is_answering=False)
+    new_mission = make_mission(43.49)
+    result, _ = upload_commands.upload_commands_differential(drone, new_mission, UPLOAD_TIMEOUT)
+    assert not result
+
+    uploads = []
+
+    def upload_all(
+        vehicle: FakeVehicle, commands: "list[dronekit.Command]", timeout: float
+    ) -> bool:
+        assert vehicle is drone
+        assert timeout == UPLOAD_TIMEOUT
+        uploads.append(list(commands))
+        return True
+
+    monkeypatch.setattr(upload_commands, "upload_commands", upload_all)
+
+    # Run
+    result, _ = upload_commands.upload_commands_differential(drone, new_mission, UPLOAD_TIMEOUT)
+
+    # Check
+    assert result
+    assert uploads == [new_mission]
+
+
+def test_differential_empty_copy_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    A DroneKit timeout while replacing an unknown mission is reported instead of raised.
+    """
+    # Setup
+    drone = FakeVehicle([])
+    drone._wploader.clear()
+
+    def upload_timed_out(*_: object) -> bool:
+        raise dronekit.TimeoutError("Timed out waiting for the mission")
+
+    monkeypatch.setattr(upload_commands, "upload_commands", upload_timed_out)
+
+    # Run
+    result, time_taken = upload_commands.upload_commands_differential(
+        drone, make_mission(43.48), UPLOAD_TIMEOUT
+    )
+
+    # Check
+    assert not result
+    assert time_taken is None
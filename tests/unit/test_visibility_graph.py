@@ -0,0 +1,288 @@
+"""
+Test shortest path planning on the visibility graph.
+"""
+
+import heapq
+import itertools
+import math
+
+import numpy as np
+import pytest
+import shapely.geometry
+
+from modules import visibility_graph
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+BUFFER_DISTANCE = 0.1
+
+
+@pytest.fixture
+def square_graph() -> visibility_graph.VisibilityGraph:  # type: ignore
+    """
+    Graph around the square [-1, 1] x [-1, 1].
+    """
+    square = shapely.geometry.Polygon([(-1.0, -1.0), (1.0, -1.0), (1.0, 1.0), (-1.0, 1.0)])
+    result, graph = visibility_graph.VisibilityGraph.create([square], BUFFER_DISTANCE)
+    assert result
+    assert graph is not None
+
+    yield graph
+
+
+def path_length(graph: visibility_graph.VisibilityGraph, path: "list[int]", points: list) -> float:
+    """
+    Total length of the path, where the start and goal are the last 2 points.
+    """
+    coordinates = [tuple(graph.nodes[node_id]) for node_id in path[1:-1]]
+    coordinates = [points[0]] + coordinates + [points[1]]
+    return sum(math.dist(coordinates[i], coordinates[i + 1]) for i in range(len(coordinates) - 1))
+
+
+def test_straight_line(square_graph: visibility_graph.VisibilityGraph) -> None:
+    """
+    Goal is directly visible from the start.
+    """
+    # Run
+    result, path = square_graph.shortest_path((-3.0, 2.0), (3.0, 2.0))
+
+    # Check
+    assert result
+    assert path == [len(square_graph.nodes), len(square_graph.nodes) + 1]
+
+
+def test_around_obstacle(square_graph: visibility_graph.VisibilityGraph) -> None:
+    """
+    Path goes around the square through two of its buffered corners.
+    """
+    # Setup
+    start = (-3.0, 0.0)
+    goal = (3.0, 0.0)
+    corner = 1.0 + BUFFER_DISTANCE
+    expected_length = 2 * math.dist(start, (-corner, corner)) + 2 * corner
+
+    # Run
+    result, path = square_graph.shortest_path(start, goal)
+
+    # Check
+    assert result
+    assert len(path) == 4
+    assert path_length(square_graph, path, [start, goal]) == pytest.approx(expected_length)
+
+
+def test_goal_inside_obstacle(square_graph: visibility_graph.VisibilityGraph) -> None:
+    """
+    No path to a goal inside the obstacle.
+    """
+    # Run
+    result, path = square_graph.shortest_path((-3.0, 0.0), (0.0, 0.0))
+
+    # Check
+    assert not result
+    assert path is None
+
+
+def test_multiple_obstacles() -> None:
+    """
+    Path avoids every obstacle and passes through the gap between them.
+    """
+    # Setup
+    obstacles = [
+        shapely.geometry.Polygon([(-1.0, 0.5), (1.0, 0.5), (1.0, 10.0), (-1.0, 10.0)]),
+        shapely.geometry.Polygon([(-1.0, -10.0), (1.0, -10.0), (1.0, -0.5), (-1.0, -0.5)]),
+        # Far away, must not affect the result
+        shapely.geometry.Polygon([(50.0, 50.0), (51.0, 50.0), (51.0, 51.0)]),
+    ]
+    result, graph = visibility_graph.VisibilityGraph.create(obstacles, BUFFER_DISTANCE)
+    assert result
+    assert graph is not None
+
+    start = (-3.0, 3.0)
+    goal = (3.0, -3.0)
+
+    # Run
+    result, path = graph.shortest_path(start, goal)
+
+    # Check
+    assert result
+    assert path is not None
+
+    coordinates = [start] + [tuple(graph.nodes[node_id]) for node_id in path[1:-1]] + [goal]
+    for i in range(len(coordinates) - 1):
+        segment = shapely.geometry.LineString([coordinates[i], coordinates[i + 1]])
+        for obstacle in obstacles:
+            assert not segment.intersects(obstacle)
+
+
+def test_same_goal_new_start(square_graph: visibility_graph.VisibilityGraph) -> None:
+    """
+    Repeated queries to the same goal follow the moving start.
+    """
+    # Setup
+    goal = (3.0, 0.0)
+
+    result, _ = square_graph.shortest_path((-3.0, 0.0), goal)
+    assert result
+
+    # Run
+    result, path = square_graph.shortest_path((3.0, 2.0), goal)
+
+    # Check
+    assert result
+    assert path == [len(square_graph.nodes), len(square_graph.nodes) + 1]
+
+
+def test_start_inside_buffer() -> None:
+    """
+    A start inside the buffer around an obstacle still leaves through the buffered corners.
+    """
+    # Setup
+    square = shapely.geometry.box(0.0, 0.0, 100.0, 100.0)
+    clearance = 10.0
+    result, graph = visibility_graph.VisibilityGraph.create([square], clearance)
+    assert result
+    assert graph is not None
+
+    start = (-5.0, 50.0)
+    goal = (150.0, 50.0)
+    expected_length = (
+        math.dist(start, (-clearance, 100.0 + clearance))
+        + 100.0
+        + 2 * clearance
+        + math.dist((100.0 + clearance, 100.0 + clearance), goal)
+    )
+
+    # Run
+    result, path = graph.shortest_path(start, goal)
+
+    # Check
+    assert result
+    assert path is not None
+    assert path_length(graph, path, [start, goal]) == pytest.approx(expected_length)
+
+
+def test_clearance() -> None:
+    """
+    A path that would pass the obstacle closer than the clearance goes around it instead.
+    """
+    # Setup
+    square = shapely.geometry.box(0.0, 0.0, 100.0, 100.0)
+    clearance = 10.0
+    result, graph = visibility_graph.VisibilityGraph.create([square], clearance)
+    assert result
+    assert graph is not None
+
+    start = (-20.0, -0.5)
+    goal = (120.0, -0.5)
+
+    # Run
+    result, path = graph.shortest_path(start, goal)
+
+    # Check
+    assert result
+    assert path is not None
+
+    coordinates = [start] + [tuple(graph.nodes[node_id]) for node_id in path[1:-1]] + [goal]
+    assert shapely.geometry.LineString(coordinates).distance(square) == pytest.approx(clearance)
+
+
+def brute_force_path_length(
+    obstacles: "list[shapely.geometry.Polygon]",
+    clearance: float,
+    maximum_edge_length: float,
+    nodes: np.ndarray,
+    start: "tuple[float, float]",
+    goal: "tuple[float, float]",
+) -> float:
+    """
+    Dijkstra over every pair of points that can see each other, infinite if there is no path.
+    Segments keep the clearance unless one end is already inside it, and segments between
+    nodes are no longer than the maximum edge length.
+    """
+    obstacle_area = shapely.geometry.MultiPolygon(obstacles)
+    clearance_area = shapely.union_all(
+        [
+            obstacle.buffer(clearance * visibility_graph.CLEARANCE_TOLERANCE, join_style="mitre")
+            for obstacle in obstacles
+        ]
+    )
+    points = [start, goal] + [tuple(node) for node in nodes.tolist()]
+    is_in_clearance = [clearance_area.intersects(shapely.geometry.Point(point)) for point in points]
+
+    distance = [math.inf] * len(points)
+    distance[0] = 0.0
+    queue = [(0.0, 0)]
+    while queue:
+        point_distance, point_id = heapq.heappop(queue)
+        if point_distance > distance[point_id]:
+            continue
+
+        for other_id, other in enumerate(points):
+            is_between_nodes = point_id >= 2 and other_id >= 2
+            if is_between_nodes and math.dist(points[point_id], other) > maximum_edge_length:
+                continue
+
+            segment = shapely.geometry.LineString([points[point_id], other])
+            if is_in_clearance[point_id] or is_in_clearance[other_id]:
+                blocking_area = obstacle_area
+            else:
+                blocking_area = clearance_area
+
+            if other_id == point_id or segment.intersects(blocking_area):
+                continue
+
+            other_distance = point_distance + math.dist(points[point_id], other)
+            if other_distance < distance[other_id]:
+                distance[other_id] = other_distance
+                heapq.heappush(queue, (other_distance, other_id))
+
+    return distance[1]
+
+
+@pytest.mark.parametrize("maximum_edge_length", [math.inf, 8.0])
+def test_matches_brute_force(maximum_edge_length: float) -> None:
+    """
+    Paths between random points around random obstacles are as short as a search over every
+    visible pair, including endpoints inside the clearance.
+    """
+    # Setup
+    generator = np.random.default_rng(0)
+    # Buffers of neighbouring obstacles often overlap
+    clearance = 3.0
+    spacing = 14.0
+
+    for _ in range(20):
+        obstacles = []
+        for x, y in itertools.product([0.0, spacing], [0.0, spacing]):
+            width, height = generator.uniform(4.0, 12.0, 2)
+            x += generator.uniform(0.0, 4.0)
+            y += generator.uniform(0.0, 4.0)
+            obstacles.append(shapely.geometry.box(x, y, x + width, y + height))
+
+        result, graph = visibility_graph.VisibilityGraph.create(
+            obstacles, clearance, maximum_edge_length
+        )
+        assert result
+        assert graph is not None
+
+        start, goal = (
+            tuple(point) for point in generator.uniform(-5.0, 2 * spacing, (2, 2)).tolist()
+        )
+
+        # Run
+        result, path = graph.shortest_path(start, goal)
+
+        # Check
+        expected_length = brute_force_path_length(
+            obstacles, clearance, maximum_edge_length, graph.nodes, start, goal
+        )
+        if math.isinf(expected_length):
+            assert not result
+            continue
+
+        assert result
+        assert path_length(graph, path, [start, goal]) == pytest.approx(expected_length)
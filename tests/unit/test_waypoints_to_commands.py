@@ -2,8 +2,14 @@
 Test process.
 """
 
+import collections.abc
+
+import pytest
 from pymavlink import mavutil
 
+from modules import add_takeoff_and_rtl_command
+from modules import generate_hotspot_search_path
+from modules import search_plan_cache
 from modules import waypoints_to_commands
 from modules.common.modules import location_global
 from modules.common.modules import position_global_relative_altitude
@@ -130,3 +136,71 @@ def test_waypoints_with_altitude_to_commands() -> None:
         assert command.x == expected_latitude
         assert command.y == expected_longitude
         assert command.z == expected_altitude
+
+
+def test_waypoint_rings_to_commands() -> None:
+    """
+    Tests functionality correctness of waypoint_rings_to_commands on a generator of rings.
+    """
+    rings = []
+    for i, ring_size in enumerate([3, 0, 2]):
+        ring = []
+        for j in range(ring_size):
+            result, waypoint = (
+                position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+                    42.0 + i, -73.0 + j, 10.0
+                )
+            )
+            assert result
+            assert waypoint is not None
+
+            ring.append(waypoint)
+
+        rings.append(ring)
+
+    commands_actual = waypoints_to_commands.waypoint_rings_to_commands(ring for ring in rings)
+
+    waypoints = [waypoint for ring in rings for waypoint in ring]
+    commands_actual = list(commands_actual)
+    assert len(commands_actual) == len(waypoints)
+
+    for i, command in enumerate(commands_actual):
+        assert isinstance(command, flight_controller.dronekit.Command)
+        assert command.command == mavutil.mavlink.MAV_CMD_NAV_WAYPOINT
+        assert command.x == waypoints[i].latitude
+        assert command.y == waypoints[i].longitude
+        assert command.z == waypoints[i].relative_altitude
+
+
+def test_waypoint_rings_to_commands_failed_ring() -> None:
+    """
+    A ring that fails stops the whole mission instead of truncating it.
+    """
+    result, waypoint = position_global_relative_altitude.PositionGlobalRelativeAltitude.create(
+        42.0, -73.0, 10.0
+    )
+    assert result
+    assert waypoint is not None
+
+    def rings() -> (
+        collections.abc.Iterator[
+            list[position_global_relative_altitude.PositionGlobalRelativeAltitude]
+        ]
+    ):
+        yield [waypoint, waypoint]
+        raise generate_hotspot_search_path.SearchPathError("Failed to generate ring")
+
+    recorded_commands = []
+    mission = search_plan_cache.record(
+        add_takeoff_and_rtl_command.add_takeoff_and_rtl_command_lazy(
+            waypoints_to_commands.waypoint_rings_to_commands(rings()), 10.0
+        ),
+        recorded_commands,
+    )
+
+    with pytest.raises(generate_hotspot_search_path.SearchPathError):
+        list(mission)
+
+    # Takeoff and the first ring only, the mission never reaches its return to launch
+    assert len(recorded_commands) == 3
+    assert recorded_commands[-1].command == mavutil.mavlink.MAV_CMD_NAV_WAYPOINT